@@ -1,26 +1,4918 @@
-def create_generic_dashboard(db):
+import argparse
+import asyncio
+import bisect
+import csv
+import ctypes
+import ctypes.util
+import fnmatch
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import math
+import mimetypes
+import os
+import random
+import re
+import resource
+import select
+import shutil
+import sqlite3
+import statistics
+import struct
+import tempfile
+import time
+import unicodedata
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from datetime import datetime, timedelta
+from functools import lru_cache
+from html import escape as html_escape
+from itertools import accumulate
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+COULEURS_EQUIPES = ["#3b82f6", "#f59e0b", "#10b981", "#8b5cf6", "#ef4444", "#06b6d4"]
+
+
+def cle_client(client):
+    """Identifiant stable d'un abonné (TN, sinon SN, sinon nom)"""
+    for champ in ("tn", "sn", "nom"):
+        valeur = str(client.get(champ) or "").strip().lower()
+        if valeur:
+            return f"{champ}:{valeur}"
+    return ""
+
+
+def cle_enregistrement(client):
+    """Clé de la ligne en base : celle reprise de l'historique (voir dedoublonner), sinon cle_client"""
+    return client.get("cle") or cle_client(client)
+
+
+def _json_script(donnees):
+    """JSON sûr à insérer dans une balise <script>"""
+    return json.dumps(donnees, ensure_ascii=False).replace("</", "<\\/")
+
+
+# ---------------------------------------------------------------------------
+# Lecture des exports Excel "NOUVEAUX CLIENTS ... MGT.xlsx"
+# ---------------------------------------------------------------------------
+
+NS_XLSX = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+PRESTATAIRE = "MG TELECOM"
+EPOQUE_EXCEL = datetime(1899, 12, 30)
+# Au-delà, la table des chaînes partagées reste sur disque
+SEUIL_CHAINES_MEMOIRE = 8 * 1024 * 1024
+
+# Intitulé de colonne (normalisé) -> champ de l'enregistrement client
+ENTETES_EXCEL = {
+    "prestataire": "prestataire",
+    "horodateur": "horodateur",
+    "provenance": "provenance",
+    "nom et prénoms du client": "nom",
+    "contact du client": "contact",
+    "second contact du client": "contact2",
+    "ville/commune d'habitation du client": "ville",
+    "quartier d'habitation du client": "quartier",
+    "numéro ftth (tn)": "tn",
+    "numéro pack mobile": "pack_mobile",
+    "forfaits ftth": "forfait",
+    "type d'habitation du client": "type_habitation",
+    "forfaits ftth à 0 francs": "forfait_0f",
+    "forfaits ftth 2ième mois gratuit": "forfait_2e_mois",
+    "sn (serial number)": "sn",
+    "secteur d'habitation du client": "secteur",
+    "longitude (localisation gps)": "longitude",
+    "latitude (localisation gps)": "latitude",
+    "numéro ticket": "ticket",
+    "date de transmission": "date_transmission",
+}
+CHAMPS_DATE = ("horodateur", "date_transmission")
+CHAMPS_GPS = ("longitude", "latitude")
+
+
+def _normaliser_entete(texte):
+    return " ".join(str(texte or "").lower().split())
+
+
+def _indice_colonne(reference):
+    """'T12' -> 19"""
+    indice = 0
+    for car in reference:
+        if not car.isalpha():
+            break
+        indice = indice * 26 + ord(car.upper()) - 64
+    return indice - 1
+
+
+class ChainesSurDisque:
+    """Table de chaînes partagées stockée dans un fichier temporaire"""
+
+    def __init__(self):
+        self.fichier = tempfile.TemporaryFile()
+        self.positions = array("Q", [0])
+        self.lire = lru_cache(maxsize=4096)(self._lire)
+
+    def append(self, texte):
+        self.positions.append(self.positions[-1] + self.fichier.write(texte.encode("utf-8")))
+
+    def _lire(self, indice):
+        debut = self.positions[indice]
+        self.fichier.seek(debut)
+        return self.fichier.read(self.positions[indice + 1] - debut).decode("utf-8")
+
+    def __getitem__(self, indice):
+        return self.lire(indice)
+
+    def __len__(self):
+        return len(self.positions) - 1
+
+    def close(self):
+        self.fichier.close()
+
+
+def _lire_chaines_partagees(archive, seuil_memoire=SEUIL_CHAINES_MEMOIRE):
+    """Table sharedStrings.xml, lue élément par élément"""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    taille = archive.getinfo("xl/sharedStrings.xml").file_size
+    chaines = [] if taille <= seuil_memoire else ChainesSurDisque()
+    racine = None
+    with archive.open("xl/sharedStrings.xml") as f:
+        for evenement, elem in ET.iterparse(f, events=("start", "end")):
+            if racine is None:
+                racine = elem
+            elif evenement == "end" and elem.tag == NS_XLSX + "si":
+                chaines.append("".join(t.text or "" for t in elem.iter(NS_XLSX + "t")))
+                racine.clear()
+    return chaines
+
+
+def _valeur_cellule(cellule, chaines):
+    type_cellule = cellule.get("t")
+    if type_cellule == "inlineStr":
+        return "".join(t.text or "" for t in cellule.iter(NS_XLSX + "t"))
+    v = cellule.find(NS_XLSX + "v")
+    if v is None or v.text is None:
+        return None
+    if type_cellule == "s":
+        return chaines[int(v.text)]
+    if type_cellule in ("str", "e"):
+        return v.text
+    if type_cellule == "b":
+        return v.text == "1"
+    nombre = float(v.text)
+    return int(nombre) if nombre.is_integer() else nombre
+
+
+def _cellules_ligne(ligne):
+    cellules = {}
+    position = 0
+    for cellule in ligne.iter(NS_XLSX + "c"):
+        reference = cellule.get("r")
+        if reference:
+            position = _indice_colonne(reference)
+        cellules[position] = cellule
+        position += 1
+    return cellules
+
+
+def _date_excel(valeur):
+    if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+        return EPOQUE_EXCEL + timedelta(days=valeur)
+    texte = str(valeur).strip()
+    for fmt in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(texte, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def _typer_client(brut):
+    """Convertit les valeurs brutes d'une ligne en enregistrement client"""
+    client = {}
+    for champ, valeur in brut.items():
+        if valeur is None or valeur == "":
+            client[champ] = None if champ in CHAMPS_DATE + CHAMPS_GPS else ""
+        elif champ in CHAMPS_DATE:
+            client[champ] = _date_excel(valeur)
+        elif champ in CHAMPS_GPS:
+            try:
+                client[champ] = float(str(valeur).replace(",", "."))
+            except ValueError:
+                client[champ] = None
+        elif isinstance(valeur, float):
+            client[champ] = str(valeur)
+        else:
+            client[champ] = str(valeur).strip()
+    transmission = client.get("date_transmission")
+    if transmission is not None:
+        client["date_transmission"] = transmission.date()
+        client["date"] = transmission.strftime("%d-%m-%Y")
+    return client
+
+
+def _enregistrements(lignes, chaines, prestataire):
+    """Associe les lignes aux en-têtes et filtre par prestataire"""
+    colonnes = None
+    indice_prestataire = None
+    filtre = prestataire.strip().upper() if prestataire else None
+    for ligne in lignes:
+        cellules = _cellules_ligne(ligne)
+        if colonnes is None:
+            colonnes = {}
+            for indice, cellule in cellules.items():
+                entete = _normaliser_entete(_valeur_cellule(cellule, chaines))
+                if entete in ENTETES_EXCEL:
+                    colonnes[indice] = ENTETES_EXCEL[entete]
+            indice_prestataire = next((i for i, c in colonnes.items() if c == "prestataire"), None)
+            continue
+        # Le prestataire est décodé seul : les autres lignes ne coûtent rien de plus
+        if filtre is not None:
+            cellule = cellules.get(indice_prestataire)
+            valeur = _valeur_cellule(cellule, chaines) if cellule is not None else None
+            if str(valeur or "").strip().upper() != filtre:
+                continue
+        valeurs = {
+            champ: _valeur_cellule(cellules[indice], chaines)
+            for indice, champ in colonnes.items()
+            if indice in cellules
+        }
+        if not any(v not in (None, "") for v in valeurs.values()):
+            continue
+        yield _typer_client({champ: valeurs.get(champ) for champ in colonnes.values()})
+
+
+def lire_excel_clients(chemin, prestataire=PRESTATAIRE, feuille="xl/worksheets/sheet1.xml"):
+    """Lit un export Excel ligne par ligne et produit les clients du prestataire"""
+    with zipfile.ZipFile(chemin) as archive:
+        chaines = _lire_chaines_partagees(archive)
+        try:
+            with archive.open(feuille) as f:
+                yield from _enregistrements(_lignes_en_flux(f), chaines, prestataire)
+        finally:
+            if isinstance(chaines, ChainesSurDisque):
+                chaines.close()
+
+
+def _lignes_en_flux(f):
+    """Parcourt les <row> de sheetData en libérant chaque ligne après usage"""
+    donnees = None
+    for evenement, elem in ET.iterparse(f, events=("start", "end")):
+        if evenement == "start":
+            if elem.tag == NS_XLSX + "sheetData":
+                donnees = elem
+            continue
+        if elem.tag == NS_XLSX + "row":
+            yield elem
+            donnees.clear()
+
+
+def charger_excel_complet(chemin, prestataire=PRESTATAIRE, feuille="xl/worksheets/sheet1.xml"):
+    """Chargement intégral en mémoire (référence pour le benchmark)"""
+    with zipfile.ZipFile(chemin) as archive:
+        chaines = _lire_chaines_partagees(archive, seuil_memoire=float("inf"))
+        racine = ET.fromstring(archive.read(feuille))
+    lignes = racine.find(NS_XLSX + "sheetData").findall(NS_XLSX + "row")
+    return list(_enregistrements(lignes, chaines, prestataire))
+
+
+# ---------------------------------------------------------------------------
+# Classeurs synthétiques et benchmark de lecture
+# ---------------------------------------------------------------------------
+
+ENTETES_SYNTHETIQUES = [
+    "Prestataire", "Horodateur", "Provenance", "Nom et Prénoms du Client",
+    "Contact du Client", "Second contact du Client", "Ville/Commune d'habitation du Client",
+    "Quartier d'habitation du Client ", "Numéro FTTH (TN)", "Numéro Pack Mobile",
+    "Forfaits FTTH", "Type d'habitation du Client", "Forfaits FTTH à 0 francs",
+    "Forfaits FTTH  2ième Mois Gratuit", "SN (Serial Number)", "Secteur d'habitation du Client ",
+    "Longitude (LOCALISATION GPS)", "Latitude  (LOCALISATION GPS)", "Numéro Ticket",
+    "Date de Transmission",
+]
+NOMS_SYNTHETIQUES = ["HAÏDARA", "KOUADIO", "N'GORAN", "KOUASSI", "TOURÉ", "BAMBA", "KONÉ", "ZADJEHI"]
+PRENOMS_SYNTHETIQUES = ["MOHAMED", "SERGES", "AKISSI NATHALIE", "AMADOU", "ÉLODIE", "ADJOUA", "YAO"]
+PRESTATAIRES_SYNTHETIQUES = ["MG TELECOM", "DISTRICOM", "PROXIMITY", "2SCOM", "OSD"]
+VILLES_SYNTHETIQUES = ["SAN PEDRO", "MARCORY", "ABOBO", "YAMOUSSOUKRO", "KORHOGO", "GAGNOA"]
+FORFAITS_SYNTHETIQUES = [
+    "10.000 F (100 Mb/s ; 4Go + 120 min)",
+    "15.000 F (100 Mb/s ; 4Go + 240 min)",
+    "20.000 F (200 Mb/s ; 6Go + 240 min)",
+]
+
+
+def _nom_synthetique(i, rng):
+    """Nom accentué unique dans ses 15 premiers caractères, comme les fichiers du dossier"""
+    code = ""
+    for _ in range(4):
+        i, reste = divmod(i, 26)
+        code = chr(65 + reste) + code
+    return f"{rng.choice(NOMS_SYNTHETIQUES)} {code} {rng.choice(PRENOMS_SYNTHETIQUES)}"
+
+
+def _ligne_synthetique(i, rng, jour):
+    nom = _nom_synthetique(i, rng)
+    forfait = rng.choice(FORFAITS_SYNTHETIQUES)
+    return [
+        rng.choice(PRESTATAIRES_SYNTHETIQUES), jour + rng.random(), rng.choice(["OSD", "MDI", "AGENCE"]),
+        nom, f"05{rng.randrange(10**8):08d}", f"07{rng.randrange(10**8):08d}",
+        rng.choice(VILLES_SYNTHETIQUES), f"QUARTIER {rng.randrange(40)}",
+        f"25360{i:05d}@mtn.ci", f"05{rng.randrange(10**8):08d}", forfait,
+        rng.choice(["Immeuble", "Maison basse"]), forfait if rng.random() < 0.3 else "",
+        forfait if rng.random() < 0.2 else "", f"48575443{i:08X}", f"SECTEUR {rng.randrange(12)}",
+        str(-6.64 + rng.random() * 0.1), str(4.74 + rng.random() * 0.1),
+        f"TK{i:06d}", jour,
+    ]
+
+
+def ecrire_excel_synthetique(chemin, lignes, graine=2026, jour=46034, jours=1):
+    """Écrit un export "NOUVEAUX CLIENTS" factice au format des partenaires"""
+    rng = random.Random(graine)
+    chaines, indices = [], {}
+
+    def cellule(colonne, ligne, valeur):
+        ref = f"{colonne}{ligne}"
+        if isinstance(valeur, (int, float)):
+            return f'<c r="{ref}"><v>{valeur}</v></c>'
+        if valeur == "":
+            return ""
+        if valeur not in indices:
+            indices[valeur] = len(chaines)
+            chaines.append(valeur)
+        return f'<c r="{ref}" t="s"><v>{indices[valeur]}</v></c>'
+
+    lettres = [chr(65 + i) for i in range(len(ENTETES_SYNTHETIQUES))]
+    with zipfile.ZipFile(chemin, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("xl/worksheets/sheet1.xml", "w") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<worksheet xmlns="{NS_XLSX[1:-1]}"><sheetData>'.encode())
+            for numero in range(1, lignes + 2):
+                if numero == 1:
+                    valeurs = ENTETES_SYNTHETIQUES
+                else:
+                    valeurs = _ligne_synthetique(numero - 1, rng, jour + (numero - 2) * jours // lignes)
+                contenu = "".join(cellule(c, numero, escape(v) if isinstance(v, str) else v)
+                                  for c, v in zip(lettres, valeurs))
+                f.write(f'<row r="{numero}">{contenu}</row>'.encode())
+            f.write(b"</sheetData></worksheet>")
+        sst = "".join(f"<si><t>{c}</t></si>" for c in chaines)
+        archive.writestr("xl/sharedStrings.xml",
+                         f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                         f'<sst xmlns="{NS_XLSX[1:-1]}" uniqueCount="{len(chaines)}">{sst}</sst>')
+        archive.writestr("xl/workbook.xml",
+                         f'<workbook xmlns="{NS_XLSX[1:-1]}" xmlns:r="http://schemas.openxmlformats.org/'
+                         f'officeDocument/2006/relationships"><sheets><sheet name="Feuil1" sheetId="1" '
+                         f'r:id="rId1"/></sheets></workbook>')
+        archive.writestr("xl/_rels/workbook.xml.rels",
+                         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                         '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                         'relationships/worksheet" Target="worksheets/sheet1.xml"/></Relationships>')
+        archive.writestr("[Content_Types].xml",
+                         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                         '<Default Extension="xml" ContentType="application/xml"/>'
+                         '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                         '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-'
+                         'officedocument.spreadsheetml.sheet.main+xml"/></Types>')
+    return chemin
+
+
+def _mesurer_lecture(mode, chemin, prestataire):
+    """Lecture dans un processus dédié : durée et pic RSS (Ko)"""
+    debut = time.perf_counter()
+    if mode == "flux":
+        clients = sum(1 for _ in lire_excel_clients(chemin, prestataire))
+    else:
+        clients = len(charger_excel_complet(chemin, prestataire))
+    duree = time.perf_counter() - debut
+    return clients, duree, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def benchmark_lecture_excel(lignes=100_000, prestataire=PRESTATAIRE):
+    """Compare la lecture en flux au chargement complet sur un classeur synthétique"""
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = ecrire_excel_synthetique(os.path.join(dossier, "NOUVEAUX CLIENTS SYNTHETIQUE.xlsx"), lignes)
+        mesures = {}
+        # Un processus neuf par mode pour que les pics RSS ne se mélangent pas
+        for mode in ("flux", "complet"):
+            with ProcessPoolExecutor(max_workers=1) as executeur:
+                mesures[mode] = executeur.submit(_mesurer_lecture, mode, chemin, prestataire).result()
+
+    table = Table(title=f"Lecture Excel — {lignes:,} lignes".replace(",", " "))
+    table.add_column("Mode")
+    table.add_column("Clients", justify="right")
+    table.add_column("Durée (s)", justify="right")
+    table.add_column("Pic RSS (Mo)", justify="right")
+    for mode, (clients, duree, pic) in mesures.items():
+        table.add_row(mode.capitalize(), str(clients), f"{duree:.2f}", f"{pic / 1024:.1f}")
+    console.print(table)
+    return {
+        mode: {"clients": clients, "duree": duree, "pic_rss_ko": pic}
+        for mode, (clients, duree, pic) in mesures.items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Base clients SQLite (historique complet derrière le paramètre db)
+# ---------------------------------------------------------------------------
+
+FICHIER_BASE = os.environ.get("FTTH_BASE", "clients.sqlite")
+CHAMPS_BASE = ["cle", "date", "equipe"] + list(ENTETES_EXCEL.values()) + ["ordre"]
+INDEX_BASE = ("tn", "sn", "equipe", "date", "ville", "prestataire")
+# Suivi des modifications, base des deltas poussés aux dashboards : séquence du dernier
+# import ayant touché la ligne et équipe qu'elle avait avant
+COLONNES_SUIVI = {
+    "modifie": "modifie INTEGER NOT NULL DEFAULT 0",
+    "equipe_avant": "equipe_avant TEXT NOT NULL DEFAULT ''",
+}
+CHAMPS_IDENTITE = ("cle", "date", "equipe", "nom", "contact", "contact2", "tn", "sn", "ville")
+# date reste au format des exports (DD-MM-YYYY) ; jour en est la forme ISO, calculée
+# par SQLite, sur laquelle portent tris et filtres de période
+COLONNE_JOUR = ("jour TEXT GENERATED ALWAYS AS "
+                "(substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2)) VIRTUAL")
+# cle reste dans les enregistrements lus : elle peut différer de cle_client après une correction
+COLONNES_INTERNES = ("jour", *COLONNES_SUIVI)
+
+
+def _periode_sql(du=None, au=None):
+    """Conditions SQL (et paramètres) d'une période [du, au] de datetime, bornes None ouvertes"""
+    conditions, parametres = [], []
+    if du is not None:
+        conditions.append("jour >= ?")
+        parametres.append(du.strftime("%Y-%m-%d"))
+    if au is not None:
+        conditions.append("jour <= ?")
+        parametres.append(au.strftime("%Y-%m-%d"))
+    return conditions, parametres
+
+
+def _colonne_base(champ):
+    if champ in CHAMPS_GPS:
+        return f"{champ} REAL"
+    if champ == "ordre":
+        return f"{champ} INTEGER"
+    if champ in ("cle", "date"):
+        return f"{champ} TEXT NOT NULL DEFAULT ''"
+    return f"{champ} TEXT"
+
+
+class BaseClients:
+    """Clients de tous les imports, une ligne par client et par jour d'installation
+
+    S'utilise partout où un db est attendu : db.get("clients") reste valide,
+    mais les dashboards passent par les requêtes indexées.
+    """
+
+    def __init__(self, chemin=FICHIER_BASE, partagee=False):
+        self.chemin = chemin
+        # partagee : connexion utilisée depuis un autre fil que celui qui l'a ouverte, jamais en parallèle
+        self.connexion = sqlite3.connect(chemin, check_same_thread=not partagee)
+        self.connexion.row_factory = sqlite3.Row
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        colonnes = ", ".join(_colonne_base(champ) for champ in CHAMPS_BASE)
+        with self.connexion:
+            self.connexion.execute(
+                f"CREATE TABLE IF NOT EXISTS clients ({colonnes}, {', '.join(COLONNES_SUIVI.values())}, "
+                f"{COLONNE_JOUR}, UNIQUE (cle, date))")
+            # Bases créées par une version antérieure : colonnes ajoutées depuis
+            existantes = {ligne[1] for ligne in self.connexion.execute("PRAGMA table_xinfo(clients)")}
+            for champ in CHAMPS_BASE:
+                if champ not in existantes:
+                    self.connexion.execute(f"ALTER TABLE clients ADD COLUMN {_colonne_base(champ)}")
+            for champ, colonne in COLONNES_SUIVI.items():
+                if champ not in existantes:
+                    self.connexion.execute(f"ALTER TABLE clients ADD COLUMN {colonne}")
+            if "jour" not in existantes:
+                self.connexion.execute(f"ALTER TABLE clients ADD COLUMN {COLONNE_JOUR}")
+            # Clés normalisées (TN, SN, téléphones, blocs de nom) pour la détection de doublons
+            self.connexion.execute(
+                "CREATE TABLE IF NOT EXISTS identites (type TEXT NOT NULL, valeur TEXT NOT NULL, "
+                "cle TEXT NOT NULL, date TEXT NOT NULL, UNIQUE (type, valeur, cle, date))")
+            for champ in INDEX_BASE + ("modifie", "jour"):
+                self.connexion.execute(f"CREATE INDEX IF NOT EXISTS idx_clients_{champ} ON clients ({champ})")
+            # Classeurs déjà importés : la veille ne les relit pas à son démarrage
+            self.connexion.execute(
+                "CREATE TABLE IF NOT EXISTS classeurs (chemin TEXT PRIMARY KEY, mtime INTEGER NOT NULL, "
+                "taille INTEGER NOT NULL, importe_le TEXT NOT NULL)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fermer()
+
+    def fermer(self):
+        self.connexion.close()
+
+    def upsert(self, clients):
+        """Insère ou met à jour un import complet en une seule transaction
+
+        Les lignes insérées ou réellement modifiées reçoivent un nouveau numéro
+        de séquence (colonne modifie) ; une ligne réimportée à l'identique garde le sien.
+        """
+        colonnes = ", ".join(CHAMPS_BASE)
+        marques = ", ".join("?" * len(CHAMPS_BASE))
+        maj = ", ".join(f"{champ} = excluded.{champ}" for champ in CHAMPS_BASE[2:])
+        differences = " OR ".join(f"clients.{champ} IS NOT excluded.{champ}" for champ in CHAMPS_BASE[2:])
+        requete = (f"INSERT INTO clients ({colonnes}, modifie) VALUES ({marques}, ?) "
+                   f"ON CONFLICT (cle, date) DO UPDATE SET {maj}, modifie = excluded.modifie, "
+                   f"equipe_avant = CASE WHEN clients.equipe IS NOT excluded.equipe "
+                   f"THEN clients.equipe ELSE clients.equipe_avant END WHERE {differences}")
+        with self.connexion:
+            sequence = self.sequence() + 1
+            curseur = self.connexion.executemany(
+                requete, (self._ligne(client) + [sequence] for client in clients))
+            self._indexer_identites(clients)
+        return curseur.rowcount
+
+    def sequence(self):
+        """Numéro de séquence de la dernière modification enregistrée"""
+        return self.connexion.execute("SELECT COALESCE(MAX(modifie), 0) FROM clients").fetchone()[0]
+
+    def modifications(self, depuis):
+        """Lignes insérées ou modifiées après la séquence `depuis`, avec l'équipe d'avant"""
+        curseur = self.connexion.execute(
+            "SELECT * FROM clients WHERE modifie > ? ORDER BY modifie, rowid", (depuis,))
+        return [{cle: ligne[cle] for cle in ligne.keys() if cle not in ("jour", "modifie")} for ligne in curseur]
+
+    def _indexer_identites(self, clients):
+        self.connexion.executemany(
+            "INSERT OR IGNORE INTO identites VALUES (?, ?, ?, ?)",
+            ((genre, valeur, cle_enregistrement(client), client.get("date") or "")
+             for client in clients for genre, valeur in cles_identite(client)))
+
+    def candidats(self, cles, limite=None):
+        """Lignes de l'historique partageant l'une des clés d'identité (voir cles_identite)"""
+        if not self.connexion.execute("SELECT 1 FROM identites LIMIT 1").fetchone():
+            # Base antérieure à la table identites : indexation unique de l'historique
+            with self.connexion:
+                self._indexer_identites(
+                    dict(zip(CHAMPS_IDENTITE, ligne))
+                    for ligne in self.connexion.execute(f"SELECT {', '.join(CHAMPS_IDENTITE)} FROM clients"))
+        colonnes = ", ".join(f"c.{champ}" for champ in CHAMPS_IDENTITE)
+        lignes = {}
+        for genre, valeur in cles:
+            curseur = self.connexion.execute(
+                f"SELECT {colonnes} FROM identites i JOIN clients c ON c.cle = i.cle AND c.date = i.date "
+                f"WHERE i.type = ? AND i.valeur = ? LIMIT ?", (genre, valeur, limite or TAILLE_MAX_BLOC))
+            for ligne in curseur:
+                lignes.setdefault((ligne[0], ligne[1]), dict(zip(CHAMPS_IDENTITE, ligne)))
+        return list(lignes.values())
+
+    def enregistrer_classeurs(self, chemins):
+        """Note la signature (mtime, taille) des classeurs qui viennent d'être importés"""
+        maintenant = datetime.now().isoformat(timespec="seconds")
+        lignes = [(os.path.abspath(chemin), *signature, maintenant)
+                  for chemin in chemins for signature in [_signature_fichier(chemin)] if signature]
+        with self.connexion:
+            self.connexion.executemany("INSERT OR REPLACE INTO classeurs VALUES (?, ?, ?, ?)", lignes)
+
+    def classeurs_importes(self):
+        """{chemin absolu: (mtime_ns, taille)} des classeurs tels qu'importés la dernière fois"""
+        curseur = self.connexion.execute("SELECT chemin, mtime, taille FROM classeurs")
+        return {chemin: (mtime, taille) for chemin, mtime, taille in curseur}
+
+    def jours_equipe(self, equipe):
+        return self.connexion.execute(
+            "SELECT COUNT(DISTINCT date) FROM clients WHERE equipe = ?", (equipe,)).fetchone()[0]
+
+    @staticmethod
+    def _ligne(client):
+        ligne = [cle_enregistrement(client), client.get("date") or ""]
+        for champ in CHAMPS_BASE[2:]:
+            valeur = client.get(champ)
+            ligne.append(str(valeur) if valeur is not None and champ in CHAMPS_DATE else valeur)
+        return ligne
+
+    def clients(self, du=None, au=None, **filtres):
+        """Enregistrements correspondant aux filtres (champ=valeur) et à la période [du, au], par jour puis équipe"""
+        inconnus = filtres.keys() - set(CHAMPS_BASE)
+        if inconnus:
+            raise KeyError(f"champ(s) inconnu(s) : {', '.join(sorted(inconnus))}")
+        conditions, parametres = _periode_sql(du, au)
+        conditions += [f"{champ} = ?" for champ in filtres]
+        curseur = self.connexion.execute(
+            f"SELECT * FROM clients WHERE {' AND '.join(conditions) or '1'} ORDER BY jour, equipe, ordre, rowid",
+            parametres + list(filtres.values()))
+        return [{cle: ligne[cle] for cle in ligne.keys() if cle not in COLONNES_INTERNES} for ligne in curseur]
+
+    def get(self, cle, defaut=None):
+        """Compatibilité avec le db historique {"clients": [...]}"""
+        return self.clients() if cle == "clients" else defaut
+
+    def equipes_connues(self, dates):
+        """{(clé client, date): équipe} déjà enregistrées pour ces dates"""
+        connues = {}
+        for date in set(dates):
+            curseur = self.connexion.execute(
+                "SELECT cle, equipe FROM clients WHERE date = ? AND equipe <> ''", (date,))
+            connues.update(((cle, date), equipe) for cle, equipe in curseur)
+        return connues
+
+    def equipes(self):
+        curseur = self.connexion.execute(
+            "SELECT DISTINCT equipe FROM clients WHERE equipe <> '' ORDER BY equipe")
+        return [ligne[0] for ligne in curseur]
+
+    def dates(self, du=None, au=None):
+        """Dates DD-MM-YYYY ayant au moins un client affecté, dans l'ordre chronologique"""
+        conditions, parametres = _periode_sql(du, au)
+        conditions.insert(0, "equipe <> ''")
+        curseur = self.connexion.execute(
+            f"SELECT DISTINCT date, jour FROM clients WHERE {' AND '.join(conditions)} ORDER BY jour", parametres)
+        return [date for date, _ in curseur]
+
+    def comptes_par_date(self):
+        """{date: {equipe: installations}}"""
+        comptes = {}
+        curseur = self.connexion.execute(
+            "SELECT date, equipe, COUNT(*) FROM clients WHERE equipe <> '' GROUP BY date, equipe")
+        for date, equipe, nombre in curseur:
+            comptes.setdefault(date, {})[equipe] = nombre
+        return comptes
+
+    def points_gps(self, equipe=None):
+        """(longitude, latitude, équipe) des clients géolocalisés"""
+        requete = ("SELECT longitude, latitude, equipe FROM clients "
+                   "WHERE longitude IS NOT NULL AND latitude IS NOT NULL")
+        parametres = []
+        if equipe:
+            requete += " AND equipe = ?"
+            parametres.append(equipe)
+        curseur = self.connexion.execute(requete, parametres)
+        return [(lon, lat, equipe or "") for lon, lat, equipe in curseur if _coordonnees_valides(lon, lat)]
+
+
+def clients_db(db, **filtres):
+    """Clients d'un db (base SQLite ou {"clients": [...]}) filtrés par champ"""
+    if isinstance(db, BaseClients):
+        return db.clients(**filtres)
+    return [c for c in db.get("clients", []) if all(c.get(k) == v for k, v in filtres.items())]
+
+
+# ---------------------------------------------------------------------------
+# Gabarits HTML compilés
+# ---------------------------------------------------------------------------
+
+class Brut(str):
+    """Fragment HTML inséré tel quel dans un gabarit"""
+
+
+class Gabarit:
+    """Gabarit compilé : {{ nom }} est échappé sauf si la valeur est Brut"""
+
+    MOTIF = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+    def __init__(self, source):
+        self.morceaux = []
+        self.emplacements = []
+        position = 0
+        for m in self.MOTIF.finditer(source):
+            self.morceaux.append(source[position:m.start()])
+            self.emplacements.append((len(self.morceaux), m.group(1)))
+            self.morceaux.append("")
+            position = m.end()
+        self.morceaux.append(source[position:])
+        self.noms = {nom for _, nom in self.emplacements}
+
+    def rendre(self, **valeurs):
+        manquants = self.noms - valeurs.keys()
+        if manquants:
+            raise KeyError(f"emplacements non remplis : {', '.join(sorted(manquants))}")
+        morceaux = self.morceaux.copy()
+        for indice, nom in self.emplacements:
+            valeur = valeurs[nom]
+            morceaux[indice] = valeur if isinstance(valeur, Brut) else html_escape(str(valeur))
+        return "".join(morceaux)
+
+
+@lru_cache(maxsize=None)
+def gabarit(nom):
+    """Gabarit compilé une seule fois par processus"""
+    return Gabarit(SOURCES_GABARITS[nom])
+
+
+# ---------------------------------------------------------------------------
+# Feuille de style et script partagés (assets/app.<hash>.css / .js)
+# ---------------------------------------------------------------------------
+
+DOSSIER_ASSETS = "assets"
+
+
+def _accolade_fermante(texte, ouverture):
+    profondeur = 0
+    for i in range(ouverture, len(texte)):
+        if texte[i] == "{":
+            profondeur += 1
+        elif texte[i] == "}":
+            profondeur -= 1
+            if not profondeur:
+                return i
+    raise ValueError("accolade non fermée dans la feuille de style")
+
+
+def _scoper_selecteur(selecteur, portee):
+    if selecteur in (":root", "html"):
+        return f"body.{portee}"
+    if selecteur.startswith("body"):
+        return f"body.{portee}{selecteur[4:]}"
+    if selecteur.startswith("*"):
+        return f"body.{portee}{selecteur[1:]}, .{portee} {selecteur}"
+    return f".{portee} {selecteur}"
+
+
+def scoper_css(css, portee):
+    """Préfixe chaque règle par la classe de page pour fusionner les feuilles"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    regles = []
+    i = 0
+    while True:
+        ouverture = css.find("{", i)
+        if ouverture < 0:
+            break
+        selecteur = css[i:ouverture].strip()
+        fermeture = _accolade_fermante(css, ouverture)
+        corps = css[ouverture + 1:fermeture]
+        if selecteur.startswith(("@media", "@supports")):
+            corps = scoper_css(corps, portee)
+        elif not selecteur.startswith("@"):
+            selecteur = ", ".join(_scoper_selecteur(s.strip(), portee) for s in selecteur.split(","))
+        regles.append(f"{selecteur} {{{corps}}}")
+        i = fermeture + 1
+    return "\n".join(regles)
+
+
+def minifier_css(css):
+    """Supprime commentaires et espaces superflus (hors chaînes)"""
+    morceaux = re.split(r"""("[^"]*"|'[^']*')""", re.sub(r"/\*.*?\*/", "", css, flags=re.S))
+    for i in range(0, len(morceaux), 2):
+        texte = re.sub(r"\s+", " ", morceaux[i])
+        texte = re.sub(r"\s*([{};,>])\s*", r"\1", texte)
+        morceaux[i] = re.sub(r":\s+", ":", texte).replace(";}", "}")
+    return "".join(morceaux).strip()
+
+
+def minifier_js(js):
+    """Retire indentation, lignes vides et commentaires de ligne"""
+    lignes = (ligne.strip() for ligne in js.splitlines())
+    return "\n".join(ligne for ligne in lignes if ligne and not ligne.startswith("//"))
+
+
+def _script_de_page(js, portee):
+    return (f"(function () {{\nif (!document.body.classList.contains('{portee}')) return;\n"
+            f"{js}\n}})();")
+
+
+def _ecrire_asset(nom, extension, contenu):
+    empreinte = hashlib.sha256(contenu.encode("utf-8")).hexdigest()[:10]
+    chemin = f"{DOSSIER_ASSETS}/{nom}.{empreinte}.{extension}"
+    if not os.path.exists(chemin):
+        os.makedirs(DOSSIER_ASSETS, exist_ok=True)
+        with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+            f.write(contenu)
+        os.replace(chemin + ".tmp", chemin)
+    return chemin
+
+
+@lru_cache(maxsize=None)
+def bundle_assets():
+    """Écrit (une fois par processus) le CSS et le JS communs à toutes les pages"""
+    css = "\n".join(scoper_css(feuille, portee) for portee, feuille in FEUILLES_PAGES.items())
+    js = "\n".join(_script_de_page(script, portee) for portee, script in SCRIPTS_PAGES.items())
+    return {
+        "css": _ecrire_asset("app", "css", minifier_css(css)),
+        "js": _ecrire_asset("app", "js", minifier_js(js)),
+    }
+
+
+def balise_css(prefixe=""):
+    return f'<link rel="stylesheet" href="{prefixe}{bundle_assets()["css"]}">'
+
+
+def balise_js(prefixe=""):
+    return f'<script src="{prefixe}{bundle_assets()["js"]}"></script>'
+
+
+# ---------------------------------------------------------------------------
+# Assemblage PDF en flux
+# ---------------------------------------------------------------------------
+
+A4 = (595.2756, 841.8898)
+DPI_IMPRESSION = int(os.environ.get("FTTH_DPI_PDF", "150"))
+# Nombre de couleurs de la palette des fiches (0 : pas de réduction)
+COULEURS_PDF = int(os.environ.get("FTTH_COULEURS_PDF", "32"))
+SIGNATURE_PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def _lire_png(donnees):
+    """En-tête, palette et données IDAT d'un PNG non entrelacé"""
+    if not donnees.startswith(SIGNATURE_PNG):
+        raise ValueError("image PNG attendue")
+    png = {"palette": None, "idat": []}
+    position = len(SIGNATURE_PNG)
+    while position < len(donnees):
+        longueur, genre = struct.unpack(">I4s", donnees[position:position + 8])
+        corps = donnees[position + 8:position + 8 + longueur]
+        position += 12 + longueur
+        if genre == b"IHDR":
+            (png["largeur"], png["hauteur"], png["profondeur"], png["couleur"],
+             _, _, entrelace) = struct.unpack(">IIBBBBB", corps)
+            if entrelace:
+                raise ValueError("PNG entrelacé non pris en charge")
+        elif genre == b"PLTE":
+            png["palette"] = corps
+        elif genre == b"IDAT":
+            png["idat"].append(corps)
+        elif genre == b"IEND":
+            break
+    if png["couleur"] not in (0, 2, 3):
+        raise ValueError("PNG avec transparence non pris en charge")
+    return png
+
+
+def preparer_image_pdf(chemin, largeur_points, dpi=DPI_IMPRESSION, couleurs=COULEURS_PDF):
+    """Réduit une image à la résolution d'impression et à une palette compacte
+
+    Sans Pillow, ou si dpi vaut 0, le PNG d'origine est repris tel quel.
+    """
+    with open(chemin, "rb") as f:
+        donnees = f.read()
+    if not dpi:
+        return donnees
+    try:
+        from PIL import Image
+    except ImportError:
+        return donnees
+
+    image = Image.open(io.BytesIO(donnees)).convert("RGB")
+    largeur = round(largeur_points / 72 * dpi)
+    if largeur < image.width:
+        image = image.resize((largeur, round(image.height * largeur / image.width)), Image.LANCZOS)
+    if couleurs:
+        image = image.quantize(couleurs, method=Image.Quantize.FASTOCTREE)
+    tampon = io.BytesIO()
+    image.save(tampon, "PNG", optimize=True)
+    return tampon.getvalue()
+
+
+class PdfEnFlux:
+    """Écrit un PDF page par page sur disque ; chaque image n'est intégrée qu'une fois"""
+
+    def __init__(self, chemin, format_page=A4):
+        self.chemin = chemin
+        self.format_page = format_page
+        self.fichier = open(chemin + ".tmp", "wb")
+        self.positions = []
+        self.pages = []
+        self.images = {}
+        self.polices = {}
+        self.fichier.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.catalogue = self._reserver()
+        self.arbre_pages = self._reserver()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.fermer()
+        else:
+            self.fichier.close()
+            os.remove(self.chemin + ".tmp")
+
+    def _reserver(self):
+        self.positions.append(None)
+        return len(self.positions)
+
+    def _objet(self, numero, dictionnaire, flux=None):
+        self.positions[numero - 1] = self.fichier.tell()
+        self.fichier.write(f"{numero} 0 obj\n".encode())
+        if flux is None:
+            self.fichier.write(dictionnaire.encode("latin-1") + b"\nendobj\n")
+            return
+        self.fichier.write(f"{dictionnaire[:-2]} /Length {len(flux)} >>\nstream\n".encode("latin-1"))
+        self.fichier.write(flux)
+        self.fichier.write(b"\nendstream\nendobj\n")
+
+    def image(self, donnees_png):
+        """Intègre une image PNG (une seule fois par contenu) et renvoie son nom de ressource"""
+        empreinte = hashlib.sha256(donnees_png).hexdigest()
+        if empreinte in self.images:
+            return self.images[empreinte]
+        png = _lire_png(donnees_png)
+        composantes = 3 if png["couleur"] == 2 else 1
+        if png["couleur"] == 3:
+            palette = png["palette"]
+            espace = f"[/Indexed /DeviceRGB {len(palette) // 3 - 1} <{palette.hex()}>]"
+        else:
+            espace = "/DeviceRGB" if composantes == 3 else "/DeviceGray"
+        numero = self._reserver()
+        self._objet(numero, (
+            f"<< /Type /XObject /Subtype /Image /Width {png['largeur']} /Height {png['hauteur']} "
+            f"/ColorSpace {espace} /BitsPerComponent {png['profondeur']} /Filter /FlateDecode "
+            f"/DecodeParms << /Predictor 15 /Colors {composantes} /BitsPerComponent {png['profondeur']} "
+            f"/Columns {png['largeur']} >> >>"
+        ), b"".join(png["idat"]))
+        nom = f"Im{len(self.images) + 1}"
+        self.images[empreinte] = (nom, numero, png["largeur"], png["hauteur"])
+        return self.images[empreinte]
+
+    def ajouter_page(self, contenu, images=(), polices=None):
+        """Écrit une page : flux de contenu et ressources utilisées"""
+        ressources = ""
+        if images:
+            ressources += "/XObject << " + " ".join(f"/{nom} {numero} 0 R" for nom, numero, *_ in images) + " >> "
+        if polices:
+            ressources += "/Font << " + " ".join(f"/{nom} {numero} 0 R" for nom, numero in polices.items()) + " >> "
+        flux = zlib.compress(contenu.encode("latin-1") if isinstance(contenu, str) else contenu)
+        numero_contenu = self._reserver()
+        self._objet(numero_contenu, "<< /Filter /FlateDecode >>", flux)
+        numero_page = self._reserver()
+        largeur, hauteur = self.format_page
+        self._objet(numero_page, (
+            f"<< /Type /Page /Parent {self.arbre_pages} 0 R /MediaBox [0 0 {largeur} {hauteur}] "
+            f"/Resources << {ressources}>> /Contents {numero_contenu} 0 R >>"
+        ))
+        self.pages.append(numero_page)
+
+    def page_image(self, donnees_png):
+        """Page contenant une seule image ajustée et centrée"""
+        image = self.image(donnees_png)
+        _, _, largeur_px, hauteur_px = image
+        largeur, hauteur = self.format_page
+        echelle = min(largeur / largeur_px, hauteur / hauteur_px)
+        l, h = largeur_px * echelle, hauteur_px * echelle
+        x, y = (largeur - l) / 2, (hauteur - h) / 2
+        self.ajouter_page(f"q {l:.2f} 0 0 {h:.2f} {x:.2f} {y:.2f} cm /{image[0]} Do Q", [image])
+
+    def police(self, gras=False):
+        """Police standard Helvetica (aucun fichier de police à intégrer)"""
+        nom = "F2" if gras else "F1"
+        if nom not in self.polices:
+            numero = self._reserver()
+            base = "Helvetica-Bold" if gras else "Helvetica"
+            self._objet(numero, f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>")
+            self.polices[nom] = numero
+        return nom
+
+    def page_primitives(self, primitives, largeur_px, hauteur_px):
+        """Page vectorielle : primitives d'une fiche ajustées et centrées"""
+        largeur, hauteur = self.format_page
+        echelle = min(largeur / largeur_px, hauteur / hauteur_px)
+        x, y = (largeur - largeur_px * echelle) / 2, (hauteur + hauteur_px * echelle) / 2
+        # Repère de la fiche : origine en haut à gauche, y vers le bas
+        operations = [f"q {echelle:.5f} 0 0 {-echelle:.5f} {x:.2f} {y:.2f} cm"]
+        for primitive in primitives:
+            operations.extend(_operations_pdf(self, primitive))
+        operations.append("Q")
+        self.ajouter_page("\n".join(operations), polices=self.polices)
+
+    def fermer(self):
+        kids = " ".join(f"{n} 0 R" for n in self.pages)
+        self._objet(self.arbre_pages, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>")
+        self._objet(self.catalogue, f"<< /Type /Catalog /Pages {self.arbre_pages} 0 R >>")
+        debut_xref = self.fichier.tell()
+        self.fichier.write(f"xref\n0 {len(self.positions) + 1}\n0000000000 65535 f \n".encode())
+        for position in self.positions:
+            self.fichier.write(f"{position:010d} 00000 n \n".encode())
+        self.fichier.write((
+            f"trailer\n<< /Size {len(self.positions) + 1} /Root {self.catalogue} 0 R >>\n"
+            f"startxref\n{debut_xref}\n%%EOF\n"
+        ).encode())
+        self.fichier.close()
+        os.replace(self.chemin + ".tmp", self.chemin)
+
+
+# ---------------------------------------------------------------------------
+# Génération des dossiers dossier_DD-MM-YYYY
+# ---------------------------------------------------------------------------
+
+# À incrémenter à chaque modification des gabarits (fiche, QR, page, PDF)
+VERSION_GABARITS = "6"
+FICHIER_MANIFESTE = ".build.json"
+URL_SITE = os.environ.get("FTTH_URL_SITE", "")
+# 0 : autant de processus que de cœurs
+PROCESSUS_RENDU = int(os.environ.get("FTTH_PROCESSUS", "0"))
+DOSSIER_CACHE_QR = os.path.join(".cache", "qr")
+CAPACITE_CACHE_QR = int(os.environ.get("FTTH_CACHE_QR", "20000"))
+PARAMETRES_QR = {"correction": "M", "taille_module": 10, "marge": 4}
+# "svg" : fiches vectorielles (PNG seulement en aperçu) ; "png" : fiches raster historiques
+FORMAT_FICHES = os.environ.get("FTTH_FORMAT_FICHES", "svg")
+TAILLE_FICHE = (1200, 1250)
+# Vignettes des fiches PNG : seules ces images sont chargées sur le terrain, la fiche
+# complète n'est téléchargée qu'au toucher (zoom, impression). Une fiche SVG, plus
+# légère que ses vignettes, est affichée elle-même en chargement différé.
+DOSSIER_VIGNETTES = "vignettes"
+# Diviseurs de la largeur de la fiche : chaque taille s'obtient par Image.reduce
+LARGEURS_VIGNETTES = (300, 600)
+# Du format le plus compact au plus répandu : l'ordre des <source> du <picture>
+ENCODAGES_VIGNETTES = {"avif": {"quality": 45, "speed": 9}, "webp": {"quality": 70, "method": 2}}
+
+COULEURS_FICHE = {
+    "fond_haut": (10, 26, 49),
+    "fond_bas": (17, 34, 64),
+    "entete": (17, 34, 64),
+    "accent": (100, 255, 218),
+    "label": (136, 146, 176),
+    "texte": (255, 255, 255),
+    "encre": (0, 0, 0),
+}
+
+
+def slug_client(client):
+    """'HAÏDARA MOHAMED LAMINE' -> 'HAÏDARAMOHAMEDL'"""
+    return "".join(c for c in client.get("nom", "") if c.isalnum())[:15]
+
+
+def fichiers_client(client, format_fiche=None):
+    """Noms des artefacts d'un client dans son dossier"""
+    base = f"{slug_client(client)}_{client['equipe']}"
+    return {
+        "fiche": f"Fiche_{base}.{format_fiche or FORMAT_FICHES}",
+        "qr": f"{base}_QR.png",
+        "page": os.path.join("site", f"client_{base}.html"),
+    }
+
+
+@lru_cache(maxsize=None)
+def formats_vignettes():
+    """Formats de ENCODAGES_VIGNETTES que Pillow sait écrire ici"""
+    from PIL import Image
+
+    Image.init()
+    return tuple(f for f in ENCODAGES_VIGNETTES if f.upper() in Image.SAVE)
+
+
+def fichiers_vignettes(client):
+    """{(format, largeur): chemin de la vignette dans le dossier} ; vide pour les fiches SVG"""
+    if FORMAT_FICHES != "png":
+        return {}
+    base = f"{slug_client(client)}_{client['equipe']}"
+    return {
+        (format_image, largeur): os.path.join(DOSSIER_VIGNETTES, f"{base}_{largeur}.{format_image}")
+        for format_image in formats_vignettes() for largeur in LARGEURS_VIGNETTES
+    }
+
+
+def balise_vignette(client, prefixe, sizes):
+    """<picture> paresseux de la fiche : AVIF/WebP en srcset, la plus petite WebP en repli
+
+    Une fiche SVG est affichée directement, en <img> différé.
+    """
+    largeur = min(LARGEURS_VIGNETTES)
+    hauteur = -(-largeur * TAILLE_FICHE[1] // TAILLE_FICHE[0])
+    alt = html_escape(client.get("nom") or "")
+    if FORMAT_FICHES != "png":
+        return Brut(f'<img src="{prefixe}{fichiers_client(client)["fiche"]}" width="{largeur}" height="{hauteur}" '
+                    f'loading="lazy" decoding="async" alt="Fiche {alt}">')
+    chemins = fichiers_vignettes(client)
+    if not chemins:
+        return Brut("")
+    formats = formats_vignettes()
+    sources = [
+        f'<source type="image/{format_image}" sizes="{sizes}" srcset="'
+        + ", ".join(f"{prefixe}{chemins[format_image, largeur]} {largeur}w" for largeur in LARGEURS_VIGNETTES)
+        + '">'
+        for format_image in formats
+    ]
+    image = (f'<img src="{prefixe}{chemins[formats[-1], largeur]}" width="{largeur}" height="{hauteur}" '
+             f'loading="lazy" decoding="async" alt="Fiche {alt}">')
+    return Brut(f"<picture>{''.join(sources)}{image}</picture>")
+
+
+def hash_client(client):
+    """Empreinte du contenu d'un enregistrement client"""
+    contenu = json.dumps(client, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+
+def empreinte_rendu(client):
+    """Empreinte de manifeste : contenu du client et format de fiche qui en est tiré"""
+    return hashlib.sha256(f"{FORMAT_FICHES}:{hash_client(client)}".encode("utf-8")).hexdigest()
+
+
+def artefacts_client(client):
+    """Chemins (relatifs au dossier) de tout ce que le rendu produit pour un client"""
+    return sorted([*fichiers_client(client).values(), *fichiers_vignettes(client).values()])
+
+
+def _localisation(client, separateur=" – "):
+    return separateur.join(v for v in (client.get("ville"), client.get("quartier")) if v)
+
+
+def _contacts(client):
+    return " / ".join(v for v in (client.get("contact"), client.get("contact2")) if v)
+
+
+def _transmission(client):
+    transmission = client.get("date_transmission")
+    if transmission:
+        return str(transmission)
+    return datetime.strptime(client["date"], "%d-%m-%Y").date().isoformat()
+
+
+def url_page_client(client):
+    """Adresse encodée dans le QR code d'un client"""
+    return f"{URL_SITE}dossier_{client['date']}/{fichiers_client(client)['page']}"
+
+
+class CacheQR:
+    """Cache disque de QR codes adressé par contenu (payload + paramètres), évincé en LRU"""
+
+    def __init__(self, dossier=DOSSIER_CACHE_QR, capacite=CAPACITE_CACHE_QR, **parametres):
+        self.dossier = dossier
+        self.capacite = capacite
+        self.parametres = {**PARAMETRES_QR, **parametres}
+        os.makedirs(dossier, exist_ok=True)
+        # Ordre LRU initial repris des dates de dernier accès (partagées entre processus)
+        fichiers = [e for e in os.scandir(dossier) if e.name.endswith(".png")]
+        fichiers.sort(key=lambda e: e.stat().st_mtime)
+        self.entrees = OrderedDict((e.name[:-4], e.path) for e in fichiers)
+
+    def cle(self, payload):
+        contenu = json.dumps([payload, self.parametres], sort_keys=True)
+        return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+    def obtenir(self, payload):
+        """Chemin du PNG en cache, encodé au premier appel"""
+        cle = self.cle(payload)
+        chemin = self.entrees.get(cle)
+        if chemin and os.path.exists(chemin):
+            self.entrees.move_to_end(cle)
+            os.utime(chemin)
+            return chemin
+        chemin = os.path.join(self.dossier, f"{cle}.png")
+        self._encoder(payload, chemin)
+        self.entrees[cle] = chemin
+        self.entrees.move_to_end(cle)
+        while len(self.entrees) > self.capacite:
+            _, ancien = self.entrees.popitem(last=False)
+            with suppress(FileNotFoundError):
+                os.remove(ancien)
+        return chemin
+
+    def _encoder(self, payload, chemin):
+        import qrcode
+
+        correction = getattr(qrcode.constants, f"ERROR_CORRECT_{self.parametres['correction']}")
+        qr = qrcode.QRCode(error_correction=correction, box_size=self.parametres["taille_module"],
+                           border=self.parametres["marge"])
+        qr.add_data(payload)
+        qr.make(fit=True)
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        qr.make_image().save(temporaire)
+        os.replace(temporaire, chemin)
+
+    def lier(self, payload, destination):
+        """Place le QR dans un dossier par lien physique (copie si impossible)"""
+        for _ in range(2):
+            source = self.obtenir(payload)
+            with suppress(FileNotFoundError):
+                os.remove(destination)
+            try:
+                os.link(source, destination)
+                return destination
+            except FileNotFoundError:
+                # Évincé entre-temps par un autre processus : on réencode
+                self.entrees.pop(self.cle(payload), None)
+            except OSError:
+                shutil.copyfile(source, destination)
+                return destination
+        shutil.copyfile(self.obtenir(payload), destination)
+        return destination
+
+
+@lru_cache(maxsize=None)
+def cache_qr():
+    """Cache QR propre au processus courant"""
+    return CacheQR()
+
+
+def generer_qr(client, dossier):
+    chemin = os.path.join(dossier, fichiers_client(client)["qr"])
+    return cache_qr().lier(url_page_client(client), chemin)
+
+
+@lru_cache(maxsize=None)
+def _police(taille, gras=False):
+    from PIL import ImageFont
+
+    nom = "DejaVuSans-Bold.ttf" if gras else "DejaVuSans.ttf"
+    try:
+        return ImageFont.truetype(nom, taille)
+    except OSError:
+        return ImageFont.load_default(taille)
+
+
+@lru_cache(maxsize=1024)
+def _matrice_qr(payload):
+    """Modules du QR code d'une adresse (mêmes paramètres que le cache PNG)"""
+    import qrcode
+
+    correction = getattr(qrcode.constants, f"ERROR_CORRECT_{PARAMETRES_QR['correction']}")
+    qr = qrcode.QRCode(error_correction=correction, border=PARAMETRES_QR["marge"])
+    qr.add_data(payload)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def _segments_qr(matrice):
+    """Modules noirs regroupés en segments horizontaux (colonne, ligne, longueur)"""
+    for ligne, modules in enumerate(matrice):
+        debut = None
+        for colonne, noir in enumerate(list(modules) + [False]):
+            if noir and debut is None:
+                debut = colonne
+            elif not noir and debut is not None:
+                yield debut, ligne, colonne - debut
+                debut = None
+
+
+def primitives_fiche(client):
+    """Fiche d'installation décrite en primitives (repère 1200x1250, y vers le bas)
+
+    Une seule description pour le SVG, le PDF vectoriel et l'aperçu PNG.
+    """
+    c = COULEURS_FICHE
+    primitives = [
+        ("degrade", 0, 0, TAILLE_FICHE[0], TAILLE_FICHE[1], c["fond_haut"], c["fond_bas"]),
+        ("rect", 0, 0, TAILLE_FICHE[0], 156, c["entete"]),
+        ("rect", 0, 156, TAILLE_FICHE[0], 5, c["accent"]),
+        ("texte", 50, 103, "FICHE D'INSTALLATION FTTH", 52, True, c["accent"]),
+    ]
+    for i, (label, valeur) in enumerate(_lignes_fiche(client)):
+        y = 205 + i * 130
+        primitives += [
+            ("texte", 50, y + 19, label, 20, True, c["label"]),
+            ("texte", 50, y + 65, valeur.upper(), 32, False, c["texte"]),
+            ("ligne", 50, y + 90, 720, y + 90, c["label"]),
+        ]
+    primitives += [
+        ("rect", 750, 190, 400, 130, c["accent"]),
+        ("texte", 770, 227, "IDENTIFIANT TN", 20, True, c["encre"]),
+        ("texte", 770, 285, client.get("tn", ""), 40, True, c["encre"]),
+        ("texte", 770, 317, f"RDV : {client['date']} • N°{client.get('ordre') or '-'}", 20, True, c["encre"]),
+        ("rect", 750, 350, 400, 400, (255, 255, 255)),
+        ("qr", 750, 350, 400, _matrice_qr(url_page_client(client))),
+        ("rect", 0, 1180, TAILLE_FICHE[0], 70, c["accent"]),
+        ("texte", 50, 1217, "MG TELECOM - GÉNÉRÉ DEPUIS TERMUX", 20, True, c["encre"]),
+    ]
+    return primitives
+
+
+def _rgb(couleur):
+    return "#{:02x}{:02x}{:02x}".format(*couleur)
+
+
+def fiche_svg(primitives):
+    """Document SVG autonome d'une fiche"""
+    largeur, hauteur = TAILLE_FICHE
+    elements = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{largeur}" height="{hauteur}" '
+        f'viewBox="0 0 {largeur} {hauteur}" font-family="DejaVu Sans, Helvetica, Arial, sans-serif">'
+    ]
+    for genre, *p in primitives:
+        if genre == "degrade":
+            x, y, l, h, haut, bas = p
+            elements.append(
+                f'<defs><linearGradient id="fond" x1="0" y1="0" x2="0" y2="1">'
+                f'<stop offset="0" stop-color="{_rgb(haut)}"/><stop offset="1" stop-color="{_rgb(bas)}"/>'
+                f'</linearGradient></defs>'
+                # Aplat de secours pour les lecteurs qui ignorent les dégradés
+                f'<rect x="{x}" y="{y}" width="{l}" height="{h}" fill="{_rgb(bas)}"/>'
+                f'<rect x="{x}" y="{y}" width="{l}" height="{h}" fill="url(#fond)"/>')
+        elif genre == "rect":
+            x, y, l, h, couleur = p
+            elements.append(f'<rect x="{x}" y="{y}" width="{l}" height="{h}" fill="{_rgb(couleur)}"/>')
+        elif genre == "ligne":
+            x1, y1, x2, y2, couleur = p
+            elements.append(f'<path d="M{x1} {y1 + 0.5}H{x2}" stroke="{_rgb(couleur)}"/>')
+        elif genre == "texte":
+            x, y, texte, taille, gras, couleur = p
+            poids = ' font-weight="bold"' if gras else ""
+            elements.append(f'<text x="{x}" y="{y}" font-size="{taille}"{poids} fill="{_rgb(couleur)}">'
+                            f'{escape(texte)}</text>')
+        elif genre == "qr":
+            x, y, cote, matrice = p
+            # Tracé en unités de module, mis à l'échelle par la transformation
+            chemin = "".join(f"M{col} {lig}h{n}v1h-{n}z" for col, lig, n in _segments_qr(matrice))
+            elements.append(f'<path transform="translate({x} {y}) scale({cote / len(matrice):g})" '
+                            f'd="{chemin}" fill="#000"/>')
+    elements.append("</svg>")
+    return "\n".join(elements)
+
+
+def _couleur_pdf(rgb, operateur="rg"):
+    return " ".join(f"{v / 255:.3f}" for v in rgb) + f" {operateur}"
+
+
+def _operations_pdf(pdf, primitive):
+    """Opérateurs PDF d'une primitive de fiche (repère déjà retourné par la page)"""
+    genre, *p = primitive
+    if genre == "degrade":
+        x, y, l, h, haut, bas = p
+        # Écart de couleur faible : une bande par niveau suffit à égaler le raster
+        bandes = max(1, max(abs(b - a) for a, b in zip(haut, bas)))
+        for i in range(bandes):
+            t = (i + 0.5) / bandes
+            teinte = tuple(round(a + (b - a) * t) for a, b in zip(haut, bas))
+            yield f"{_couleur_pdf(teinte)} {x} {y + h * i / bandes:.2f} {l} {h / bandes + 0.5:.2f} re f"
+    elif genre == "rect":
+        x, y, l, h, rgb = p
+        yield f"{_couleur_pdf(rgb)} {x} {y} {l} {h} re f"
+    elif genre == "ligne":
+        x1, y1, x2, y2, rgb = p
+        yield f"{_couleur_pdf(rgb, 'RG')} 1 w {x1} {y1 + 0.5} m {x2} {y2 + 0.5} l S"
+    elif genre == "texte":
+        x, y, texte, taille, gras, rgb = p
+        octets = texte.encode("cp1252", "replace").decode("latin-1")
+        octets = octets.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        yield f"BT /{pdf.police(gras)} {taille} Tf 1 0 0 -1 {x} {y} Tm {_couleur_pdf(rgb)} ({octets}) Tj ET"
+    elif genre == "qr":
+        x, y, cote, matrice = p
+        module = cote / len(matrice)
+        yield "0 0 0 rg"
+        for col, lig, n in _segments_qr(matrice):
+            yield f"{x + col * module:.2f} {y + lig * module:.2f} {n * module:.2f} {module:.2f} re"
+        yield "f"
+
+
+def _dessiner_png(primitives):
+    from PIL import Image, ImageDraw
+
+    largeur, hauteur = TAILLE_FICHE
+    image = Image.new("RGB", (largeur, hauteur))
+    dessin = ImageDraw.Draw(image)
+    for genre, *p in primitives:
+        if genre == "degrade":
+            x, y, l, h, haut, bas = p
+            for ligne in range(h):
+                t = ligne / h
+                teinte = tuple(round(a + (b - a) * t) for a, b in zip(haut, bas))
+                dessin.line([(x, y + ligne), (x + l, y + ligne)], fill=teinte)
+        elif genre == "rect":
+            x, y, l, h, couleur = p
+            dessin.rectangle([x, y, x + l - 1, y + h - 1], fill=couleur)
+        elif genre == "ligne":
+            x1, y1, x2, y2, couleur = p
+            dessin.line([(x1, y1), (x2, y2)], fill=couleur)
+        elif genre == "texte":
+            x, y, texte, taille, gras, couleur = p
+            dessin.text((x, y), texte, font=_police(taille, gras), fill=couleur, anchor="ls")
+        elif genre == "qr":
+            x, y, cote, matrice = p
+            module = cote / len(matrice)
+            for col, lig, n in _segments_qr(matrice):
+                dessin.rectangle([round(x + col * module), round(y + lig * module),
+                                  round(x + (col + n) * module) - 1, round(y + (lig + 1) * module) - 1], fill=0)
+    return image
+
+
+def generer_fiche_svg(client, dossier):
+    """Fiche d'installation vectorielle (Fiche_<NOM>_<EQUIPE>.svg)"""
+    chemin = os.path.join(dossier, fichiers_client(client, "svg")["fiche"])
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write(fiche_svg(primitives_fiche(client)))
+    return chemin
+
+
+def generer_fiche_png(client, dossier):
+    """Fiche raster 1200x1250 : format historique, ou aperçu à la demande en mode vectoriel
+
+    Les vignettes sont réduites de l'image déjà dessinée (fiches PNG seulement).
+    """
+    chemin = os.path.join(dossier, fichiers_client(client, "png")["fiche"])
+    image = _dessiner_png(primitives_fiche(client))
+    image.save(chemin)
+    ecrire_vignettes(image, client, dossier)
+    return chemin
+
+
+def ecrire_vignettes(image, client, dossier):
+    """vignettes/<NOM>_<EQUIPE>_<largeur>.<avif|webp>, réduites de la plus grande à la plus petite"""
+    from PIL import Image
+
+    chemins = fichiers_vignettes(client)
+    if not chemins:
+        return None
+    os.makedirs(os.path.join(dossier, DOSSIER_VIGNETTES), exist_ok=True)
+    for largeur in sorted(LARGEURS_VIGNETTES, reverse=True):
+        facteur, reste = divmod(image.width, largeur)
+        if reste:
+            image = image.resize((largeur, round(largeur * TAILLE_FICHE[1] / TAILLE_FICHE[0])), Image.LANCZOS)
+        else:
+            image = image.reduce(facteur)
+        for format_image in formats_vignettes():
+            image.save(os.path.join(dossier, chemins[format_image, largeur]), format_image.upper(),
+                       **ENCODAGES_VIGNETTES[format_image])
+    return os.path.join(dossier, DOSSIER_VIGNETTES)
+
+
+def generer_fiche(client, dossier):
+    if FORMAT_FICHES == "png":
+        return generer_fiche_png(client, dossier)
+    return generer_fiche_svg(client, dossier)
+
+
+def _lignes_fiche(client):
+    return [
+        ("NOM DU CLIENT", client.get("nom") or ""),
+        ("CONTACTS TÉLÉPHONIQUES", _contacts(client)),
+        ("LOCALISATION", _localisation(client, " - ")),
+        ("PROVENANCE", client.get("provenance") or ""),
+        ("NUMÉRO DE TICKET", client.get("ticket") or ""),
+        ("OFFRE SOUSCRITE", client.get("forfait") or ""),
+        ("ÉQUIPE TECHNIQUE", client["equipe"]),
+        ("DATE DE TRANSMISSION", _transmission(client)),
+    ]
+
+
+def generer_page_client(client, dossier):
+    """Page HTML de la fiche client (site/client_<NOM>_<EQUIPE>.html)"""
+    fichiers = fichiers_client(client)
+    valeurs = {
+        "nom": client.get("nom", ""),
+        "equipe": client["equipe"],
+        "date": client["date"],
+        "contacts": _contacts(client),
+        "localisation": _localisation(client),
+        "provenance": client.get("provenance", ""),
+        "ticket": client.get("ticket", ""),
+        "forfait": client.get("forfait", ""),
+        "tn": client.get("tn", ""),
+        "transmission": _transmission(client),
+        "ordre": client.get("ordre") or "-",
+        "qr": fichiers["qr"],
+        "fiche": fichiers["fiche"],
+        "vignette": balise_vignette(client, "../", "(max-width: 640px) 90vw, 480px"),
+        "genere_le": datetime.now().strftime("%d/%m/%Y à %H:%M"),
+        "assets_css": Brut(balise_css("../../")),
+    }
+    html = gabarit("page_client").rendre(**valeurs)
+
+    chemin = os.path.join(dossier, fichiers["page"])
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write(html)
+    return chemin
+
+
+def generer_pdf_fiches(date, clients, dossier, dpi=DPI_IMPRESSION, couleurs=COULEURS_PDF):
+    """Fiches_Installation_<date>.pdf : une page A4 par fiche, écrite au fil de l'eau"""
+    chemin = os.path.join(dossier, f"Fiches_Installation_{date}.pdf")
+    with PdfEnFlux(chemin) as pdf:
+        for client in clients:
+            if FORMAT_FICHES != "png":
+                pdf.page_primitives(primitives_fiche(client), *TAILLE_FICHE)
+                continue
+            fiche = os.path.join(dossier, fichiers_client(client)["fiche"])
+            pdf.page_image(preparer_image_pdf(fiche, A4[0], dpi, couleurs))
+    return chemin
+
+
+RENDUS_CLIENT = {
+    "QR": generer_qr,
+    "Fiche": generer_fiche,
+    "Page client": generer_page_client,
+}
+
+
+DOSSIER_RAPPORTS = "rapports"
+
+
+def rss_ko():
+    """Mémoire résidente actuelle du processus (Ko)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ChronoEtapes:
+    """Temps et mémoire cumulés par étape du pipeline"""
+
+    def __init__(self):
+        self.debut = datetime.now()
+        self.durees = {}
+        self.appels = {}
+        self.rss_max = {}
+        self.delta_rss = {}
+        self.contexte = {}
+
+    def ajouter(self, etape, duree, rss=None, delta_rss=0):
+        self.durees[etape] = self.durees.get(etape, 0.0) + duree
+        self.appels[etape] = self.appels.get(etape, 0) + 1
+        if rss is not None:
+            self.rss_max[etape] = max(self.rss_max.get(etape, 0), rss)
+        self.delta_rss[etape] = self.delta_rss.get(etape, 0) + delta_rss
+
+    @contextmanager
+    def mesurer(self, etape):
+        debut, rss_debut = time.perf_counter(), rss_ko()
+        try:
+            yield
+        finally:
+            rss = rss_ko()
+            self.ajouter(etape, time.perf_counter() - debut, rss, rss - rss_debut)
+
+    def afficher(self, titre="Temps par étape"):
+        table = Table(title=titre)
+        table.add_column("Étape")
+        table.add_column("Appels", justify="right")
+        table.add_column("Durée (s)", justify="right")
+        table.add_column("RSS max (Mo)", justify="right")
+        table.add_column("Δ RSS (Mo)", justify="right")
+        for etape, duree in self.durees.items():
+            rss = self.rss_max.get(etape)
+            table.add_row(etape, str(self.appels[etape]), f"{duree:.2f}",
+                          "-" if rss is None else f"{rss / 1024:.0f}", f"{self.delta_rss[etape] / 1024:+.1f}")
+        console.print(table)
+
+    def rapport(self):
+        return {
+            "debut": self.debut.isoformat(timespec="seconds"),
+            "duree_totale_s": round((datetime.now() - self.debut).total_seconds(), 3),
+            "pic_rss_ko": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "contexte": self.contexte,
+            "etapes": [
+                {
+                    "etape": etape,
+                    "appels": self.appels[etape],
+                    "duree_s": round(duree, 4),
+                    "rss_max_ko": self.rss_max.get(etape),
+                    "delta_rss_ko": self.delta_rss[etape],
+                }
+                for etape, duree in self.durees.items()
+            ],
+        }
+
+    def ecrire_rapport(self, dossier=DOSSIER_RAPPORTS):
+        """rapports/run_<horodatage>.json et une ligne par étape dans rapports/historique.csv"""
+        os.makedirs(dossier, exist_ok=True)
+        rapport = self.rapport()
+        horodatage = self.debut.strftime("%Y%m%d-%H%M%S")
+        chemin = os.path.join(dossier, f"run_{horodatage}.json")
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, ensure_ascii=False, indent=2)
+
+        historique = os.path.join(dossier, "historique.csv")
+        nouveau = not os.path.exists(historique)
+        with open(historique, "a", encoding="utf-8", newline="") as f:
+            ecrivain = csv.writer(f, delimiter=";")
+            if nouveau:
+                ecrivain.writerow(["debut", "etape", "appels", "duree_s", "rss_max_ko", "delta_rss_ko", "clients"])
+            for etape in rapport["etapes"]:
+                ecrivain.writerow([rapport["debut"], etape["etape"], etape["appels"], etape["duree_s"],
+                                   etape["rss_max_ko"] or "", etape["delta_rss_ko"],
+                                   self.contexte.get("clients", "")])
+        return chemin
+
+
+@contextmanager
+def profiler(mode, dossier=DOSSIER_RAPPORTS):
+    """Profil de l'exécution : rapports/profil_<horodatage>.prof (cprofile) ou .html (pyinstrument)"""
+    if not mode:
+        yield
+        return
+    os.makedirs(dossier, exist_ok=True)
+    base = os.path.join(dossier, f"profil_{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    if mode == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profil = Profiler()
+        profil.start()
+        try:
+            yield
+        finally:
+            profil.stop()
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(profil.output_html())
+            console.print(f"[green]✅ Profil écrit : {base}.html[/green]")
+        return
+    import cProfile
+
+    profil = cProfile.Profile()
+    profil.enable()
+    try:
+        yield
+    finally:
+        profil.disable()
+        profil.dump_stats(base + ".prof")
+        console.print(f"[green]✅ Profil écrit : {base}.prof[/green]")
+
+
+# Client fictif servant seulement à énumérer les tailles de police de la fiche
+CLIENT_PRECHAUFFAGE = {"nom": "-", "equipe": "-", "date": "01-01-1970", "tn": "-"}
+
+
+def _prechauffer_rendu():
+    """Charge une fois par processus ce que partagent tous les rendus : polices, gabarits, QR, assets"""
+    for taille, gras in {p[4:6] for p in primitives_fiche(CLIENT_PRECHAUFFAGE) if p[0] == "texte"}:
+        _police(taille, gras)
+    gabarit("page_client")
+    cache_qr()
+    bundle_assets()
+
+
+@contextmanager
+def pool_rendu(processus=None):
+    """Pool de rendu partagé par tous les dossiers d'une exécution (None : rendu séquentiel)
+
+    Les processus sont préchauffés une seule fois : une reprise d'un mois entier
+    ne relance ni les imports ni le chargement des polices à chaque jour.
+    """
+    processus = processus or PROCESSUS_RENDU or os.cpu_count() or 1
+    if processus == 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=processus, initializer=_prechauffer_rendu) as pool:
+        yield pool
+
+
+def executer_en_parallele(taches, processus=None, fenetre=None, pool=None):
+    """Exécute des tâches (fonction, args) dans un pool et rend les résultats dans l'ordre
+
+    Au plus `fenetre` tâches sont en vol : la mémoire reste bornée même
+    pour des centaines de clients. Sans `pool`, un pool est créé pour l'appel.
+    """
+    if pool is None:
+        with pool_rendu(processus) as pool:
+            if pool is None:
+                for fonction, args in taches:
+                    yield fonction(*args)
+            else:
+                yield from executer_en_parallele(taches, processus, fenetre, pool)
+        return
+    fenetre = fenetre or 2 * (processus or PROCESSUS_RENDU or os.cpu_count() or 1)
+    en_cours = deque()
+    for fonction, args in taches:
+        en_cours.append(pool.submit(fonction, *args))
+        if len(en_cours) >= fenetre:
+            yield en_cours.popleft().result()
+    while en_cours:
+        yield en_cours.popleft().result()
+
+
+def _tache_rendu(etape, client, dossier):
+    """Tâche élémentaire exécutée dans un processus du pool"""
+    debut, rss_debut = time.perf_counter(), rss_ko()
+    chemin = RENDUS_CLIENT[etape](client, dossier)
+    rss = rss_ko()
+    return etape, chemin, time.perf_counter() - debut, rss, rss - rss_debut
+
+
+def charger_manifeste(dossier):
+    chemin = os.path.join(dossier, FICHIER_MANIFESTE)
+    if not os.path.exists(chemin):
+        return {}
+    with open(chemin, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sauvegarder_manifeste(dossier, manifeste):
+    chemin = os.path.join(dossier, FICHIER_MANIFESTE)
+    with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifeste, f, ensure_ascii=False, indent=2)
+    os.replace(chemin + ".tmp", chemin)
+
+
+def construire_dossier(date, clients, forcer=False, processus=None, chrono=None, pool=None):
+    """Reconstruit dossier_<date> en ne régénérant que ce qui a changé"""
+    chrono = chrono or ChronoEtapes()
+    dossier = f"dossier_{date}"
+    os.makedirs(dossier, exist_ok=True)
+    precedent = charger_manifeste(dossier)
+    ancien = {} if forcer or precedent.get("version") != VERSION_GABARITS else precedent
+
+    # Manifeste indexé par abonné : un changement de format de fiche change
+    # l'empreinte et les fichiers, pas l'identité du client
+    entrees = {
+        cle_enregistrement(client): {"empreinte": empreinte_rendu(client), "fichiers": artefacts_client(client)}
+        for client in clients
+    }
+    pdf = hashlib.sha256(
+        (FORMAT_FICHES + "".join(entrees[cle_enregistrement(client)]["empreinte"] for client in clients)).encode()
+    ).hexdigest()
+    assets = bundle_assets()["css"]
+    if ancien.get("pdf") == pdf and ancien.get("clients") == entrees and ancien.get("assets") == assets:
+        console.print(f"[dim]⏭️  Dossier {date} inchangé[/dim]")
+        return []
+
+    anciens_clients = ancien.get("clients", {})
+    a_generer = [
+        client for client in clients
+        if anciens_clients.get(cle_enregistrement(client)) != entrees[cle_enregistrement(client)]
+        or not all(os.path.exists(os.path.join(dossier, f)) for f in entrees[cle_enregistrement(client)]["fichiers"])
+    ]
+    taches = [(_tache_rendu, (etape, client, dossier)) for client in a_generer for etape in RENDUS_CLIENT]
+    if ancien.get("assets") != assets:
+        # Nouvelle feuille de style : seules les pages HTML pointent dessus
+        regeneres = {id(client) for client in a_generer}
+        taches += [(_tache_rendu, ("Page client", client, dossier))
+                   for client in clients if id(client) not in regeneres]
+    with chrono.mesurer("Rendu clients (mur)"):
+        for etape, _, duree, rss, delta_rss in executer_en_parallele(taches, processus, pool=pool):
+            chrono.ajouter(etape, duree, rss, delta_rss)
+    produits = {chemin for entree in entrees.values() for chemin in entree["fichiers"]}
+    _supprimer_orphelins(dossier, _fichiers_manifeste(precedent) - produits)
+    if ancien.get("pdf") != pdf:
+        with chrono.mesurer("PDF"):
+            generer_pdf_fiches(date, clients, dossier)
+
+    sauvegarder_manifeste(dossier, {
+        "version": VERSION_GABARITS, "assets": assets, "clients": entrees, "pdf": pdf})
+    console.print(f"[green]✅ Dossier {date} : {len(a_generer)}/{len(clients)} client(s) régénéré(s)[/green]")
+    return a_generer
+
+
+def _fichiers_manifeste(manifeste):
+    """Fichiers enregistrés par un manifeste, y compris l'ancien format indexé par fiche"""
+    fichiers = set()
+    for cle, entree in manifeste.get("clients", {}).items():
+        if isinstance(entree, dict):
+            fichiers.update(entree.get("fichiers", []))
+        else:
+            base = os.path.splitext(cle)[0][len("Fiche_"):]
+            fichiers.update((cle, f"{base}_QR.png", os.path.join("site", f"client_{base}.html")))
+            fichiers.update(os.path.join(DOSSIER_VIGNETTES, f"{base}_{largeur}.{format_image}")
+                            for format_image in ENCODAGES_VIGNETTES for largeur in LARGEURS_VIGNETTES)
+    return fichiers
+
+
+def _supprimer_orphelins(dossier, fichiers):
+    """Retire les fichiers d'une exécution précédente que celle-ci n'a pas produits"""
+    for nom in fichiers:
+        chemin = os.path.join(dossier, nom)
+        if os.path.exists(chemin):
+            os.remove(chemin)
+
+
+def clients_des_dates(db, dates):
+    """Clients affectés enregistrés pour ces dates, dans l'ordre chronologique"""
+    return [client for date in _trier_dates(dates)[::-1] for client in db.clients(date=date) if client.get("equipe")]
+
+
+def construire_dossiers(clients, forcer=False, processus=None, db=None, chrono=None):
+    """Regroupe les clients par date, reconstruit chaque dossier puis les dashboards
+
+    Avec une BaseClients, l'import complète les clients déjà enregistrés pour
+    les mêmes dates : un renvoi partiel d'un jour garde les autres clients du
+    dossier et la tournée est replanifiée sur tout le jour avant un seul upsert.
+    Les dashboards couvrent tout l'historique.
+    """
+    chrono = chrono or ChronoEtapes()
+    if db is not None:
+        dates = {client["date"] for client in clients}
+        jour_complet = {(cle_enregistrement(client), client["date"]): client
+                        for client in clients_des_dates(db, dates)}
+        jour_complet.update(((cle_enregistrement(client), client["date"]), client) for client in clients)
+        # Ordre d'entrée stable : un réimport à l'identique retrouve la même tournée
+        clients = [jour_complet[cle] for cle in sorted(jour_complet, key=lambda cle: (cle[1], cle[0]))]
+    chrono.contexte["clients"] = len(clients)
+    with chrono.mesurer("Tournées"):
+        planifier_tournees(clients)
+    if db is not None:
+        with chrono.mesurer("Base clients"):
+            db.upsert(clients)
+            # Relu de la base : les empreintes du manifeste ne dépendent pas de la provenance des lignes
+            clients = clients_des_dates(db, dates)
+    par_date = {}
+    for client in sorted(clients, key=cle_tournee):
+        par_date.setdefault(client["date"], []).append(client)
+    # Un seul pool préchauffé pour tous les jours : une reprise d'un mois reste un seul lot
+    with pool_rendu(processus) as pool:
+        regeneres = {
+            date: construire_dossier(date, liste, forcer, processus, chrono, pool)
+            for date, liste in par_date.items()
+        }
+    update_dashboards(db if db is not None else {"clients": clients}, chrono)
+    chrono.afficher()
+    return regeneres
+
+
+# ---------------------------------------------------------------------------
+# Carte des installations : agrégats GPS précalculés par niveau de zoom
+# ---------------------------------------------------------------------------
+
+DOSSIER_CARTE = "carte"
+ZOOMS_CARTE = range(5, 17)
+# Tuiles de 256 px découpées en 4x4 cellules de 64 px : une grappe par cellule
+CELLULES_TUILE = 4
+PORTEE_CARTE_ADMIN = "toutes"
+
+
+def _coordonnees_valides(longitude, latitude):
+    if longitude is None or latitude is None or (longitude == 0 and latitude == 0):
+        return False
+    return -180 <= longitude <= 180 and -85 <= latitude <= 85
+
+
+def points_gps(db, equipe=None):
+    """(longitude, latitude, équipe) des installations géolocalisées"""
+    if isinstance(db, BaseClients):
+        return db.points_gps(equipe)
+    clients = clients_db(db, equipe=equipe) if equipe else clients_db(db)
+    return [
+        (c["longitude"], c["latitude"], c.get("equipe") or "") for c in clients
+        if _coordonnees_valides(c.get("longitude"), c.get("latitude"))
+    ]
+
+
+def _mercator(longitude, latitude):
+    """Coordonnées Web Mercator normalisées dans [0, 1)"""
+    sinus = math.sin(math.radians(latitude))
+    return (longitude + 180) / 360, 0.5 - math.log((1 + sinus) / (1 - sinus)) / (4 * math.pi)
+
+
+def grappes_carte(points):
+    """{zoom: {(x, y) de tuile: [[lon, lat, nombre, équipe majoritaire], ...]}}
+
+    Les cellules du zoom maximal sont remplies une fois à partir des points,
+    chaque niveau inférieur fusionne ensuite quatre cellules en une.
+    """
+    cotes = (1 << ZOOMS_CARTE[-1]) * CELLULES_TUILE
+    cellules = {}
+    for longitude, latitude, equipe in points:
+        x, y = _mercator(longitude, latitude)
+        cellule = cellules.setdefault((int(x * cotes), int(y * cotes)), [0.0, 0.0, 0, {}])
+        cellule[0] += longitude
+        cellule[1] += latitude
+        cellule[2] += 1
+        cellule[3][equipe] = cellule[3].get(equipe, 0) + 1
+
+    niveaux = {}
+    for zoom in reversed(ZOOMS_CARTE):
+        if zoom != ZOOMS_CARTE[-1]:
+            parents = {}
+            for (cx, cy), (somme_lon, somme_lat, nombre, equipes) in cellules.items():
+                parent = parents.setdefault((cx // 2, cy // 2), [0.0, 0.0, 0, {}])
+                parent[0] += somme_lon
+                parent[1] += somme_lat
+                parent[2] += nombre
+                for equipe, n in equipes.items():
+                    parent[3][equipe] = parent[3].get(equipe, 0) + n
+            cellules = parents
+        tuiles = {}
+        for (cx, cy), (somme_lon, somme_lat, nombre, equipes) in sorted(cellules.items()):
+            tuiles.setdefault((cx // CELLULES_TUILE, cy // CELLULES_TUILE), []).append([
+                round(somme_lon / nombre, 5), round(somme_lat / nombre, 5), nombre, max(equipes, key=equipes.get)])
+        niveaux[zoom] = tuiles
+    return niveaux
+
+
+def _ecrire_si_change(chemin, contenu):
+    """Écrit un fichier de données seulement si son contenu a changé"""
+    if os.path.exists(chemin):
+        with open(chemin, encoding="utf-8") as f:
+            if f.read() == contenu:
+                return chemin
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+        f.write(contenu)
+    os.replace(chemin + ".tmp", chemin)
+    return chemin
+
+
+def ecrire_carte(portee, points, couleurs):
+    """carte/<portée>/index.js et tuiles <z>/<x>_<y>.js ; renvoie l'URL versionnée de l'index"""
+    racine = os.path.join(DOSSIER_CARTE, portee)
+    version = hashlib.sha256()
+    ecrits = set()
+    tuiles_par_zoom = {}
+    for zoom, tuiles in grappes_carte(points).items():
+        for (x, y), grappes in tuiles.items():
+            cle = f"{portee}/{zoom}/{x}_{y}"
+            donnees = json.dumps(grappes, ensure_ascii=False, separators=(",", ":"))
+            contenu = f"window.TUILES_FTTH[{json.dumps(cle)}]={donnees};"
+            version.update(contenu.encode("utf-8"))
+            ecrits.add(_ecrire_si_change(os.path.join(racine, str(zoom), f"{x}_{y}.js"), contenu))
+        tuiles_par_zoom[zoom] = [f"{x}_{y}" for x, y in sorted(tuiles)]
+
+    longitudes, latitudes = [p[0] for p in points], [p[1] for p in points]
+    index = {
+        "portee": portee,
+        "base": f"{DOSSIER_CARTE}/{portee}",
+        "version": version.hexdigest()[:10],
+        "zooms": [ZOOMS_CARTE[0], ZOOMS_CARTE[-1]],
+        "emprise": [min(longitudes), min(latitudes), max(longitudes), max(latitudes)] if points else None,
+        "total": len(points),
+        "couleurs": couleurs,
+        "tuiles": tuiles_par_zoom,
+    }
+    donnees = json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+    contenu = f"window.CARTES_FTTH[{json.dumps(portee)}]={donnees};"
+    ecrits.add(_ecrire_si_change(os.path.join(racine, "index.js"), contenu))
+
+    for dossier, _, fichiers in os.walk(racine):
+        for nom in fichiers:
+            if os.path.join(dossier, nom) not in ecrits:
+                os.remove(os.path.join(dossier, nom))
+    empreinte = hashlib.sha256(contenu.encode("utf-8")).hexdigest()[:10]
+    return f"{DOSSIER_CARTE}/{portee}/index.js?v={empreinte}"
+
+
+# ---------------------------------------------------------------------------
+# Tournées : ordre de passage par équipe et par jour
+# ---------------------------------------------------------------------------
+
+RAYON_TERRE_KM = 6371.0
+CHAMPS_ZONE = ("ville", "quartier", "secteur")
+
+
+def distance_km(a, b):
+    """Distance orthodromique (haversine) entre deux points (longitude, latitude)"""
+    lon1, lat1, lon2, lat2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAYON_TERRE_KM * math.asin(math.sqrt(h))
+
+
+@lru_cache(maxsize=256)
+def matrice_distances(points):
+    """Distances deux à deux, en cache par tuple de points pour les replanifications"""
+    n = len(points)
+    matrice = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            matrice[i][j] = matrice[j][i] = distance_km(points[i], points[j])
+    return matrice
+
+
+def _plus_proche_voisin(matrice, depart):
+    restants = set(range(len(matrice))) - {depart}
+    chemin = [depart]
+    while restants:
+        distances = matrice[chemin[-1]]
+        suivant = min(restants, key=distances.__getitem__)
+        chemin.append(suivant)
+        restants.remove(suivant)
+    return chemin
+
+
+def _deux_opt(chemin, matrice):
+    """Inverse des segments du chemin (ouvert) tant que la longueur totale diminue"""
+    n = len(chemin)
+    ameliore = True
+    while ameliore:
+        ameliore = False
+        for i in range(n - 1):
+            precedent = chemin[i - 1] if i else None
+            for j in range(i + 1, n):
+                suivant = chemin[j + 1] if j + 1 < n else None
+                debut, fin = chemin[i], chemin[j]
+                avant = apres = 0.0
+                if precedent is not None:
+                    avant += matrice[precedent][debut]
+                    apres += matrice[precedent][fin]
+                if suivant is not None:
+                    avant += matrice[fin][suivant]
+                    apres += matrice[debut][suivant]
+                if apres < avant - 1e-9:
+                    chemin[i:j + 1] = chemin[i:j + 1][::-1]
+                    ameliore = True
+    return chemin
+
+
+def ordre_tournee(points):
+    """Indices des points dans un ordre de visite quasi optimal (plus proche voisin puis 2-opt)
+
+    Le chemin est ouvert et part du point le plus excentré de la tournée.
+    """
+    n = len(points)
+    if n < 3:
+        return list(range(n))
+    matrice = matrice_distances(tuple(points))
+    centre = (sum(p[0] for p in points) / n, sum(p[1] for p in points) / n)
+    depart = max(range(n), key=lambda i: distance_km(points[i], centre))
+    return _deux_opt(_plus_proche_voisin(matrice, depart), matrice)
+
+
+def _zones(client):
+    """Clés de zone du client, de la plus précise (secteur) à la plus large (ville)"""
+    valeurs = [replier_accents(client.get(champ)).strip() for champ in CHAMPS_ZONE]
+    return [tuple(valeurs[:n]) for n in (3, 2, 1) if all(valeurs[:n])]
+
+
+def centres_zones(clients):
+    """Position moyenne des clients géolocalisés par ville, quartier et secteur"""
+    sommes = {}
+    for client in clients:
+        longitude, latitude = client.get("longitude"), client.get("latitude")
+        if not _coordonnees_valides(longitude, latitude):
+            continue
+        for zone in _zones(client):
+            somme = sommes.setdefault(zone, [0.0, 0.0, 0])
+            somme[0] += longitude
+            somme[1] += latitude
+            somme[2] += 1
+    return {zone: (lon / n, lat / n) for zone, (lon, lat, n) in sommes.items()}
+
+
+def _position(client, centres):
+    """Coordonnées GPS du client, sinon centre de sa zone la plus précise connue"""
+    longitude, latitude = client.get("longitude"), client.get("latitude")
+    if _coordonnees_valides(longitude, latitude):
+        return longitude, latitude
+    for zone in _zones(client):
+        if zone in centres:
+            return centres[zone]
+    return None
+
+
+def planifier_tournees(clients):
+    """Numérote client["ordre"] (1, 2, ...) dans chaque tournée équipe/jour
+
+    Les clients impossibles à situer passent en fin de tournée, regroupés par zone.
+    """
+    centres = centres_zones(clients)
+    tournees = {}
+    for client in clients:
+        if client.get("equipe"):
+            tournees.setdefault((client.get("date", ""), client["equipe"]), []).append(client)
+    for membres in tournees.values():
+        places = [(client, _position(client, centres)) for client in membres]
+        situes = [client for client, position in places if position]
+        ordre = ordre_tournee([position for _, position in places if position])
+        non_situes = sorted((client for client, position in places if not position),
+                            key=lambda c: [replier_accents(c.get(champ)) for champ in CHAMPS_ZONE])
+        for rang, client in enumerate([situes[i] for i in ordre] + non_situes, 1):
+            client["ordre"] = rang
+    return len(tournees)
+
+
+def cle_tournee(client):
+    """Tri des clients d'un jour : par équipe puis ordre de passage"""
+    return client.get("equipe") or "", client.get("ordre") or 0
+
+
+# ---------------------------------------------------------------------------
+# Archive colonnaire des lignes importées (NumPy, partitions mensuelles)
+# ---------------------------------------------------------------------------
+
+DOSSIER_ARCHIVE = "archive"
+# Colonnes texte encodées par dictionnaire : codes entiers stables, valeurs dans dictionnaires.json
+COLONNES_DICTIONNAIRE = ("prestataire", "provenance", "ville", "quartier", "forfait", "type_habitation", "equipe")
+# Valeurs saisies à la main, ramenées à une seule orthographe
+COLONNES_MAJUSCULES = ("ville", "quartier")
+PERIODES_ARCHIVE = ("jour", "semaine", "mois")
+
+
+def _empreinte_cle(cle):
+    return int.from_bytes(hashlib.blake2b(cle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _cle_archive(client):
+    """Empreinte 64 bits de l'abonné, pour les comptes distincts et l'idempotence des imports"""
+    return _empreinte_cle(cle_enregistrement(client))
+
+
+def _valeur_dictionnaire(client, colonne):
+    valeur = str(client.get(colonne) or "").strip()
+    return valeur.upper() if colonne in COLONNES_MAJUSCULES else valeur
+
+
+class ArchiveClients:
+    """Toutes les lignes importées, en colonnes NumPy : archive/<AAAA-MM>/lot_<n>.npz
+
+    Chaque import ajoute un lot par mois touché ; une ligne déjà archivée (même
+    abonné, même jour) est remplacée par sa version corrigée, retirée du lot qui
+    la contenait, si bien qu'un export rejoué ne compte pas deux fois. Les
+    dictionnaires sont communs à toutes les partitions.
+    """
+
+    def __init__(self, dossier=DOSSIER_ARCHIVE):
+        self.dossier = dossier
+        chemin = os.path.join(dossier, "dictionnaires.json")
+        if os.path.exists(chemin):
+            with open(chemin, encoding="utf-8") as f:
+                self.dictionnaires = json.load(f)
+        else:
+            self.dictionnaires = {colonne: [""] for colonne in COLONNES_DICTIONNAIRE}
+        self.codes = {colonne: {v: i for i, v in enumerate(self.dictionnaires.get(colonne, [""]))}
+                      for colonne in COLONNES_DICTIONNAIRE}
+
+    def _coder(self, colonne, valeur):
+        codes = self.codes[colonne]
+        if valeur not in codes:
+            codes[valeur] = len(codes)
+            self.dictionnaires.setdefault(colonne, [""]).append(valeur)
+        return codes[valeur]
+
+    def partitions(self, debut=None, fin=None):
+        """Mois archivés (AAAA-MM), bornes incluses"""
+        if not os.path.isdir(self.dossier):
+            return []
+        mois = sorted(nom for nom in os.listdir(self.dossier) if re.fullmatch(r"\d{4}-\d{2}", nom))
+        return [m for m in mois if (debut is None or m >= debut) and (fin is None or m <= fin)]
+
+    def _lots(self, mois):
+        dossier = os.path.join(self.dossier, mois)
+        return sorted((os.path.join(dossier, nom) for nom in os.listdir(dossier) if nom.endswith(".npz")),
+                      key=lambda chemin: int(re.search(r"(\d+)\.npz$", chemin).group(1)))
+
+    def colonnes(self, champs, debut=None, fin=None):
+        """{champ: tableau} concaténé sur les partitions demandées ; seules ces colonnes sont lues"""
+        import numpy as np
+
+        morceaux = {champ: [] for champ in champs}
+        for mois in self.partitions(debut, fin):
+            for lot in self._lots(mois):
+                with np.load(lot) as donnees:
+                    for champ in champs:
+                        morceaux[champ].append(donnees[champ])
+        return {champ: np.concatenate(parts) if parts else np.array([]) for champ, parts in morceaux.items()}
+
+    def valeurs(self, colonne, codes):
+        """Codes d'une colonne dictionnaire -> libellés"""
+        dictionnaire = self.dictionnaires.get(colonne, [""])
+        return [dictionnaire[code] for code in codes]
+
+    def ajouter(self, clients):
+        """Archive les lignes nouvelles ou corrigées ; renvoie le nombre de lignes écrites"""
+        import numpy as np
+
+        par_mois = {}
+        for client in clients:
+            with suppress(ValueError):
+                jour = datetime.strptime(client.get("date", ""), "%d-%m-%Y").date()
+                par_mois.setdefault(jour.strftime("%Y-%m"), []).append((jour, client))
+        ecrites = 0
+        for mois, lignes in par_mois.items():
+            cles = np.array([_cle_archive(client) for _, client in lignes], dtype=np.uint64)
+            jours = np.array([jour.isoformat() for jour, _ in lignes], dtype="datetime64[D]")
+            empreintes = _empreinte_jour(cles, jours)
+            # Une même ligne présente deux fois dans l'import : la dernière version l'emporte
+            _, dernieres = np.unique(empreintes[::-1], return_index=True)
+            gardees = np.zeros(len(lignes), dtype=bool)
+            gardees[len(lignes) - 1 - dernieres] = True
+            self._retirer(mois, empreintes[gardees])
+            retenues = [client for (_, client), garder in zip(lignes, gardees) if garder]
+            colonnes = {
+                "cle": cles[gardees],
+                "jour": jours[gardees],
+                "longitude": np.array([client.get("longitude") or np.nan for client in retenues], dtype=np.float32),
+                "latitude": np.array([client.get("latitude") or np.nan for client in retenues], dtype=np.float32),
+                "ordre": np.array([client.get("ordre") or 0 for client in retenues], dtype=np.int16),
+                "offre_0f": np.array([bool(client.get("forfait_0f")) for client in retenues]),
+                "offre_2e_mois": np.array([bool(client.get("forfait_2e_mois")) for client in retenues]),
+            }
+            for colonne in COLONNES_DICTIONNAIRE:
+                codes = [self._coder(colonne, _valeur_dictionnaire(client, colonne)) for client in retenues]
+                colonnes[colonne] = np.array(codes, dtype=np.uint16 if len(self.codes[colonne]) <= 65536 else np.uint32)
+            dossier = os.path.join(self.dossier, mois)
+            os.makedirs(dossier, exist_ok=True)
+            lots = self._lots(mois)
+            numero = int(re.search(r"(\d+)\.npz$", lots[-1]).group(1)) + 1 if lots else 1
+            np.savez(os.path.join(dossier, f"lot_{numero}.npz"), **colonnes)
+            ecrites += len(retenues)
+        if ecrites:
+            self._ecrire_dictionnaires()
+        return ecrites
+
+    def _retirer(self, mois, empreintes):
+        """Retire d'une partition les lignes archivées de ces empreintes abonné + jour"""
+        import numpy as np
+
+        if not os.path.isdir(os.path.join(self.dossier, mois)):
+            return
+        for lot in self._lots(mois):
+            with np.load(lot) as donnees:
+                retirees = np.isin(_empreinte_jour(donnees["cle"], donnees["jour"]), empreintes)
+                if not retirees.any():
+                    continue
+                restantes = {champ: donnees[champ][~retirees] for champ in donnees.files}
+            if retirees.all():
+                os.remove(lot)
+                continue
+            with open(lot + ".tmp", "wb") as f:
+                np.savez(f, **restantes)
+            os.replace(lot + ".tmp", lot)
+
+    def _ecrire_dictionnaires(self):
+        chemin = os.path.join(self.dossier, "dictionnaires.json")
+        with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.dictionnaires, f, ensure_ascii=False)
+        os.replace(chemin + ".tmp", chemin)
+
+
+def _empreinte_jour(cles, jours):
+    """Clé combinée abonné + jour, comparable en un seul np.isin"""
+    import numpy as np
+
+    return cles ^ (jours.astype(np.int64).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+
+
+def installations_par(archive, champs=("forfait", "ville"), periode="semaine", debut=None, fin=None):
+    """Installations par période et par combinaison de colonnes dictionnaire, en un seul passage
+
+    Exemple : installations par forfait, par commune et par semaine depuis janvier :
+    installations_par(archive, ("forfait", "ville"), "semaine", "2026-01").
+    """
+    import numpy as np
+
+    donnees = archive.colonnes(("jour",) + tuple(champs), debut, fin)
+    jours = donnees["jour"].astype("datetime64[D]")
+    if periode == "semaine":
+        # 1970-01-01 était un jeudi : on recule au lundi
+        debuts = jours - ((jours.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+    elif periode == "mois":
+        debuts = jours.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        debuts = jours
+    if not len(debuts):
+        return []
+    # Une seule clé entière par groupe (jour, code, code...) : np.unique sur un vecteur 1-D
+    bases = [len(archive.dictionnaires.get(champ, [""])) for champ in champs]
+    cles = debuts.astype(np.int64)
+    for champ, base in zip(champs, bases):
+        cles = cles * base + donnees[champ].astype(np.int64)
+    groupes, comptes = np.unique(cles, return_counts=True)
+    codes = []
+    for base in reversed(bases):
+        groupes, code = np.divmod(groupes, base)
+        codes.insert(0, code)
+    libelles = [archive.valeurs(champ, code) for champ, code in zip(champs, codes)]
+    jours = groupes.astype("datetime64[D]").astype(str).tolist()
+    return [[jour] + [libelle[n] for libelle in libelles] + [int(compte)]
+            for n, (jour, compte) in enumerate(zip(jours, comptes))]
+
+
+def archiver(clients, dossier=DOSSIER_ARCHIVE):
+    """Ajoute un import à l'archive colonnaire (NumPy requis, sinon étape sautée)"""
+    if importlib.util.find_spec("numpy") is None:
+        console.print("[dim]⏭️  Archive colonnaire sautée : NumPy n'est pas installé[/dim]")
+        return 0
+    return ArchiveClients(dossier).ajouter(clients)
+
+
+def afficher_installations_par(lignes, champs, periode, limite=50):
+    tableau = Table(title=f"Installations par {periode} et par {', '.join(champs)}")
+    tableau.add_column(periode.capitalize())
+    for champ in champs:
+        tableau.add_column(champ.capitalize())
+    tableau.add_column("Installations", justify="right")
+    for ligne in sorted(lignes, key=lambda l: (l[0], -l[-1]))[-limite:]:
+        tableau.add_row(*ligne[:-1], str(ligne[-1]))
+    console.print(tableau)
+
+
+# ---------------------------------------------------------------------------
+# Doublons et clients récurrents entre exports
+# ---------------------------------------------------------------------------
+
+# Part des mots du nom le plus court retrouvés dans l'autre
+SEUIL_NOM_SEUL = 1.0
+SEUIL_NOM_CONTACT = 0.5
+# Au-delà, seuls les derniers membres d'un bloc de noms sont comparés
+TAILLE_MAX_BLOC = 200
+
+
+def normaliser_telephone(numero):
+    """'+225 07 48 12 34 56' -> '0748123456' (dix derniers chiffres)"""
+    chiffres = re.sub(r"\D", "", str(numero or ""))
+    return chiffres[-10:] if len(chiffres) >= 8 else ""
+
+
+def normaliser_tn(tn):
+    """'2536050905@MTN.CI ' -> '2536050905'"""
+    return re.sub(r"\D", "", str(tn or "").split("@")[0])
+
+
+def normaliser_sn(sn):
+    return re.sub(r"[^0-9A-Z]", "", str(sn or "").upper())
+
+
+def mots_nom(nom):
+    """'HAÏDARA Mohamed L.' -> ['haidara', 'mohamed', 'l']"""
+    return re.findall(r"[a-z]+", replier_accents(nom))
+
+
+def _une_edition(a, b):
+    """Vrai si a et b diffèrent d'au plus une substitution, insertion ou suppression"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i + (len(a) == len(b)):] == b[i + 1:]
+
+
+def _mots_proches(a, b):
+    if a == b:
+        return True
+    if len(a) == 1 or len(b) == 1:
+        return a[0] == b[0]
+    return min(len(a), len(b)) >= 4 and _une_edition(a, b)
+
+
+def similarite_noms(a, b):
+    """(part des mots du nom court retrouvés dans l'autre, nombre de mots retrouvés)
+
+    Initiales ('L' pour 'LAMINE') et fautes d'une lettre sont admises.
+    """
+    if not a or not b:
+        return 0.0, 0
+    court, long = sorted((a, b), key=len)
+    restants, trouves = list(long), 0
+    for mot in court:
+        for j, autre in enumerate(restants):
+            if _mots_proches(mot, autre):
+                trouves += 1
+                del restants[j]
+                break
+    return trouves / len(court), trouves
+
+
+def blocs_nom(mots):
+    """Clés de blocage : paires de préfixes de 3 lettres, indépendantes de l'ordre des mots"""
+    prefixes = sorted({mot[:3] for mot in mots if len(mot) >= 2})
+    return {f"{a}|{b}" for i, a in enumerate(prefixes) for b in prefixes[i + 1:]}
+
+
+def _cles_exactes(client):
+    cles = {("tel", t) for t in map(normaliser_telephone, (client.get("contact"), client.get("contact2"))) if t}
+    for genre, normaliser in (("tn", normaliser_tn), ("sn", normaliser_sn)):
+        if normaliser(client.get(genre)):
+            cles.add((genre, normaliser(client.get(genre))))
+    return cles
+
+
+def cles_identite(client, mots=None):
+    """Clés de hachage d'un client : TN, SN et téléphones normalisés, blocs de nom"""
+    mots = mots_nom(client.get("nom")) if mots is None else mots
+    return sorted(_cles_exactes(client)) + [("bloc", bloc) for bloc in sorted(blocs_nom(mots))]
+
+
+def _fiche_identite(client, origine):
+    mots = mots_nom(client.get("nom"))
+    return {
+        "client": client,
+        "origine": origine,
+        "cle": cle_enregistrement(client),
+        "mots": mots,
+        "ville": replier_accents(client.get("ville")).strip(),
+        "exactes": _cles_exactes(client),
+        "cles": cles_identite(client, mots) if origine == "import" else None,
+    }
+
+
+def comparer_identites(fiche, autre):
+    """(motif, score) si les deux fiches désignent probablement le même abonné, sinon None"""
+    communes = {genre for genre, _ in fiche["exactes"] & autre["exactes"]}
+    for genre in ("tn", "sn"):
+        if genre in communes:
+            return genre.upper(), 1.0
+    # Sans contact commun, deux homonymes de communes différentes restent distincts
+    autre_ville = fiche["ville"] and autre["ville"] and fiche["ville"] != autre["ville"]
+    if "tel" not in communes and autre_ville:
+        return None
+    score, mots = similarite_noms(fiche["mots"], autre["mots"])
+    if "tel" in communes and score >= SEUIL_NOM_CONTACT:
+        return "contact + nom", score
+    if not autre_ville and score >= SEUIL_NOM_SEUL and mots >= 2:
+        return "nom proche", score
+    return None
+
+
+class IndexIdentites:
+    """Index en mémoire des clients d'un import : une liste de fiches par clé de hachage"""
+
+    def __init__(self):
+        self.fiches = []
+        self.par_cle = {}
+
+    def ajouter(self, fiche):
+        numero = len(self.fiches)
+        self.fiches.append(fiche)
+        for cle in fiche["cles"]:
+            self.par_cle.setdefault(cle, []).append(numero)
+        return numero
+
+    def candidats(self, fiche):
+        """Numéros des fiches partageant une clé ; les blocs trop peuplés sont tronqués"""
+        numeros = set()
+        for cle in fiche["cles"]:
+            membres = self.par_cle.get(cle, ())
+            numeros.update(membres[-TAILLE_MAX_BLOC:] if cle[0] == "bloc" else membres)
+        return numeros
+
+
+def _completer(garde, doublon):
+    for champ, valeur in doublon.items():
+        if valeur not in (None, "") and garde.get(champ) in (None, ""):
+            garde[champ] = valeur
+
+
+def dedoublonner(clients, db=None):
+    """Fusionne les doublons d'un même jour et signale les abonnés déjà connus
+
+    Dans l'import, deux lignes du même jour désignant le même abonné (TN, SN ou
+    téléphone + nom) n'en font plus qu'une. Face à l'historique, le même jour, le
+    client reprend la clé déjà enregistrée pour mettre à jour sa ligne au lieu
+    d'en créer une seconde. Les autres correspondances (autre jour, nom proche
+    seul) sont seulement signalées. Renvoie (clients gardés, signalements).
+
+    Chaque client n'est comparé qu'aux fiches qui partagent l'une de ses clés :
+    l'historique est interrogé par la table identites, sans être chargé.
+    """
+    index = IndexIdentites()
+    gardes, signalements, historique = [], [], {}
+    for client in clients:
+        fiche = _fiche_identite(client, "import")
+        references = [index.fiches[numero] for numero in sorted(index.candidats(fiche))]
+        if isinstance(db, BaseClients):
+            # Les blocs de noms courants reviennent d'un client à l'autre : fiches gardées
+            for ligne in db.candidats(fiche["cles"]):
+                cle = (ligne["cle"], ligne["date"])
+                if cle not in historique:
+                    historique[cle] = _fiche_identite(ligne, "historique")
+                references.append(historique[cle])
+        fusion = None
+        for reference in references:
+            meme_jour = reference["client"].get("date") == client.get("date")
+            if meme_jour and reference["origine"] == "historique" and reference["cle"] == fiche["cle"]:
+                continue  # la même ligne, réimportée
+            correspondance = comparer_identites(fiche, reference)
+            if correspondance is None:
+                continue
+            motif, score = correspondance
+            if meme_jour and motif != "nom proche":
+                if reference["origine"] == "import":
+                    _completer(reference["client"], client)
+                    fusion = "fusionné"
+                else:
+                    # Les valeurs corrigées de l'import sont gardées : seule la clé de la
+                    # ligne existante est reprise, pour que l'upsert la mette à jour
+                    client["cle"] = reference["cle"]
+                    fusion = "clé historique reprise"
+            signalements.append({
+                "date": client.get("date", ""),
+                "client": client,
+                "reference": reference["client"],
+                "origine": reference["origine"],
+                "motif": motif,
+                "score": round(score, 2),
+                "action": fusion or "signalé",
+            })
+            if fusion:
+                break
+        if fusion != "fusionné":
+            index.ajouter(fiche)
+            gardes.append(client)
+    return gardes, signalements
+
+
+def ecrire_doublons(signalements):
+    """dossier_<date>/doublons.csv : doublons fusionnés et abonnés déjà connus"""
+    par_date = {}
+    for ligne in signalements:
+        par_date.setdefault(ligne["date"], []).append(ligne)
+    chemins = []
+    for date, lignes in par_date.items():
+        dossier = f"dossier_{date}"
+        os.makedirs(dossier, exist_ok=True)
+        chemin = os.path.join(dossier, "doublons.csv")
+        with open(chemin, "w", encoding="utf-8", newline="") as f:
+            ecrivain = csv.writer(f, delimiter=";")
+            ecrivain.writerow(["action", "motif", "score", "nom", "tn", "contact", "nom_reference",
+                               "tn_reference", "date_reference", "equipe_reference", "origine"])
+            for ligne in lignes:
+                client, reference = ligne["client"], ligne["reference"]
+                ecrivain.writerow([
+                    ligne["action"], ligne["motif"], ligne["score"], client.get("nom", ""), client.get("tn", ""),
+                    client.get("contact", ""), reference.get("nom", ""), reference.get("tn", ""),
+                    reference.get("date", ""), reference.get("equipe", ""), ligne["origine"],
+                ])
+        chemins.append(chemin)
+    return chemins
+
+
+def afficher_doublons(signalements):
+    comptes = {}
+    for ligne in signalements:
+        cle = (ligne["action"], ligne["motif"])
+        comptes[cle] = comptes.get(cle, 0) + 1
+    tableau = Table(title="Doublons et clients déjà connus")
+    tableau.add_column("Action")
+    tableau.add_column("Motif")
+    tableau.add_column("Clients", justify="right")
+    for (action, motif), nombre in sorted(comptes.items()):
+        tableau.add_row(action, motif, str(nombre))
+    console.print(tableau)
+
+
+# ---------------------------------------------------------------------------
+# Affectation automatique des clients aux équipes
+# ---------------------------------------------------------------------------
+
+FICHIER_EQUIPES = "equipes.json"
+CAPACITE_EQUIPE = int(os.environ.get("FTTH_CAPACITE_EQUIPE", "15"))
+# Dépassement toléré de la part proportionnelle d'une équipe pour privilégier la proximité
+SOUPLESSE_CHARGE = 1.25
+# Coût, en km équivalents, d'un forfait hors des spécialités d'une équipe
+PENALITE_FORFAIT_KM = 50.0
+
+
+def charger_equipes(chemin=FICHIER_EQUIPES, db=None):
+    """Équipes actives : {nom: {"capacite", "base", "forfaits"}}
+
+    equipes.json : {"STI": {"capacite": 12, "base": [-4.01, 5.35], "forfaits": ["100 mb"]}, ...}.
+    Sans fichier, les équipes de l'historique avec la capacité par défaut.
+    """
+    if os.path.exists(chemin):
+        with open(chemin, encoding="utf-8") as f:
+            brutes = json.load(f)
+    elif isinstance(db, BaseClients):
+        brutes = dict.fromkeys(db.equipes(), {})
+    else:
+        brutes = dict.fromkeys(sorted({c["equipe"] for c in clients_db(db or {}) if c.get("equipe")}), {})
+    return {
+        nom: {
+            "capacite": int(conf.get("capacite", CAPACITE_EQUIPE)),
+            "base": tuple(conf["base"]) if conf.get("base") else None,
+            "forfaits": [replier_accents(forfait) for forfait in conf.get("forfaits", [])],
+        }
+        for nom, conf in brutes.items() if conf.get("active", True)
+    }
+
+
+def _ancres(equipes, db, positions):
+    """Point de référence de chaque équipe : base déclarée, sinon médiane de son historique
+
+    Une équipe sans historique prend la position du jour la plus éloignée des autres.
+    """
+    ancres = {}
+    for nom, conf in equipes.items():
+        points = [] if conf["base"] or db is None else points_gps(db, nom)
+        if conf["base"]:
+            ancres[nom] = conf["base"]
+        elif points:
+            ancres[nom] = (statistics.median(p[0] for p in points), statistics.median(p[1] for p in points))
+    for nom in sorted(equipes):
+        if nom not in ancres and positions:
+            ancres[nom] = max(positions, key=lambda p: min((distance_km(p, a) for a in ancres.values()), default=0))
+    return ancres
+
+
+def affecter_equipes(clients, equipes, db=None):
+    """Affecte une équipe aux clients qui n'en ont pas ; renvoie la table d'affectation
+
+    Coût d'un couple client/équipe : distance à l'ancre de l'équipe, plus une pénalité
+    si le forfait sort de ses spécialités. Jour par jour, les clients au plus fort
+    regret (écart entre la meilleure et la deuxième équipe) sont placés en premier,
+    chaque équipe recevant au plus sa part du jour au prorata des capacités.
+    """
+    a_affecter = [client for client in clients if not client.get("equipe")]
+    if not a_affecter or not equipes:
+        return []
+    noms = sorted(equipes)
+    centres = centres_zones(clients)
+    positions = {id(client): _position(client, centres) for client in a_affecter}
+    ancres = _ancres(equipes, db, [p for p in positions.values() if p])
+    capacite_totale = max(1, sum(equipes[nom]["capacite"] for nom in noms))
+
+    par_jour = {}
+    for client in clients:
+        par_jour.setdefault(client.get("date", ""), []).append(client)
+
+    table = []
+    for date, clients_jour in par_jour.items():
+        nouveaux = [client for client in clients_jour if not client.get("equipe")]
+        if not nouveaux:
+            continue
+        charges = dict.fromkeys(noms, 0)
+        for client in clients_jour:
+            if client.get("equipe") in charges:
+                charges[client["equipe"]] += 1
+        total = len(nouveaux) + sum(charges.values())
+        quotas = {
+            nom: min(equipes[nom]["capacite"],
+                     math.ceil(total * equipes[nom]["capacite"] / capacite_totale * SOUPLESSE_CHARGE))
+            for nom in noms
+        }
+
+        couts = []
+        for client in nouveaux:
+            position, forfait = positions[id(client)], replier_accents(client.get("forfait"))
+            distances = {
+                nom: distance_km(position, ancres[nom]) if position and nom in ancres else 0.0 for nom in noms}
+            cout = {
+                nom: distances[nom] + (PENALITE_FORFAIT_KM if equipes[nom]["forfaits"] and not any(
+                    f in forfait for f in equipes[nom]["forfaits"]) else 0.0)
+                for nom in noms
+            }
+            meilleurs = sorted(cout.values())[:2]
+            couts.append((meilleurs[-1] - meilleurs[0], distances, cout))
+
+        for i in sorted(range(len(nouveaux)), key=lambda i: -couts[i][0]):
+            _, distances, cout = couts[i]
+            libres = [nom for nom in noms if charges[nom] < quotas[nom]]
+            if libres:
+                nom = min(libres, key=lambda n: (cout[n], charges[n] / max(1, equipes[n]["capacite"])))
+            else:
+                # Toutes les équipes pleines : dépassement sur la moins chargée, la plus proche à égalité
+                nom = min(noms, key=lambda n: (charges[n] / max(1, equipes[n]["capacite"]), cout[n]))
+            charges[nom] += 1
+            nouveaux[i]["equipe"] = nom
+            table.append({
+                "date": date,
+                "equipe": nom,
+                "client": nouveaux[i],
+                "distance_km": round(distances[nom], 2) if positions[id(nouveaux[i])] else None,
+                "depassement": charges[nom] > equipes[nom]["capacite"],
+            })
+    return table
+
+
+def ecrire_affectations(table):
+    """dossier_<date>/affectations.csv : la table qui répartit les dossiers par équipe"""
+    par_date = {}
+    for ligne in table:
+        par_date.setdefault(ligne["date"], []).append(ligne)
+    chemins = []
+    for date, lignes in par_date.items():
+        dossier = f"dossier_{date}"
+        os.makedirs(dossier, exist_ok=True)
+        chemin = os.path.join(dossier, "affectations.csv")
+        with open(chemin, "w", encoding="utf-8", newline="") as f:
+            ecrivain = csv.writer(f, delimiter=";")
+            ecrivain.writerow(["equipe", "nom", "tn", "ville", "quartier", "forfait", "distance_km", "depassement"])
+            for ligne in sorted(lignes, key=lambda l: (l["equipe"], l["client"].get("nom", ""))):
+                client = ligne["client"]
+                ecrivain.writerow([
+                    ligne["equipe"], client.get("nom", ""), client.get("tn", ""), client.get("ville", ""),
+                    client.get("quartier", ""), client.get("forfait", ""),
+                    "" if ligne["distance_km"] is None else ligne["distance_km"], int(ligne["depassement"]),
+                ])
+        chemins.append(chemin)
+    return chemins
+
+
+def afficher_affectations(table, equipes):
+    resume = {}
+    for ligne in table:
+        nombre, distances, depassements = resume.get(ligne["equipe"], (0, [], 0))
+        if ligne["distance_km"] is not None:
+            distances.append(ligne["distance_km"])
+        resume[ligne["equipe"]] = (nombre + 1, distances, depassements + ligne["depassement"])
+    tableau = Table(title="Affectation des nouveaux clients")
+    tableau.add_column("Équipe")
+    tableau.add_column("Clients", justify="right")
+    tableau.add_column("Capacité/jour", justify="right")
+    tableau.add_column("Distance moy. (km)", justify="right")
+    tableau.add_column("Dépassements", justify="right")
+    for nom in sorted(resume):
+        nombre, distances, depassements = resume[nom]
+        moyenne = f"{sum(distances) / len(distances):.1f}" if distances else "-"
+        tableau.add_row(nom, str(nombre), str(equipes[nom]["capacite"]), moyenne, str(depassements))
+    console.print(tableau)
+
+
+# ---------------------------------------------------------------------------
+# Indicateurs des dashboards, calculés en lot sur la table clients
+# ---------------------------------------------------------------------------
+
+JOURS_SERIE_KPI = 30
+CHAMPS_KPI = ("jour", "equipe", "cle", "provenance", "forfait", "forfait_0f", "forfait_2e_mois")
+# Colonnes de la base déjà encodées, à côté de clients.sqlite : seules les lignes modifiées depuis sont relues
+FICHIER_CACHE_KPI = os.path.join(".cache", "kpi.npz")
+COLONNES_TEXTE_KPI = ("equipe", "provenance", "forfait")
+TYPES_CACHE_KPI = {"equipe": "int32", "provenance": "int32", "forfait": "int32", "jour": "int32",
+                   "cle": "uint64", "forfait_0f": "bool", "forfait_2e_mois": "bool"}
+
+
+def _jour_epoch(date):
+    with suppress(ValueError):
+        return (datetime.strptime(date, "%d-%m-%Y") - datetime(1970, 1, 1)).days
+    return None
+
+
+def lignes_kpi(db):
+    """(date, equipe, cle, provenance, forfait, offre 0F, offre 2e mois) des clients affectés"""
+    if isinstance(db, BaseClients):
+        return db.connexion.execute(
+            "SELECT date, equipe, cle, COALESCE(provenance, ''), COALESCE(forfait, ''), "
+            "COALESCE(forfait_0f, '') <> '', COALESCE(forfait_2e_mois, '') <> '' "
+            "FROM clients WHERE equipe <> ''").fetchall()
+    return [
+        (c.get("date", ""), c["equipe"], cle_enregistrement(c), c.get("provenance") or "",
+         c.get("forfait") or "", bool(c.get("forfait_0f")), bool(c.get("forfait_2e_mois")))
+        for c in db.get("clients", []) if c.get("equipe")
+    ]
+
+
+def colonnes_kpi(db):
+    """Colonnes des clients affectés, une ligne par installation, textes encodés par dictionnaire
+
+    Renvoie {champ: codes} et {champ: valeurs} ; jour est en jours depuis 1970 (-1 si illisible).
+    """
+    import numpy as np
+
+    if isinstance(db, BaseClients):
+        return _colonnes_kpi_base(db)
+    lignes = lignes_kpi(db)
+    brutes = dict(zip(CHAMPS_KPI, zip(*lignes))) if lignes else {champ: () for champ in CHAMPS_KPI}
+    codes = {
+        "forfait_0f": np.array(brutes["forfait_0f"], dtype=bool),
+        "forfait_2e_mois": np.array(brutes["forfait_2e_mois"], dtype=bool),
+    }
+    valeurs = {}
+    for champ in ("jour", "equipe", "cle", "provenance", "forfait"):
+        # dict.fromkeys puis map restent en C : pas de boucle Python par ligne
+        dictionnaire = {v: i for i, v in enumerate(dict.fromkeys(brutes[champ]))}
+        codes[champ] = np.fromiter(map(dictionnaire.__getitem__, brutes[champ]), dtype=np.int64,
+                                   count=len(brutes[champ]))
+        valeurs[champ] = list(dictionnaire)
+    # Peu de dates distinctes : on convertit le dictionnaire, pas chaque ligne
+    epoques = [_jour_epoch(date) for date in valeurs["jour"]]
+    codes["jour"] = np.array([-1 if e is None else e for e in epoques] or [-1], dtype=np.int64)[codes["jour"]]
+    return codes, valeurs
+
+
+def _colonnes_kpi_base(db, reconstruire=False):
+    """colonnes_kpi d'une BaseClients, tenues à jour dans FICHIER_CACHE_KPI
+
+    Le cache garde une case par rowid (equipe = -1 : ligne absente ou non affectée)
+    et la séquence de la dernière modification lue : un import ne relit que les
+    lignes dont la colonne modifie est plus récente. Les clients sont réduits à
+    une empreinte 64 bits, seuls les comptes distincts en ont besoin.
+    """
+    import numpy as np
+
+    chemin = os.path.join(os.path.dirname(os.path.abspath(db.chemin)), FICHIER_CACHE_KPI)
+    sequence = db.sequence()
+    cache = None if reconstruire else _charger_cache_kpi(chemin)
+    if cache is not None and cache["sequence"] > sequence:
+        cache = None  # base remplacée depuis
+    cache = cache or {"sequence": -1, "valeurs": {champ: [] for champ in COLONNES_TEXTE_KPI},
+                      "colonnes": {champ: np.empty(0, dtype=t) for champ, t in TYPES_CACHE_KPI.items()}}
+    lignes = db.connexion.execute(
+        "SELECT rowid, date, equipe, cle, COALESCE(provenance, ''), COALESCE(forfait, ''), "
+        "COALESCE(forfait_0f, '') <> '', COALESCE(forfait_2e_mois, '') <> '' "
+        "FROM clients WHERE modifie > ?", (cache["sequence"],)).fetchall()
+    if lignes:
+        _appliquer_cache_kpi(cache, lignes)
+        cache["sequence"] = sequence
+    affectees = db.connexion.execute("SELECT COUNT(*) FROM clients WHERE equipe <> ''").fetchone()[0]
+    if int((cache["colonnes"]["equipe"] >= 0).sum()) != affectees and not reconstruire:
+        # Cache d'une autre base (fichier remplacé) : reconstruction complète
+        return _colonnes_kpi_base(db, reconstruire=True)
+    if lignes:
+        _ecrire_cache_kpi(chemin, cache)
+
+    colonnes = cache["colonnes"]
+    gardees = colonnes["equipe"] >= 0
+    codes = {
+        "jour": colonnes["jour"][gardees].astype(np.int64),
+        "cle": np.unique(colonnes["cle"][gardees], return_inverse=True)[1].astype(np.int64),
+        "forfait_0f": colonnes["forfait_0f"][gardees],
+        "forfait_2e_mois": colonnes["forfait_2e_mois"][gardees],
+    }
+    valeurs = {}
+    for champ in COLONNES_TEXTE_KPI:
+        # Codes resserrés : une valeur qui n'apparaît plus ne doit pas donner de ligne vide
+        presents, codes[champ] = np.unique(colonnes[champ][gardees], return_inverse=True)
+        codes[champ] = codes[champ].astype(np.int64)
+        valeurs[champ] = [cache["valeurs"][champ][code] for code in presents.tolist()]
+    return codes, valeurs
+
+
+def _charger_cache_kpi(chemin):
+    import numpy as np
+
+    with suppress(OSError, ValueError, KeyError, zipfile.BadZipFile):
+        with np.load(chemin) as donnees:
+            entete = json.loads(str(donnees["entete"]))
+            colonnes = {champ: donnees[champ] for champ in TYPES_CACHE_KPI}
+        return {"sequence": entete["sequence"], "valeurs": entete["valeurs"], "colonnes": colonnes}
+    return None
+
+
+def _appliquer_cache_kpi(cache, lignes):
+    """Reporte dans le cache les lignes (rowid, date, equipe, cle, ...) relues de la base"""
+    import numpy as np
+
+    rowids, dates, equipes, cles, provenances, forfaits, offres_0f, offres_2e = zip(*lignes)
+    rowids = np.array(rowids, dtype=np.int64)
+    colonnes, taille = cache["colonnes"], int(rowids.max()) + 1
+    for champ, type_colonne in TYPES_CACHE_KPI.items():
+        ancienne = colonnes[champ]
+        if len(ancienne) < taille:
+            colonne = np.full(taille, -1 if champ == "equipe" else 0, dtype=type_colonne)
+            colonne[:len(ancienne)] = ancienne
+            colonnes[champ] = colonne
+    for champ, brutes in zip(COLONNES_TEXTE_KPI, (equipes, provenances, forfaits)):
+        dictionnaire = {v: i for i, v in enumerate(cache["valeurs"][champ])}
+        for valeur in dict.fromkeys(brutes):
+            if valeur not in dictionnaire:
+                dictionnaire[valeur] = len(dictionnaire)
+                cache["valeurs"][champ].append(valeur)
+        colonnes[champ][rowids] = np.fromiter(map(dictionnaire.__getitem__, brutes), dtype=np.int32, count=len(brutes))
+    # Une ligne passée sans équipe sort des indicateurs
+    sans_equipe = np.fromiter((not equipe for equipe in equipes), dtype=bool, count=len(equipes))
+    colonnes["equipe"][rowids[sans_equipe]] = -1
+    epoques = {date: _jour_epoch(date) for date in dict.fromkeys(dates)}
+    colonnes["jour"][rowids] = np.fromiter(
+        (-1 if epoques[date] is None else epoques[date] for date in dates), dtype=np.int32, count=len(dates))
+    colonnes["cle"][rowids] = np.fromiter(map(_empreinte_cle, cles), dtype=np.uint64, count=len(cles))
+    colonnes["forfait_0f"][rowids] = np.array(offres_0f, dtype=bool)
+    colonnes["forfait_2e_mois"][rowids] = np.array(offres_2e, dtype=bool)
+
+
+def _ecrire_cache_kpi(chemin, cache):
+    import numpy as np
+
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    entete = json.dumps({"sequence": cache["sequence"], "valeurs": cache["valeurs"]}, ensure_ascii=False)
+    with open(chemin + ".tmp", "wb") as f:
+        np.savez(f, entete=np.array(entete), **cache["colonnes"])
+    os.replace(chemin + ".tmp", chemin)
+
+
+def _pourcent(partie, total):
+    return round(float(partie) / float(total) * 100) if total else 0
+
+
+def _distincts_par_groupe(groupes, cles, nombre):
+    """Nombre de clés distinctes dans chaque groupe (codes 0..nombre-1)"""
+    import numpy as np
+
+    if not len(cles):
+        return np.zeros(nombre, dtype=np.int64)
+    base = int(cles.max()) + 1
+    paires = np.sort(groupes * base + cles)
+    premieres = np.concatenate(([True], paires[1:] != paires[:-1]))
+    return np.bincount(paires[premieres] // base, minlength=nombre)
+
+
+def _entree_classement(nom, installations, clients, installations_mois, objectif, jours, offres_0f, offres_2e,
+                       couleur, rang):
+    return {
+        "name": nom,
+        "installations": installations,
+        "clients": clients,
+        # Clients distincts / installations : ce n'est pas un taux de réussite, aucun échec n'est connu
+        "partClientsUniques": _pourcent(clients, installations),
+        "installationsMois": installations_mois,
+        "objectif": objectif,
+        "progress": round(min(100.0, installations_mois / objectif * 100), 1) if objectif else 0.0,
+        "jours": jours,
+        "moyenneJour": round(installations / jours, 1) if jours else 0.0,
+        "offre0f": offres_0f,
+        "offre2eMois": offres_2e,
+        "level": min(10, 1 + installations // 20),
+        "color": couleur,
+        "rank": rang,
+    }
+
+
+def _entree_repartition(valeur, installations, distincts, avec_0f, avec_2e, total):
+    return {"valeur": valeur or "Non renseigné", "installations": installations,
+            "part": _pourcent(installations, total),
+            "partClientsUniques": _pourcent(distincts, installations),
+            "offre0f": _pourcent(avec_0f, installations), "offre2eMois": _pourcent(avec_2e, installations)}
+
+
+def calculer_kpi(db, equipes=None):
+    """Tous les chiffres des dashboards en une passe vectorisée sur la table clients
+
+    Objectif d'une équipe : sa capacité journalière (equipes.json) multipliée par
+    les jours travaillés du mois en cours ; le classement suit les installations
+    du mois. Les pages embarquent ce résultat tel quel, sans recalcul en JS.
+    Avec une BaseClients, seules les lignes modifiées depuis le calcul précédent
+    sont relues (voir _colonnes_kpi_base). Sans NumPy, les mêmes chiffres sont
+    calculés en Python pur sur toute la table.
+    """
+    equipes = charger_equipes(FICHIER_EQUIPES, db) if equipes is None else equipes
+    if importlib.util.find_spec("numpy") is None:
+        return calculer_kpi_python(lignes_kpi(db), equipes)
+    import numpy as np
+
+    codes, valeurs = colonnes_kpi(db)
+    noms = valeurs["equipe"]
+    nombre = len(noms)
+    equipe, cle, jours = codes["equipe"], codes["cle"], codes["jour"]
+
+    installations = np.bincount(equipe, minlength=nombre)
+    clients = _distincts_par_groupe(equipe, cle, nombre)
+    valides = jours >= 0
+    jours_actifs = _distincts_par_groupe(equipe[valides], jours[valides], nombre)
+    mois = np.datetime64(int(jours[valides].max()), "D").astype("datetime64[M]") if valides.any() else None
+    if mois is not None:
+        debut_mois = int(mois.astype("datetime64[D]").astype(np.int64))
+        fin_mois = int((mois + 1).astype("datetime64[D]").astype(np.int64))
+        dans_mois = (jours >= debut_mois) & (jours < fin_mois)
+    else:
+        dans_mois = np.zeros(len(jours), dtype=bool)
+    installations_mois = np.bincount(equipe[dans_mois], minlength=nombre)
+    jours_mois = int(_distincts_par_groupe(np.zeros(int(dans_mois.sum()), dtype=np.int64), jours[dans_mois], 1)[0])
+    capacites = np.array([equipes.get(nom, {}).get("capacite", CAPACITE_EQUIPE) for nom in noms], dtype=np.int64)
+    objectifs = capacites * jours_mois
+    offres_0f = np.bincount(equipe, weights=codes["forfait_0f"], minlength=nombre)
+    offres_2e = np.bincount(equipe, weights=codes["forfait_2e_mois"], minlength=nombre)
+
+    ordre_noms = np.argsort(np.array(noms, dtype=object)) if nombre else np.array([], dtype=np.int64)
+    rang_nom = np.empty(nombre, dtype=np.int64)
+    rang_nom[ordre_noms] = np.arange(nombre)
+    couleurs = {noms[i]: COULEURS_EQUIPES[r % len(COULEURS_EQUIPES)] for r, i in enumerate(ordre_noms)}
+    classement = []
+    for rang, i in enumerate(np.lexsort((rang_nom, -installations, -installations_mois)), 1):
+        classement.append(_entree_classement(
+            noms[i], int(installations[i]), int(clients[i]), int(installations_mois[i]), int(objectifs[i]),
+            int(jours_actifs[i]), int(offres_0f[i]), int(offres_2e[i]), couleurs[noms[i]], rang))
+
+    total = int(installations.sum())
+    distincts = int(clients.sum())
+    dates, par_jour = np.unique(jours[valides], return_counts=True)
+
+    def repartition(champ):
+        groupes, nombre_valeurs = codes[champ], len(valeurs[champ])
+        comptes = np.bincount(groupes, minlength=nombre_valeurs)
+        distincts_valeur = _distincts_par_groupe(groupes, cle, nombre_valeurs)
+        avec_0f = np.bincount(groupes, weights=codes["forfait_0f"], minlength=nombre_valeurs)
+        avec_2e = np.bincount(groupes, weights=codes["forfait_2e_mois"], minlength=nombre_valeurs)
+        return [_entree_repartition(valeurs[champ][i], int(comptes[i]), int(distincts_valeur[i]),
+                                    int(avec_0f[i]), int(avec_2e[i]), total)
+                for i in sorted(range(nombre_valeurs), key=lambda i: (-comptes[i], valeurs[champ][i]))]
+
+    return {
+        "mois": str(mois) if mois is not None else "",
+        "joursMois": jours_mois,
+        "equipes": classement,
+        "totaux": {
+            "installations": total,
+            "clients": distincts,
+            "teams": nombre,
+            "partClientsUniques": _pourcent(distincts, total),
+            "installationsMois": int(installations_mois.sum()),
+            "objectifMois": int(objectifs.sum()),
+            "equipesActivesMois": int((installations_mois > 0).sum()),
+            "moyenneJour": round(total / len(dates), 1) if len(dates) else 0.0,
+            "offre0f": _pourcent(codes["forfait_0f"].sum(), total),
+            "offre2eMois": _pourcent(codes["forfait_2e_mois"].sum(), total),
+        },
+        "parJour": [{"date": str(np.datetime64(int(d), "D")), "installations": int(n)}
+                    for d, n in zip(dates[-JOURS_SERIE_KPI:], par_jour[-JOURS_SERIE_KPI:])],
+        "provenances": repartition("provenance"),
+        "forfaits": repartition("forfait"),
+    }
+
+
+def calculer_kpi_python(lignes, equipes):
+    """calculer_kpi sans NumPy : mêmes chiffres, en un passage Python sur lignes_kpi"""
+    origine = datetime(1970, 1, 1)
+    epoques = {}
+    par_equipe, par_jour, repartitions = {}, {}, {"provenance": {}, "forfait": {}}
+    offres_0f = offres_2e = 0
+    for date, equipe, cle, provenance, forfait, offre_0f, offre_2e in lignes:
+        if date not in epoques:
+            epoque = _jour_epoch(date)
+            epoques[date] = epoque if epoque is not None and epoque >= 0 else None
+        jour = epoques[date]
+        stats = par_equipe.setdefault(equipe, {"jours": {}, "cles": set(), "installations": 0, "0f": 0, "2e": 0})
+        stats["installations"] += 1
+        stats["cles"].add(cle)
+        stats["0f"] += bool(offre_0f)
+        stats["2e"] += bool(offre_2e)
+        if jour is not None:
+            stats["jours"][jour] = stats["jours"].get(jour, 0) + 1
+            par_jour[jour] = par_jour.get(jour, 0) + 1
+        offres_0f += bool(offre_0f)
+        offres_2e += bool(offre_2e)
+        for champ, valeur in (("provenance", provenance), ("forfait", forfait)):
+            groupe = repartitions[champ].setdefault(valeur, [0, set(), 0, 0])
+            groupe[0] += 1
+            groupe[1].add(cle)
+            groupe[2] += bool(offre_0f)
+            groupe[3] += bool(offre_2e)
+
+    def mois_de(jour):
+        return (origine + timedelta(days=jour)).strftime("%Y-%m")
+
+    mois = mois_de(max(par_jour)) if par_jour else ""
+    jours_mois = sum(1 for jour in par_jour if mois_de(jour) == mois)
+    noms = sorted(par_equipe)
+    couleurs = {nom: COULEURS_EQUIPES[r % len(COULEURS_EQUIPES)] for r, nom in enumerate(noms)}
+    lignes_equipes = []
+    for nom in noms:
+        stats = par_equipe[nom]
+        installations_mois = sum(n for jour, n in stats["jours"].items() if mois_de(jour) == mois)
+        objectif = equipes.get(nom, {}).get("capacite", CAPACITE_EQUIPE) * jours_mois
+        lignes_equipes.append((nom, stats, installations_mois, objectif))
+    lignes_equipes.sort(key=lambda ligne: (-ligne[2], -ligne[1]["installations"], ligne[0]))
+    classement = [
+        _entree_classement(nom, stats["installations"], len(stats["cles"]), installations_mois, objectif,
+                           len(stats["jours"]), stats["0f"], stats["2e"], couleurs[nom], rang)
+        for rang, (nom, stats, installations_mois, objectif) in enumerate(lignes_equipes, 1)
+    ]
+
+    total = sum(stats["installations"] for stats in par_equipe.values())
+    distincts = sum(len(stats["cles"]) for stats in par_equipe.values())
+    dates = sorted(par_jour)
+
+    def repartition(champ):
+        groupes = repartitions[champ]
+        return [_entree_repartition(valeur, n, len(cles), avec_0f, avec_2e, total)
+                for valeur, (n, cles, avec_0f, avec_2e) in sorted(groupes.items(), key=lambda g: (-g[1][0], g[0]))]
+
+    return {
+        "mois": mois,
+        "joursMois": jours_mois,
+        "equipes": classement,
+        "totaux": {
+            "installations": total,
+            "clients": distincts,
+            "teams": len(noms),
+            "partClientsUniques": _pourcent(distincts, total),
+            "installationsMois": sum(entree["installationsMois"] for entree in classement),
+            "objectifMois": sum(entree["objectif"] for entree in classement),
+            "equipesActivesMois": sum(1 for entree in classement if entree["installationsMois"]),
+            "moyenneJour": round(total / len(dates), 1) if dates else 0.0,
+            "offre0f": _pourcent(offres_0f, total),
+            "offre2eMois": _pourcent(offres_2e, total),
+        },
+        "parJour": [{"date": (origine + timedelta(days=jour)).date().isoformat(), "installations": par_jour[jour]}
+                    for jour in dates[-JOURS_SERIE_KPI:]],
+        "provenances": repartition("provenance"),
+        "forfaits": repartition("forfait"),
+    }
+
+
+def kpi_equipe(kpi, equipe):
+    """Ligne d'une équipe dans calculer_kpi (zéros si elle n'a plus d'installation)"""
+    return next((e for e in kpi["equipes"] if e["name"] == equipe),
+                {"name": equipe, "installations": 0, "clients": 0, "jours": 0})
+
+
+def _trier_dates(dates):
+    """Dates DD-MM-YYYY, de la plus récente à la plus ancienne"""
+    return sorted(dates, key=lambda d: datetime.strptime(d, "%d-%m-%Y"), reverse=True)
+
+
+def cle_carte(client):
+    """Identifiant d'une carte client sur le dashboard d'équipe (patchée en place par SSE)"""
+    return f"{cle_enregistrement(client)}|{client.get('date', '')}"
+
+
+def carte_client_equipe(client):
+    date = client["date"]
+    fichiers = fichiers_client(client)
+    return gabarit("carte_client_equipe").rendre(
+        cle=cle_carte(client),
+        page=f"dossier_{date}/{fichiers['page']}",
+        fiche=f"dossier_{date}/{fichiers['fiche']}",
+        vignette=balise_vignette(client, f"dossier_{date}/", "(max-width: 600px) 40vw, 160px"),
+        nom=client.get("nom", ""),
+        localisation=_localisation(client, " - "),
+        forfait=client.get("forfait", ""),
+        contact=client.get("contact", ""),
+        tn=client.get("tn", ""),
+        ordre=client.get("ordre") or "-",
+    )
+
+
+def create_team_dashboard(db, equipe, kpi=None):
+    """Crée le dashboard d'une équipe avec ses clients classés par dossier"""
+    par_date = {}
+    for client in clients_db(db, equipe=equipe):
+        par_date.setdefault(client["date"], []).append(client)
+    kpi = kpi or calculer_kpi(db)
+    chiffres = kpi_equipe(kpi, equipe)
+
+    section = gabarit("section_equipe")
+    sections = []
+    for date in _trier_dates(par_date):
+        cartes = [carte_client_equipe(client) for client in sorted(par_date[date], key=cle_tournee)]
+        sections.append(section.rendre(date=date, nombre=len(cartes), cartes=Brut("\n".join(cartes))))
+
+    couleurs = {e["name"]: e["color"] for e in kpi["equipes"]}
+    html = gabarit("page_equipe").rendre(
+        assets_css=Brut(balise_css()),
+        assets_js=Brut(balise_js()),
+        carte=ecrire_carte(equipe, points_gps(db, equipe), couleurs),
+        equipe=equipe,
+        installations=chiffres["installations"],
+        jours=len(par_date),
+        clients=chiffres["clients"],
+        sections=Brut("\n".join(sections)),
+    )
+
+    with open(f"dashboard_{equipe}.html", "w", encoding="utf-8") as f:
+        f.write(html)
+    console.print(f"[green]✅ Dashboard équipe créé : dashboard_{equipe}.html[/green]")
+
+
+# Pages générées dans le répertoire courant : leur état y reste aussi
+FICHIER_ETAT_DASHBOARDS = os.path.join(".cache", "dashboards.json")
+
+
+def _equipes_a_regenerer(db, equipes):
+    """Équipes dont la page doit être réécrite, et l'état à enregistrer une fois fait
+
+    Avec une BaseClients, seules les équipes des lignes modifiées depuis la
+    dernière génération (ancienne ou nouvelle équipe) sont reprises ; tout est
+    régénéré si les gabarits, les assets ou la liste des équipes (couleurs) ont changé.
+    """
+    if not isinstance(db, BaseClients):
+        return equipes, None
+    etat = {"version": VERSION_GABARITS, "assets": balise_css() + balise_js(), "equipes": equipes,
+            "sequence": db.sequence()}
+    precedent = {}
+    with suppress(OSError, ValueError):
+        with open(FICHIER_ETAT_DASHBOARDS, encoding="utf-8") as f:
+            precedent = json.load(f)
+    if any(precedent.get(champ) != etat[champ] for champ in ("version", "assets", "equipes")) \
+            or not isinstance(precedent.get("sequence"), int) or precedent["sequence"] > etat["sequence"]:
+        return equipes, etat
+    touchees = set()
+    for ligne in db.modifications(precedent["sequence"]):
+        touchees.update((ligne["equipe"], ligne["equipe_avant"]))
+    return [equipe for equipe in equipes
+            if equipe in touchees or not os.path.exists(f"dashboard_{equipe}.html")], etat
+
+
+def update_dashboards(db, chrono=None):
+    """Régénère les dashboards d'équipe, administrateur et générique
+
+    Les pages d'équipe sans ligne modifiée depuis la génération précédente sont gardées.
+    """
+    chrono = chrono or ChronoEtapes()
+    if isinstance(db, BaseClients):
+        equipes = db.equipes()
+    else:
+        equipes = sorted({c["equipe"] for c in db.get("clients", []) if c.get("equipe")})
+    # Une seule passe sur la table clients pour toutes les pages
+    with chrono.mesurer("Indicateurs"):
+        kpi = calculer_kpi(db)
+    a_regenerer, etat = _equipes_a_regenerer(db, equipes)
+    if len(a_regenerer) < len(equipes):
+        console.print(f"[dim]⏭️  {len(equipes) - len(a_regenerer)} dashboard(s) d'équipe inchangé(s)[/dim]")
+    for equipe in a_regenerer:
+        with chrono.mesurer("Dashboard équipe"):
+            create_team_dashboard(db, equipe, kpi)
+    with chrono.mesurer("Dashboard admin"):
+        create_admin_dashboard(db, kpi)
+    with chrono.mesurer("Dashboard générique"):
+        create_generic_dashboard(db, kpi)
+    if etat is not None:
+        os.makedirs(os.path.dirname(FICHIER_ETAT_DASHBOARDS), exist_ok=True)
+        with open(FICHIER_ETAT_DASHBOARDS, "w", encoding="utf-8") as f:
+            json.dump(etat, f, ensure_ascii=False)
+
+
+CHAMPS_RECHERCHE = ("nom", "tn", "sn", "quartier", "equipe", "date")
+FICHIER_CACHE_RECHERCHE = os.path.join(".cache", "recherche.json")
+# Asset d'index écrit pour une base à une séquence donnée, à côté des pages
+FICHIER_ETAT_RECHERCHE = os.path.join(".cache", "recherche-asset.json")
+
+
+def replier_accents(texte):
+    """'Haïdara ÉLODIE' -> 'haidara elodie'"""
+    decompose = unicodedata.normalize("NFKD", str(texte or ""))
+    return "".join(c for c in decompose if not unicodedata.combining(c)).lower()
+
+
+def _jetons(texte):
+    return re.findall(r"[a-z0-9]+", replier_accents(texte))
+
+
+def entree_recherche(client):
+    """(document, jetons) d'un client affecté dans l'index de recherche"""
+    date = client.get("date", "")
+    document = [client.get("nom", ""), client.get("tn", ""), client["equipe"], date,
+                f"dossier_{date}/{fichiers_client(client)['page']}"]
+    return document, sorted({j for champ in CHAMPS_RECHERCHE for j in _jetons(client.get(champ))})
+
+
+def index_recherche(clients=None, entrees=None):
+    """Index inversé : documents, jetons triés et, par jeton, numéros de documents en écarts
+
+    entrees : couples de entree_recherche déjà calculés (voir entrees_recherche_base).
+    """
+    if entrees is None:
+        entrees = (entree_recherche(client) for client in clients if client.get("equipe"))
+    documents, postings = [], {}
+    for numero, (document, jetons_document) in enumerate(entrees):
+        documents.append(document)
+        for jeton in jetons_document:
+            postings.setdefault(jeton, []).append(numero)
+    jetons = sorted(postings)
+    ecarts = [[b - a for a, b in zip([0] + postings[j], postings[j])] for j in jetons]
+    return {"documents": documents, "jetons": jetons, "postings": ecarts}
+
+
+def _purger_assets(prefixe, gardes):
+    """Supprime les anciennes versions d'un asset de données"""
+    for ancien in os.scandir(DOSSIER_ASSETS):
+        if ancien.name.startswith(prefixe) and ancien.path not in gardes:
+            os.remove(ancien.path)
+
+
+def ecrire_shards_dossiers(par_date):
+    """assets/dossiers-<AAAA-MM>.<hash>.js : résumés des dossiers, un fichier par mois
+
+    Renvoie [[mois, chemin, dossiers], ...] du mois le plus récent au plus ancien.
+    """
+    par_mois = {}
+    for date in _trier_dates(par_date):
+        par_mois.setdefault(f"{date[6:]}-{date[3:5]}", []).append({
+            "date": date,
+            "nombre": sum(par_date[date].values()),
+            "equipes": sorted(par_date[date].items()),
+        })
+    shards = []
+    for mois, dossiers in par_mois.items():
+        donnees = json.dumps(dossiers, ensure_ascii=False, separators=(",", ":"))
+        contenu = f'(window.DOSSIERS_FTTH = window.DOSSIERS_FTTH || {{}})["{mois}"] = {donnees};'
+        shards.append([mois, _ecrire_asset(f"dossiers-{mois}", "js", contenu), len(dossiers)])
+    _purger_assets("dossiers-", {chemin for _, chemin, _ in shards})
+    return shards
+
+
+def entrees_recherche_base(db):
+    """Entrées de l'index de recherche d'une BaseClients, tenues à jour dans FICHIER_CACHE_RECHERCHE
+
+    Comme pour les indicateurs, seules les lignes modifiées depuis la séquence
+    enregistrée sont relues et tokenisées ; les entrées restent dans l'ordre des
+    dossiers (jour, équipe, ordre de passage).
+    """
+    chemin = os.path.join(os.path.dirname(os.path.abspath(db.chemin)), FICHIER_CACHE_RECHERCHE)
+    sequence, cache = db.sequence(), None
+    with suppress(OSError, ValueError, KeyError, TypeError):
+        with open(chemin, encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache["sequence"] > sequence:
+            cache = None
+    cache = cache or {"sequence": -1, "entrees": {}}
+    modifications = db.modifications(cache["sequence"])
+    for ligne in modifications:
+        cle = f"{ligne['cle']}|{ligne['date']}"
+        if not ligne.get("equipe"):
+            cache["entrees"].pop(cle, None)
+            continue
+        jour = _jour_epoch(ligne["date"])
+        tri = [-1 if jour is None else jour, ligne["equipe"], ligne.get("ordre") or 0, ligne["cle"]]
+        cache["entrees"][cle] = [tri, *entree_recherche(ligne)]
+    affectees = db.connexion.execute("SELECT COUNT(*) FROM clients WHERE equipe <> ''").fetchone()[0]
+    if len(cache["entrees"]) != affectees and cache["sequence"] >= 0:
+        # Cache d'une autre base : reconstruction complète
+        os.remove(chemin)
+        return entrees_recherche_base(db)
+    if modifications:
+        cache["sequence"] = sequence
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(chemin + ".tmp", chemin)
+    return [(document, jetons) for _, document, jetons in sorted(cache["entrees"].values())]
+
+
+def ecrire_index_recherche(db):
+    """assets/recherche.<hash>.js, chargé par la page admin à la première recherche
+
+    Un script plutôt qu'un fetch JSON : les dashboards s'ouvrent aussi en file://.
+    """
+    etat = None
+    if isinstance(db, BaseClients):
+        # Aucune ligne modifiée depuis l'asset précédent : il est repris tel quel
+        etat = {"base": os.path.abspath(db.chemin), "sequence": db.sequence()}
+        with suppress(OSError, ValueError, KeyError, TypeError):
+            with open(FICHIER_ETAT_RECHERCHE, encoding="utf-8") as f:
+                precedent = json.load(f)
+            if {k: precedent[k] for k in etat} == etat and os.path.exists(precedent["asset"]):
+                return precedent["asset"]
+        index = index_recherche(entrees=entrees_recherche_base(db))
+    else:
+        index = index_recherche(clients_db(db))
+    index = json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+    chemin = _ecrire_asset("recherche", "js", f"window.INDEX_RECHERCHE_FTTH={index};")
+    _purger_assets("recherche.", {chemin})
+    if etat is not None:
+        os.makedirs(os.path.dirname(FICHIER_ETAT_RECHERCHE), exist_ok=True)
+        with open(FICHIER_ETAT_RECHERCHE, "w", encoding="utf-8") as f:
+            json.dump({**etat, "asset": chemin}, f, ensure_ascii=False)
+    return chemin
+
+
+def create_admin_dashboard(db, kpi=None):
+    """Crée le dashboard administrateur : dossiers par date et équipes"""
+    kpi = kpi or calculer_kpi(db)
+    totaux = kpi["totaux"]
+    if isinstance(db, BaseClients):
+        par_date = db.comptes_par_date()
+    else:
+        par_date = {}
+        for client in db.get("clients", []):
+            if client.get("equipe"):
+                equipes = par_date.setdefault(client["date"], {})
+                equipes[client["equipe"]] = equipes.get(client["equipe"], 0) + 1
+    dates = _trier_dates(par_date)
+    aujourd_hui = datetime.now().strftime("%d-%m-%Y")
+
+    nav = gabarit("nav_equipe_admin")
+    nav_equipes = [
+        nav.rendre(equipe=e["name"], clients=e["clients"])
+        for e in sorted(kpi["equipes"], key=lambda e: e["name"])
+    ]
+    html = gabarit("page_admin").rendre(
+        assets_css=Brut(balise_css()),
+        assets_js=Brut(balise_js()),
+        nav_equipes=Brut("\n".join(nav_equipes)),
+        derniere_date=dates[0] if dates else "-",
+        clients=totaux["clients"],
+        dossiers=len(dates),
+        installations=totaux["installations"],
+        equipes=totaux["teams"],
+        dossiers_jour=int(aujourd_hui in par_date),
+        index_recherche=ecrire_index_recherche(db),
+        carte=ecrire_carte(PORTEE_CARTE_ADMIN, points_gps(db), {e["name"]: e["color"] for e in kpi["equipes"]}),
+        shards=json.dumps(ecrire_shards_dossiers(par_date)),
+    )
+
+    with open("dashboard_admin.html", "w", encoding="utf-8") as f:
+        f.write(html)
+    console.print("[green]✅ Dashboard administrateur créé : dashboard_admin.html[/green]")
+
+
+def create_generic_dashboard(db, kpi=None):
     """Crée un dashboard générique pour toutes les équipes"""
-    html = """<!DOCTYPE html>
+    kpi = kpi or calculer_kpi(db)
+    html = gabarit("generique").rendre(
+        assets_css=Brut(balise_css()),
+        assets_js=Brut(balise_js()),
+        teams_data=Brut(_json_script(kpi["equipes"])),
+        global_stats=Brut(_json_script(kpi["totaux"])),
+        indicateurs=Brut(_json_script({cle: kpi[cle] for cle in ("mois", "joursMois", "parJour", "provenances", "forfaits")})),
+    )
+    
+    with open("dashboard.html", "w", encoding="utf-8") as f:
+        f.write(html)
+    
+    console.print("[green]✅ Dashboard générique créé : dashboard.html[/green]")
+
+# Appelle cette fonction dans update_dashboards() ou main()
+
+
+GABARIT_GENERIQUE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Dashboard FTTH - MG TELECOM</title>
+    {{ assets_css }}
+</head>
+<body class="page-generic">
+    <!-- Particle Background -->
+    <div class="particles" id="particles"></div>
+    
+    <div class="container">
+        <!-- Hero Section -->
+        <section class="hero">
+            <h1>🚀 Dashboard FTTH</h1>
+            <p>Bienvenue dans l'interface de gestion des installations fibre optique. Suivez vos performances et progressez avec votre équipe !</p>
+            
+            <div class="hero-badges">
+                <div class="hero-badge">
+                    <span>📊</span>
+                    <span>Analytique en temps réel</span>
+                </div>
+                <div class="hero-badge">
+                    <span>⚡</span>
+                    <span>Performance optimisée</span>
+                </div>
+                <div class="hero-badge">
+                    <span>🔒</span>
+                    <span>Données sécurisées</span>
+                </div>
+            </div>
+        </section>
+        
+        <!-- Quick Stats -->
+        <div class="quick-stats">
+            <div class="stat-card">
+                <div class="stat-header">
+                    <div class="stat-icon">📈</div>
+                    <div>
+                        <div class="stat-title">Installations Total</div>
+                        <div class="stat-subtitle">Depuis le début</div>
+                    </div>
+                </div>
+                <div class="stat-number" id="totalInstallations">0</div>
+                <div class="progress-bar" title="Installations du mois / objectif du mois">
+                    <div class="progress-fill" id="progressionMois" style="width: 0%"></div>
+                </div>
+            </div>
+            
+            <div class="stat-card">
+                <div class="stat-header">
+                    <div class="stat-icon">👥</div>
+                    <div>
+                        <div class="stat-title">Équipes Actives</div>
+                        <div class="stat-subtitle">Actives ce mois-ci</div>
+                    </div>
+                </div>
+                <div class="stat-number" id="activeTeams">0</div>
+                <div class="progress-bar">
+                    <div class="progress-fill" id="progressionEquipes" style="width: 0%"></div>
+                </div>
+            </div>
+            
+            <div class="stat-card">
+                <div class="stat-header">
+                    <div class="stat-icon">👥</div>
+                    <div>
+                        <div class="stat-title">Clients uniques</div>
+                        <div class="stat-subtitle">Part des installations chez un client distinct</div>
+                    </div>
+                </div>
+                <div class="stat-number" id="partClientsUniques">0%</div>
+                <div class="progress-bar">
+                    <div class="progress-fill" id="progressionClientsUniques" style="width: 0%"></div>
+                </div>
+            </div>
+        </div>
+        
+        <!-- Teams Section -->
+        <section class="teams-section">
+            <div class="section-header">
+                <div>
+                    <h2 class="section-title">🏆 Classement des Équipes</h2>
+                    <p class="section-subtitle">Performance basée sur les installations du mois</p>
+                </div>
+                <div style="color: var(--gray); font-size: 14px;">
+                    Mise à jour quotidienne
+                </div>
+            </div>
+            
+            <div class="teams-grid" id="teamsGrid">
+                <!-- Les équipes seront chargées ici par JavaScript -->
+            </div>
+        </section>
+        
+        <!-- Indicateurs -->
+        <section class="teams-section">
+            <div class="section-header">
+                <div>
+                    <h2 class="section-title">📊 Indicateurs</h2>
+                    <p class="section-subtitle" id="sousTitreIndicateurs">Forfaits, provenances et rythme d'installation</p>
+                </div>
+            </div>
+            
+            <div class="teams-grid">
+                <div class="team-card indicateur-carte">
+                    <h3>📦 Forfaits</h3>
+                    <div id="indicateursForfaits"></div>
+                </div>
+                <div class="team-card indicateur-carte">
+                    <h3>🧭 Provenances</h3>
+                    <div id="indicateursProvenances"></div>
+                </div>
+                <div class="team-card indicateur-carte">
+                    <h3>📅 Installations par jour</h3>
+                    <div class="indicateur-jours" id="indicateursJours"></div>
+                    <div class="indicateur-ligne"><span>Moyenne</span><span id="moyenneJour">0</span></div>
+                    <div class="indicateur-ligne"><span>Offre 0F</span><span id="offre0f">0%</span></div>
+                    <div class="indicateur-ligne"><span>Offre 2e mois</span><span id="offre2eMois">0%</span></div>
+                </div>
+            </div>
+        </section>
+        
+        <!-- Fun Elements -->
+        <div class="fun-section">
+            <div class="fun-card">
+                <div class="fun-icon floating">🏅</div>
+                <h3 class="fun-title">Badges de Performance</h3>
+                <p class="fun-text">Débloquez des badges en fonction de vos performances. Chaque objectif atteint vous rapproche du niveau supérieur !</p>
+                <div class="achievements">
+                    <div class="achievement-badge">
+                        <span>🥇</span>
+                        <span>Équipe du Mois</span>
+                    </div>
+                    <div class="achievement-badge">
+                        <span>⚡</span>
+                        <span>Installation Rapide</span>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="fun-card">
+                <div class="fun-icon floating">📱</div>
+                <h3 class="fun-title">Interface Mobile</h3>
+                <p class="fun-text">Accédez à vos données depuis n'importe où. L'interface s'adapte parfaitement à tous vos appareils mobiles.</p>
+                <div class="achievements">
+                    <div class="achievement-badge">
+                        <span>📲</span>
+                        <span>Mobile Optimisé</span>
+                    </div>
+                    <div class="achievement-badge">
+                        <span>🌐</span>
+                        <span>Hors Ligne</span>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="fun-card">
+                <div class="fun-icon floating">🎮</div>
+                <h3 class="fun-title">Mode Ludique</h3>
+                <p class="fun-text">Transformez votre travail en jeu ! Gagnez des points, montez de niveau et défiez les autres équipes.</p>
+                <div class="achievements">
+                    <div class="achievement-badge">
+                        <span>🎯</span>
+                        <span>Objectifs Quotidiens</span>
+                    </div>
+                    <div class="achievement-badge">
+                        <span>🏆</span>
+                        <span>Leaderboard</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+        
+        <!-- More Achievements -->
+        <div class="achievements">
+            <div class="achievement-badge">
+                <span>🌟</span>
+                <span>Nouveau Record</span>
+            </div>
+            <div class="achievement-badge">
+                <span>🚀</span>
+                <span>Performance x2</span>
+            </div>
+            <div class="achievement-badge">
+                <span>💎</span>
+                <span>Qualité Premium</span>
+            </div>
+            <div class="achievement-badge">
+                <span>🎪</span>
+                <span>Équipe Complète</span>
+            </div>
+            <div class="achievement-badge">
+                <span>🔧</span>
+                <span>Expert Technique</span>
+            </div>
+        </div>
+        
+        <!-- Footer -->
+        <footer class="footer">
+            <div class="footer-logo">MG TELECOM FTTH</div>
+            <p class="footer-text">
+                Système de gestion des installations fibre optique. Suivez vos performances, 
+                gérez vos équipes et optimisez vos opérations.
+            </p>
+            
+            <div class="social-links">
+                <a href="#" class="social-link">
+                    <span>📱</span>
+                </a>
+                <a href="#" class="social-link">
+                    <span>📧</span>
+                </a>
+                <a href="#" class="social-link">
+                    <span>📊</span>
+                </a>
+                <a href="#" class="social-link">
+                    <span>⚙️</span>
+                </a>
+            </div>
+            
+            <div style="color: var(--gray); font-size: 14px; margin-top: 30px;">
+                <p>💡 Conseil du jour : "Une bonne préparation fait 90% du travail réussi"</p>
+                <p style="margin-top: 10px; font-size: 12px;">by Nylockdev • Dernière mise à jour : <span id="currentDate">...</span></p>
+            </div>
+        </footer>
+    </div>
+    
+    <script>
+        // Indicateurs calculés côté Python (voir calculer_kpi)
+        const teamsData = {{ teams_data }};
+        const globalStats = {{ global_stats }};
+        const indicateurs = {{ indicateurs }};
+    </script>
+    {{ assets_js }}
+</body>
+</html>"""
+
+GABARIT_PAGE_EQUIPE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Dashboard Équipe {{ equipe }} - MG TELECOM</title>
+    {{ assets_css }}
+</head>
+<body class="page-equipe avec-carte" data-equipe="{{ equipe }}">
+    <div class="container">
+        <nav class="nav">
+            <div class="nav-brand">MG TELECOM FTTH</div>
+            <div class="nav-links">
+                <a href="dashboard.html" class="nav-btn nav-btn-secondary">
+                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" style="margin-right: 8px;">
+                       <path d="M3 12l2-2m0 0l7-7 7 7M5 10v10a1 1 0 001 1h3m10-11l2 2m-2-2v10a1 1 0 01-1 1h-3m-6 0a1 1 0 001-1v-4a1 1 0 011-1h2a1 1 0 011 1v4a1 1 0 001 1m-6 0h6"/>
+                    </svg>
+                    Dashboard Admin
+                </a>
+                <a href="calendar.html" class="nav-btn nav-btn-secondary">
+                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" style="margin-right: 8px;">
+                        <path d="M8 7V3m8 4V3m-9 8h10M5 21h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v12a2 2 0 002 2z"/>
+                    </svg>
+                    Calendrier
+                </a>
+            </div>
+        </nav>
+        
+        <div class="header">
+            <h1>👷 Dashboard Équipe {{ equipe }}</h1>
+            <div class="subtitle">Gestion centralisée des installations FTTH</div>
+        </div>
+        
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-icon">📊</div>
+                <div class="stat-number" data-stat="installations">{{ installations }}</div>
+                <div class="stat-label">Total Installations</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-icon">📅</div>
+                <div class="stat-number" data-stat="jours">{{ jours }}</div>
+                <div class="stat-label">Jours d'activité</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-icon">🚀</div>
+                <div class="stat-number">{{ equipe }}</div>
+                <div class="stat-label">Équipe</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-icon">📈</div>
+                <div class="stat-number" data-stat="clients">{{ clients }}</div>
+                <div class="stat-label">Clients au total</div>
+            </div>
+        </div>
+
+        <section class="carte-section">
+            <h2>🗺️ Carte des installations</h2>
+            <div class="carte" data-carte="{{ carte }}">
+                <canvas></canvas>
+                <div class="carte-zoom">
+                    <button type="button" data-zoom="1">+</button>
+                    <button type="button" data-zoom="-1">−</button>
+                </div>
+                <div class="carte-info"></div>
+            </div>
+        </section>
+
+{{ sections }}
+    </div>
+    
+    {{ assets_js }}
+</body>
+</html>"""
+
+GABARIT_SECTION_EQUIPE = """        <div class="dossier-section" data-date="{{ date }}">
+            <div class="section-header">
+                <div class="section-title">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <path d="M8 7V3m8 4V3m-9 8h10M5 21h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v12a2 2 0 002 2z"/>
+                    </svg>
+                    {{ date }}
+                </div>
+                <div class="section-count">{{ nombre }} installation(s)</div>
+            </div>
+            
+            <div class="clients-grid">
+{{ cartes }}
+            </div>
+        </div>"""
+
+GABARIT_CARTE_CLIENT_EQUIPE = """                <div class="client-card" data-cle="{{ cle }}" data-ordre="{{ ordre }}" onclick="window.location.href='{{ page }}'">
+                    <div class="client-header">
+                        <div>
+                            <div class="client-name">{{ nom }}</div>
+                            <div style="color: var(--gray); font-size: 14px;">{{ localisation }}</div>
+                        </div>
+                        <div class="client-badge">{{ forfait }}</div>
+                    </div>
+                    
+                    <a href="{{ fiche }}" class="client-vignette" onclick="event.stopPropagation()" title="Fiche complète">{{ vignette }}</a>
+                    
+                    <div class="client-info">
+                        <div class="info-row">
+                            <div class="info-label">📞 Contact:</div>
+                            <div class="info-value">{{ contact }}</div>
+                        </div>
+                        <div class="info-row">
+                            <div class="info-label">🔢 TN:</div>
+                            <div class="info-value">{{ tn }}</div>
+                        </div>
+                        <div class="info-row">
+                            <div class="info-label">🧭 Passage:</div>
+                            <div class="info-value">N°{{ ordre }}</div>
+                        </div>
+                    </div>
+                    
+                    <div class="client-actions">
+                        <a href="{{ page }}" class="action-btn action-btn-primary">Voir Fiche</a>
+                        <a href="{{ fiche }}" class="action-btn action-btn-secondary" download>Télécharger</a>
+                    </div>
+                </div>"""
+
+GABARIT_PAGE_ADMIN = """<!doctype html>
+<html lang="fr">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>dashboard admin - mg telecom ftth</title>
+    {{ assets_css }}
+</head>
+<body class="page-admin avec-carte">
+    <!-- sidebar -->
+    <aside class="sidebar">
+        <div class="sidebar-brand">mg telecom</div>
+        
+        <nav class="sidebar-nav">
+            <a href="#" class="nav-item active">
+                <svg viewbox="0 0 24 24" fill="none" stroke="currentcolor" stroke-width="2">
+                    <path d="m3 12l2-2m0 0l7-7 7 7m5 10v10a1 1 0 001 1h3m10-11l2 2m-2-2v10a1 1 0 01-1 1h-3m-6 0a1 1 0 001-1v-4a1 1 0 011-1h2a1 1 0 011 1v4a1 1 0 001 1m-6 0h6"/>
+                </svg>
+                tableau de bord
+            </a>
+            <a href="calendar.html" class="nav-item">
+                <svg viewbox="0 0 24 24" fill="none" stroke="currentcolor" stroke-width="2">
+                    <path d="m8 7v3m8 4v3m-9 8h10m5 21h14a2 2 0 002-2v7a2 2 0 00-2-2h5a2 2 0 00-2 2v12a2 2 0 002 2z"/>
+                </svg>
+                calendrier
+            </a>
+            <a href="#" class="nav-item">
+                <svg viewbox="0 0 24 24" fill="none" stroke="currentcolor" stroke-width="2">
+                    <path d="m12 4.354a4 4 0 110 5.292m15 21h3v-1a6 6 0 0112 0v1zm0 0h6v-1a6 6 0 00-9-5.197m13.5 0c-.281.023-.562.035-.844.035a13.92 13.92 0 0112 16c-2.5 0-4.847.655-6.879 1.803m13.5 0a9 9 0 018.686 5.314m21 12a9 9 0 11-18 0 9 9 0 0118 0z"/>
+                </svg>
+                équipes
+            </a>
+            <a href="#" class="nav-item">
+                <svg viewbox="0 0 24 24" fill="none" stroke="currentcolor" stroke-width="2">
+                    <path d="m9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"/>
+                </svg>
+                statistiques
+            </a>
+            <a href="#" class="nav-item">
+                <svg viewbox="0 0 24 24" fill="none" stroke="currentcolor" stroke-width="2">
+                    <path d="m10.325 4.317c.426-1.756 2.924-1.756 3.35 0a1.724 1.724 0 002.573 1.066c1.543-.94 3.31.826 2.37 2.37a1.724 1.724 0 001.065 2.572c1.756.426 1.756 2.924 0 3.35a1.724 1.724 0 00-1.066 2.573c.94 1.543-.826 3.31-2.37 2.37a1.724 1.724 0 00-2.572 1.065c-.426 1.756-2.924 1.756-3.35 0a1.724 1.724 0 00-2.573-1.066c-1.543.94-3.31-.826-2.37-2.37a1.724 1.724 0 00-1.065-2.572c-1.756-.426-1.756-2.924 0-3.35a1.724 1.724 0 001.066-2.573c-.94-1.543.826-3.31 2.37-2.37.996.608 2.296.07 2.572-1.065z"/>
+                    <path d="m15 12a3 3 0 11-6 0 3 3 0 016 0z"/>
+                </svg>
+                paramètres
+            </a>
+        </nav>
+        
+        <div class="sidebar-section">
+            <div class="section-title">équipes actives</div>
+
+{{ nav_equipes }}
+
+        </div>
+        
+        <div class="sidebar-section">
+            <div class="section-title">Dernières Actions</div>
+            <div style="color: var(--gray); font-size: 13px; padding: 0 20px;">
+                <div style="margin-bottom: 10px;">✅ Dernière mise à jour : <br><span style="color: var(--light);">Dossier du {{ derniere_date }}</span></div>
+                <div>📊 Base de données : <br><span style="color: var(--light);">{{ clients }} clients</span></div>
+            </div>
+        </div>
+    </aside>
+    
+    <!-- Main Content -->
+    <main class="main-content">
+        <!-- Top Bar -->
+        <div class="top-bar">
+            <h1>🎛️ Dashboard Administrateur</h1>
+            <div class="top-bar-actions">
+                <div class="search-box">
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <path d="M21 21l-6-6m2-5a7 7 0 11-14 0 7 7 0 0114 0z"/>
+                    </svg>
+                    <input type="text" id="searchInput" placeholder="Rechercher un client, un TN, une équipe..." data-index="{{ index_recherche }}">
+                </div>
+                <a href="#" class="action-btn" style="padding: 12px 24px;">+ Nouveau Dossier</a>
+            </div>
+        </div>
+        
+        <div class="search-results" id="searchResults"></div>
+        
+        <!-- Stats -->
+        <div class="stats-grid">
+            <div class="stat-card fade-in">
+                <div class="stat-header">
+                    <div class="stat-icon">📊</div>
+                    <div class="stat-number">{{ dossiers }}</div>
+                </div>
+                <div class="stat-label">Dossiers Actifs</div>
+            </div>
+            <div class="stat-card fade-in" style="animation-delay: 0.1s;">
+                <div class="stat-header">
+                    <div class="stat-icon">📡</div>
+                    <div class="stat-number">{{ installations }}</div>
+                </div>
+                <div class="stat-label">Installations</div>
+            </div>
+            <div class="stat-card fade-in" style="animation-delay: 0.2s;">
+                <div class="stat-header">
+                    <div class="stat-icon">👥</div>
+                    <div class="stat-number">{{ equipes }}</div>
+                </div>
+                <div class="stat-label">Équipes Actives</div>
+            </div>
+            <div class="stat-card fade-in" style="animation-delay: 0.3s;">
+                <div class="stat-header">
+                    <div class="stat-icon">📈</div>
+                    <div class="stat-number">{{ dossiers_jour }}</div>
+                </div>
+                <div class="stat-label">Dossiers Aujourd'hui</div>
+            </div>
+        </div>
+        
+        <section class="carte-section">
+            <h2>🗺️ Carte des installations</h2>
+            <div class="carte" data-carte="{{ carte }}">
+                <canvas></canvas>
+                <div class="carte-zoom">
+                    <button type="button" data-zoom="1">+</button>
+                    <button type="button" data-zoom="-1">−</button>
+                </div>
+                <div class="carte-info"></div>
+            </div>
+        </section>
+        
+        <!-- Dossiers -->
+        <h2 style="color: var(--light); margin: 40px 0 20px 0; font-size: 24px;">📂 Dossiers par Date</h2>
+        <div class="dossiers-grid" id="dossiersContainer" data-shards="{{ shards }}"></div>
+        <div class="dossiers-pagination">
+            <button type="button" class="action-btn" id="moisPrecedent">◀ Mois précédent</button>
+            <span id="moisCourant"></span>
+            <button type="button" class="action-btn" id="moisSuivant">Mois suivant ▶</button>
+        </div>
+    </main>
+    
+    <template id="modeleDossier">
+            <div class="dossier-card fade-in" data-date="">
+                <div class="dossier-header">
+                    <div class="dossier-date">
+                        <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                            <path d="M8 7V3m8 4V3m-9 8h10M5 21h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v12a2 2 0 002 2z"/>
+                        </svg>
+                        <span class="dossier-jour"></span>
+                    </div>
+                    <div class="dossier-count"></div>
+                </div>
+                
+                <div class="equipes-grid"></div>
+                
+                <div class="quick-actions">
+                    <a href="#" class="action-btn">📥 Exporter PDF</a>
+                    <a href="#" class="action-btn">📊 Voir Statistiques</a>
+                    <a href="#" class="action-btn">📋 Liste Complète</a>
+                </div>
+            </div>
+    </template>
+    
+    <template id="modeleEquipe">
+                    <div class="equipe-card">
+                        <div class="equipe-header">
+                            <div class="equipe-avatar"></div>
+                            <div>
+                                <div class="equipe-name"></div>
+                                <div class="equipe-stats"></div>
+                            </div>
+                        </div>
+                        <div class="equipe-actions">
+                            <a href="#" class="equipe-btn equipe-btn-primary">Voir Dashboard</a>
+                            <a href="#" class="equipe-btn equipe-btn-secondary">Voir Détails</a>
+                        </div>
+                    </div>
+    </template>
+    
+    {{ assets_js }}
+</body>
+</html>"""
+
+GABARIT_NAV_EQUIPE_ADMIN = """            <a href="dashboard_{{ equipe }}.html" class="nav-item">
+                <svg viewbox="0 0 24 24" fill="none" stroke="currentcolor" stroke-width="2">
+                    <path d="m17 20h5v-2a3 3 0 00-5.356-1.857m17 20h7m10 0v-2c0-.656-.126-1.283-.356-1.857m7 20h2v-2a3 3 0 015.356-1.857m7 20v-2c0-.656.126-1.283.356-1.857m0 0a5.002 5.002 0 019.288 0m15 7a3 3 0 11-6 0 3 3 0 016 0zm6 3a2 2 0 11-4 0 2 2 0 014 0zm7 10a2 2 0 11-4 0 2 2 0 014 0z"/>
+                </svg>
+                {{ equipe }} <span style="margin-left: auto; color: var(--primary);">{{ clients }}</span>
+            </a>
+"""
+
+GABARIT_PAGE_CLIENT = """<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Dashboard FTTH - MG TELECOM</title>
-    <style>
-        :root {
+    <title>Fiche Client FTTH - {{ nom }}</title>
+    {{ assets_css }}
+</head>
+<body class="page-client">
+    <div class="container">
+        <a href="../../dashboard_{{ equipe }}.html" class="back-btn">
+            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                <path d="M19 12H5M12 19l-7-7 7-7"/>
+            </svg>
+            Dashboard {{ equipe }}
+        </a>
+        
+        <div class="header">
+            <h1>📡 FICHE CLIENT FTTH</h1>
+            <div class="subtitle">Dossier du {{ date }} • Équipe {{ equipe }}</div>
+        </div>
+        
+        <div class="card">
+            <div class="info-grid">
+                <div class="info-item">
+                    <div class="info-label">Nom du client</div>
+                    <div class="info-value">{{ nom }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Contacts téléphoniques</div>
+                    <div class="info-value">{{ contacts }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Localisation</div>
+                    <div class="info-value">{{ localisation }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Provenance</div>
+                    <div class="info-value">{{ provenance }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Numéro de ticket</div>
+                    <div class="info-value">{{ ticket }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Offre souscrite</div>
+                    <div class="info-value">
+                        <span class="badge badge-success">{{ forfait }}</span>
+                    </div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Numéro TN (Identifiant)</div>
+                    <div class="info-value">{{ tn }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Équipe technique</div>
+                    <div class="info-value">
+                        <span class="badge badge-primary">{{ equipe }}</span>
+                    </div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Ordre de passage</div>
+                    <div class="info-value">N°{{ ordre }}</div>
+                </div>
+                
+                <div class="info-item">
+                    <div class="info-label">Date de transmission</div>
+                    <div class="info-value">{{ transmission }}</div>
+                </div>
+            </div>
+            
+            <div style="text-align: center; margin-top: 20px;">
+                <span class="badge badge-warning">
+                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" style="margin-right: 8px;">
+                        <path d="M12 2v4M12 18v4M4.93 4.93l2.83 2.83M16.24 16.24l2.83 2.83M2 12h4M18 12h4M4.93 19.07l2.83-2.83M16.24 7.76l2.83-2.83"/>
+                    </svg>
+                    EN COURS D'INSTALLATION
+                </span>
+            </div>
+        </div>
+        
+        <div class="qr-section fiche-section">
+            <h3 style="margin-bottom: 20px; color: var(--light);">Fiche d'installation</h3>
+            <a href="../{{ fiche }}" class="fiche-apercu">{{ vignette }}</a>
+            <p style="color: var(--gray); margin-top: 10px;">Touchez l'aperçu pour ouvrir la fiche complète (zoom, impression)</p>
+        </div>
+        
+        <div class="qr-section">
+            <h3 style="margin-bottom: 20px; color: var(--light);">QR Code d'accès</h3>
+            <img src="../{{ qr }}" alt="QR Code" loading="lazy" decoding="async">
+            <p style="color: var(--gray); margin-top: 10px;">Scannez pour accéder à cette fiche</p>
+        </div>
+        
+        <div class="footer">
+            MG TELECOM • Système de gestion FTTH<br>
+            Généré automatiquement le {{ genere_le }}
+        </div>
+    </div>
+</body>
+</html>"""
+
+SOURCES_GABARITS = {
+    "generique": GABARIT_GENERIQUE,
+    "page_equipe": GABARIT_PAGE_EQUIPE,
+    "section_equipe": GABARIT_SECTION_EQUIPE,
+    "carte_client_equipe": GABARIT_CARTE_CLIENT_EQUIPE,
+    "page_admin": GABARIT_PAGE_ADMIN,
+    "nav_equipe_admin": GABARIT_NAV_EQUIPE_ADMIN,
+    "page_client": GABARIT_PAGE_CLIENT,
+}
+
+
+CSS_GENERIQUE = """        :root {
+            --primary: #3b82f6;
+            --primary-dark: #1d4ed8;
+            --secondary: #10b981;
+            --accent: #8b5cf6;
+            --warning: #f59e0b;
+            --danger: #ef4444;
+            --dark: #0f172a;
+            --light: #f8fafc;
+            --gray: #64748b;
+            --gradient-1: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            --gradient-2: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+            --gradient-3: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+            --gradient-4: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);
+        }
+        
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        
+        body {
+            font-family: 'Inter', 'Segoe UI', system-ui, sans-serif;
+            background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
+            color: var(--light);
+            min-height: 100vh;
+            line-height: 1.6;
+            padding: 20px;
+        }
+        
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+        }
+        
+        /* Hero Section */
+        .hero {
+            text-align: center;
+            padding: 60px 20px;
+            background: var(--gradient-1);
+            border-radius: 25px;
+            margin-bottom: 40px;
+            position: relative;
+            overflow: hidden;
+            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
+        }
+        
+        .hero::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: url("data:image/svg+xml,%3Csvg width='100' height='100' viewBox='0 0 100 100' xmlns='http://www.w3.org/2000/svg'%3E%3Cpath d='M11 18c3.866 0 7-3.134 7-7s-3.134-7-7-7-7 3.134-7 7 3.134 7 7 7zm48 25c3.866 0 7-3.134 7-7s-3.134-7-7-7-7 3.134-7 7 3.134 7 7 7zm-43-7c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zm63 31c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zM34 90c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zm56-76c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zM12 86c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm28-65c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm23-11c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm-6 60c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm29 22c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zM32 63c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm57-13c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm-9-21c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM60 91c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM35 41c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM12 60c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2z' fill='%23ffffff' fill-opacity='0.1' fill-rule='evenodd'/%3E%3C/svg%3E");
+        }
+        
+        .hero h1 {
+            font-size: 48px;
+            margin-bottom: 20px;
+            position: relative;
+            z-index: 2;
+            text-shadow: 0 2px 10px rgba(0, 0, 0, 0.3);
+        }
+        
+        .hero p {
+            font-size: 20px;
+            max-width: 600px;
+            margin: 0 auto 30px;
+            position: relative;
+            z-index: 2;
+            opacity: 0.9;
+        }
+        
+        .hero-badges {
+            display: flex;
+            justify-content: center;
+            gap: 15px;
+            flex-wrap: wrap;
+            position: relative;
+            z-index: 2;
+        }
+        
+        .hero-badge {
+            background: rgba(255, 255, 255, 0.2);
+            backdrop-filter: blur(10px);
+            border: 1px solid rgba(255, 255, 255, 0.3);
+            padding: 10px 20px;
+            border-radius: 50px;
+            font-weight: 600;
+            display: flex;
+            align-items: center;
+            gap: 8px;
+        }
+        
+        /* Quick Stats */
+        .quick-stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            gap: 25px;
+            margin-bottom: 40px;
+        }
+        
+        .stat-card {
+            background: rgba(255, 255, 255, 0.05);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 30px;
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            transition: all 0.3s;
+            position: relative;
+            overflow: hidden;
+        }
+        
+        .stat-card:hover {
+            transform: translateY(-10px);
+            border-color: var(--primary);
+            box-shadow: 0 15px 40px rgba(59, 130, 246, 0.2);
+        }
+        
+        .stat-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 5px;
+            background: var(--gradient-2);
+        }
+        
+        .stat-header {
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            margin-bottom: 20px;
+        }
+        
+        .stat-icon {
+            width: 60px;
+            height: 60px;
+            background: rgba(255, 255, 255, 0.1);
+            border-radius: 15px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: 28px;
+        }
+        
+        .stat-title {
+            font-size: 20px;
+            font-weight: 600;
+            color: var(--light);
+        }
+        
+        .stat-number {
+            font-size: 52px;
+            font-weight: 800;
+            background: var(--gradient-1);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 10px;
+            line-height: 1;
+        }
+        
+        .stat-subtitle {
+            color: var(--gray);
+            font-size: 14px;
+        }
+        
+        /* Teams Grid */
+        .teams-section {
+            background: rgba(255, 255, 255, 0.05);
+            backdrop-filter: blur(10px);
+            border-radius: 25px;
+            padding: 40px;
+            margin-bottom: 40px;
+            border: 1px solid rgba(255, 255, 255, 0.1);
+        }
+        
+        .section-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 30px;
+        }
+        
+        .section-title {
+            font-size: 28px;
+            font-weight: 700;
+            background: var(--gradient-3);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        
+        .section-subtitle {
+            color: var(--gray);
+            font-size: 16px;
+        }
+        
+        .teams-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+            gap: 25px;
+        }
+        
+        .team-card {
+            background: rgba(30, 41, 59, 0.7);
+            border-radius: 20px;
+            padding: 30px;
+            border: 2px solid transparent;
+            transition: all 0.4s;
+            cursor: pointer;
+            position: relative;
+            overflow: hidden;
+        }
+        
+        .team-card:hover {
+            transform: translateY(-8px) scale(1.02);
+            border-color: var(--primary);
+            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.4);
+        }
+        
+        .team-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: linear-gradient(45deg, transparent, rgba(255, 255, 255, 0.05), transparent);
+            transform: translateX(-100%);
+        }
+        
+        .team-card:hover::before {
+            animation: shine 1s;
+        }
+        
+        @keyframes shine {
+            100% {
+                transform: translateX(100%);
+            }
+        }
+        
+        .team-header {
+            display: flex;
+            align-items: center;
+            gap: 20px;
+            margin-bottom: 25px;
+        }
+        
+        .team-avatar {
+            width: 70px;
+            height: 70px;
+            background: var(--gradient-4);
+            border-radius: 20px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: 28px;
+            font-weight: 800;
+            color: var(--dark);
+            box-shadow: 0 8px 20px rgba(16, 185, 129, 0.3);
+        }
+        
+        .team-info h3 {
+            font-size: 24px;
+            font-weight: 700;
+            margin-bottom: 5px;
+        }
+        
+        .team-info p {
+            color: var(--gray);
+            font-size: 14px;
+        }
+        
+        .team-stats {
+            display: grid;
+            grid-template-columns: repeat(2, 1fr);
+            gap: 20px;
+            margin: 25px 0;
+        }
+        
+        .team-stat {
+            text-align: center;
+        }
+        
+        .team-stat-number {
+            font-size: 32px;
+            font-weight: 800;
+            color: var(--primary);
+            margin-bottom: 5px;
+        }
+        
+        .team-stat-label {
+            font-size: 12px;
+            color: var(--gray);
+            text-transform: uppercase;
+            letter-spacing: 1px;
+        }
+        
+        .team-progress {
+            margin-top: 20px;
+        }
+        
+        .progress-bar {
+            height: 8px;
+            background: rgba(255, 255, 255, 0.1);
+            border-radius: 4px;
+            overflow: hidden;
+            margin-bottom: 10px;
+        }
+        
+        .progress-fill {
+            height: 100%;
+            background: var(--gradient-4);
+            border-radius: 4px;
+            transition: width 1s ease;
+        }
+        
+        .indicateur-carte {
+            cursor: default;
+        }
+        
+        .indicateur-carte h3 {
+            font-size: 20px;
+            margin-bottom: 15px;
+        }
+        
+        .indicateur-ligne {
+            display: flex;
+            justify-content: space-between;
+            gap: 10px;
+            font-size: 14px;
+            color: var(--gray);
+            margin: 10px 0 4px;
+        }
+        
+        .indicateur-jours {
+            display: flex;
+            align-items: flex-end;
+            gap: 2px;
+            height: 80px;
+            margin-bottom: 15px;
+        }
+        
+        .indicateur-jours div {
+            flex: 1;
+            background: var(--gradient-4);
+            border-radius: 2px 2px 0 0;
+            min-height: 2px;
+        }
+        
+        /* Fun Elements */
+        .fun-section {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            gap: 25px;
+            margin-bottom: 40px;
+        }
+        
+        .fun-card {
+            background: rgba(255, 255, 255, 0.05);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 30px;
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            text-align: center;
+            transition: all 0.3s;
+        }
+        
+        .fun-card:hover {
+            transform: translateY(-5px);
+            border-color: var(--accent);
+        }
+        
+        .fun-icon {
+            font-size: 60px;
+            margin-bottom: 20px;
+        }
+        
+        .fun-title {
+            font-size: 22px;
+            font-weight: 700;
+            margin-bottom: 15px;
+            background: var(--gradient-2);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        
+        .fun-text {
+            color: var(--gray);
+            line-height: 1.6;
+        }
+        
+        /* Achievements */
+        .achievements {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 15px;
+            justify-content: center;
+            margin: 40px 0;
+        }
+        
+        .achievement-badge {
+            background: rgba(255, 255, 255, 0.05);
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            border-radius: 50px;
+            padding: 12px 25px;
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            font-weight: 600;
+            transition: all 0.3s;
+        }
+        
+        .achievement-badge:hover {
+            background: rgba(59, 130, 246, 0.2);
+            border-color: var(--primary);
+            transform: scale(1.05);
+        }
+        
+        /* Footer */
+        .footer {
+            text-align: center;
+            padding: 40px 20px;
+            margin-top: 60px;
+            border-top: 1px solid rgba(255, 255, 255, 0.1);
+        }
+        
+        .footer-logo {
+            font-size: 32px;
+            font-weight: 800;
+            background: var(--gradient-1);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 20px;
+        }
+        
+        .footer-text {
+            color: var(--gray);
+            max-width: 600px;
+            margin: 0 auto 30px;
+        }
+        
+        .social-links {
+            display: flex;
+            justify-content: center;
+            gap: 20px;
+            margin: 30px 0;
+        }
+        
+        .social-link {
+            width: 50px;
+            height: 50px;
+            background: rgba(255, 255, 255, 0.05);
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            text-decoration: none;
+            color: var(--light);
+            font-size: 20px;
+            transition: all 0.3s;
+        }
+        
+        .social-link:hover {
+            background: var(--primary);
+            transform: translateY(-5px);
+        }
+        
+        /* Animations */
+        @keyframes float {
+            0%, 100% { transform: translateY(0); }
+            50% { transform: translateY(-10px); }
+        }
+        
+        .floating {
+            animation: float 3s ease-in-out infinite;
+        }
+        
+        /* Responsive */
+        @media (max-width: 768px) {
+            .hero h1 {
+                font-size: 32px;
+            }
+            
+            .teams-grid {
+                grid-template-columns: 1fr;
+            }
+            
+            .quick-stats {
+                grid-template-columns: 1fr;
+            }
+            
+            .section-header {
+                flex-direction: column;
+                text-align: center;
+                gap: 15px;
+            }
+        }
+        
+        /* Particle Background */
+        .particles {
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            pointer-events: none;
+            z-index: -1;
+        }
+"""
+
+CSS_EQUIPE = """        :root {
+            --primary: #3b82f6;
+            --primary-dark: #1d4ed8;
+            --secondary: #10b981;
+            --dark: #0f172a;
+            --light: #f8fafc;
+            --gray: #64748b;
+            --card-bg: rgba(255, 255, 255, 0.05);
+            --border: rgba(255, 255, 255, 0.1);
+        }
+        
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        
+        body {
+            font-family: 'Inter', system-ui, -apple-system, sans-serif;
+            background: linear-gradient(135deg, var(--dark) 0%, #1e293b 100%);
+            color: var(--light);
+            min-height: 100vh;
+            line-height: 1.6;
+        }
+        
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        
+        /* Navigation */
+        .nav {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 20px 0;
+            margin-bottom: 30px;
+            border-bottom: 1px solid var(--border);
+        }
+        
+        .nav-brand {
+            font-size: 24px;
+            font-weight: 700;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        
+        .nav-links {
+            display: flex;
+            gap: 20px;
+            align-items: center;
+        }
+        
+        .nav-btn {
+            padding: 10px 20px;
+            border-radius: 10px;
+            text-decoration: none;
+            font-weight: 600;
+            transition: all 0.3s;
+        }
+        
+        .nav-btn-primary {
+            background: var(--primary);
+            color: white;
+        }
+        
+        .nav-btn-secondary {
+            background: transparent;
+            border: 1px solid var(--border);
+            color: var(--light);
+        }
+        
+        .nav-btn:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 4px 15px rgba(59, 130, 246, 0.3);
+        }
+        
+        /* Header */
+        .header {
+            text-align: center;
+            padding: 40px;
+            margin-bottom: 40px;
+            background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(16, 185, 129, 0.1) 100%);
+            border-radius: 24px;
+            border: 1px solid var(--border);
+            backdrop-filter: blur(10px);
+        }
+        
+        .header h1 {
+            font-size: 36px;
+            margin-bottom: 10px;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        
+        .header .subtitle {
+            color: var(--gray);
+            font-size: 18px;
+        }
+        
+        /* Stats */
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 40px;
+        }
+        
+        .stat-card {
+            background: var(--card-bg);
+            backdrop-filter: blur(10px);
+            border-radius: 16px;
+            padding: 25px;
+            border: 1px solid var(--border);
+            text-align: center;
+            transition: transform 0.3s;
+        }
+        
+        .stat-card:hover {
+            transform: translateY(-5px);
+            border-color: var(--primary);
+        }
+        
+        .stat-icon {
+            font-size: 40px;
+            margin-bottom: 15px;
+        }
+        
+        .stat-number {
+            font-size: 42px;
+            font-weight: 700;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 5px;
+        }
+        
+        .stat-label {
+            color: var(--gray);
+            font-size: 14px;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+        }
+        
+        /* Dossiers */
+        .dossiers-grid {
+            display: grid;
+            gap: 25px;
+        }
+        
+        .dossier-section {
+            background: var(--card-bg);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 30px;
+            border: 1px solid var(--border);
+            margin-bottom: 30px;
+        }
+        
+        .section-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 25px;
+            padding-bottom: 15px;
+            border-bottom: 2px solid var(--border);
+        }
+        
+        .section-title {
+            font-size: 24px;
+            font-weight: 600;
+            color: var(--light);
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }
+        
+        .section-count {
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
+            color: white;
+            padding: 8px 16px;
+            border-radius: 20px;
+            font-weight: 600;
+            font-size: 14px;
+        }
+        
+        /* Clients Grid */
+        .clients-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+            gap: 20px;
+        }
+        
+        .client-card {
+            background: rgba(30, 41, 59, 0.5);
+            border-radius: 16px;
+            padding: 25px;
+            border: 1px solid transparent;
+            transition: all 0.3s;
+            cursor: pointer;
+        }
+        
+        .client-card:hover {
+            border-color: var(--primary);
+            transform: translateY(-5px);
+            box-shadow: 0 10px 30px rgba(0, 0, 0, 0.3);
+        }
+        
+        .client-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: flex-start;
+            margin-bottom: 20px;
+        }
+        
+        .client-name {
+            font-size: 18px;
+            font-weight: 600;
+            color: var(--light);
+            margin-bottom: 5px;
+        }
+        
+        .client-badge {
+            background: linear-gradient(135deg, var(--secondary) 0%, #059669 100%);
+            color: white;
+            padding: 6px 12px;
+            border-radius: 12px;
+            font-size: 12px;
+            font-weight: 600;
+        }
+        
+        .client-info {
+            margin: 15px 0;
+        }
+        
+        .info-row {
+            display: flex;
+            margin: 8px 0;
+        }
+        
+        .info-label {
+            color: var(--gray);
+            font-size: 13px;
+            min-width: 120px;
+            font-weight: 500;
+        }
+        
+        .info-value {
+            color: var(--light);
+            font-size: 14px;
+            flex: 1;
+        }
+        
+        .client-actions {
+            display: flex;
+            gap: 10px;
+            margin-top: 20px;
+            padding-top: 20px;
+            border-top: 1px solid var(--border);
+        }
+        
+        .client-vignette {
+            display: block;
+            margin-bottom: 15px;
+        }
+        
+        .client-vignette img {
+            display: block;
+            width: 160px;
+            max-width: 40%;
+            height: auto;
+            border-radius: 8px;
+            background: white;
+        }
+        
+        .action-btn {
+            flex: 1;
+            padding: 12px;
+            border-radius: 10px;
+            text-align: center;
+            text-decoration: none;
+            font-weight: 600;
+            font-size: 14px;
+            transition: all 0.3s;
+        }
+        
+        .action-btn-primary {
+            background: var(--primary);
+            color: white;
+        }
+        
+        .action-btn-secondary {
+            background: transparent;
+            border: 1px solid var(--border);
+            color: var(--light);
+        }
+        
+        .action-btn:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 4px 15px rgba(59, 130, 246, 0.3);
+        }
+        
+        /* Empty State */
+        .empty-state {
+            text-align: center;
+            padding: 60px 20px;
+            color: var(--gray);
+        }
+        
+        .empty-icon {
+            font-size: 60px;
+            margin-bottom: 20px;
+            opacity: 0.5;
+        }
+        
+        /* Responsive */
+        @media (max-width: 768px) {
+            .container {
+                padding: 10px;
+            }
+            
+            .nav {
+                flex-direction: column;
+                gap: 15px;
+                text-align: center;
+            }
+            
+            .nav-links {
+                flex-wrap: wrap;
+                justify-content: center;
+            }
+            
+            .header {
+                padding: 30px 20px;
+            }
+            
+            .header h1 {
+                font-size: 28px;
+            }
+            
+            .clients-grid {
+                grid-template-columns: 1fr;
+            }
+            
+            .client-card {
+                padding: 20px;
+            }
+        }
+"""
+
+CSS_ADMIN = """        :root {
             --primary: #3b82f6;
             --primary-dark: #1d4ed8;
             --secondary: #10b981;
             --accent: #8b5cf6;
-            --warning: #f59e0b;
-            --danger: #ef4444;
             --dark: #0f172a;
+            --darker: #020617;
             --light: #f8fafc;
             --gray: #64748b;
-            --gradient-1: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            --gradient-2: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            --gradient-3: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-            --gradient-4: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);
+            --card-bg: rgba(255, 255, 255, 0.03);
+            --border: rgba(255, 255, 255, 0.1);
+            --sidebar-width: 280px;
         }
         
         * {
@@ -30,118 +4922,208 @@ def create_generic_dashboard(db):
         }
         
         body {
-            font-family: 'Inter', 'Segoe UI', system-ui, sans-serif;
-            background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
+            font-family: 'inter', system-ui, -apple-system, sans-serif;
+            background: var(--darker);
             color: var(--light);
             min-height: 100vh;
             line-height: 1.6;
-            padding: 20px;
+            display: flex;
         }
         
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
+        /* sidebar */
+        .sidebar {
+            width: var(--sidebar-width);
+            background: linear-gradient(180deg, rgba(15, 23, 42, 0.95) 0%, rgba(2, 6, 23, 0.95) 100%);
+            border-right: 1px solid var(--border);
+            padding: 30px 20px;
+            position: fixed;
+            height: 100vh;
+            overflow-y: auto;
+            backdrop-filter: blur(10px);
         }
         
-        /* Hero Section */
-        .hero {
-            text-align: center;
-            padding: 60px 20px;
-            background: var(--gradient-1);
-            border-radius: 25px;
+        .sidebar-brand {
+            font-size: 24px;
+            font-weight: 700;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--accent) 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
             margin-bottom: 40px;
-            position: relative;
-            overflow: hidden;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
+            padding-left: 10px;
         }
         
-        .hero::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: url("data:image/svg+xml,%3Csvg width='100' height='100' viewBox='0 0 100 100' xmlns='http://www.w3.org/2000/svg'%3E%3Cpath d='M11 18c3.866 0 7-3.134 7-7s-3.134-7-7-7-7 3.134-7 7 3.134 7 7 7zm48 25c3.866 0 7-3.134 7-7s-3.134-7-7-7-7 3.134-7 7 3.134 7 7 7zm-43-7c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zm63 31c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zM34 90c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zm56-76c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zM12 86c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm28-65c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm23-11c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm-6 60c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm29 22c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zM32 63c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm57-13c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm-9-21c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM60 91c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM35 41c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM12 60c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2z' fill='%23ffffff' fill-opacity='0.1' fill-rule='evenodd'/%3E%3C/svg%3E");
+        .sidebar-nav {
+            display: flex;
+            flex-direction: column;
+            gap: 10px;
         }
         
-        .hero h1 {
-            font-size: 48px;
-            margin-bottom: 20px;
-            position: relative;
-            z-index: 2;
-            text-shadow: 0 2px 10px rgba(0, 0, 0, 0.3);
+        .nav-item {
+            padding: 15px 20px;
+            border-radius: 12px;
+            text-decoration: none;
+            color: var(--gray);
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            transition: all 0.3s;
+            font-weight: 500;
         }
         
-        .hero p {
-            font-size: 20px;
-            max-width: 600px;
-            margin: 0 auto 30px;
-            position: relative;
-            z-index: 2;
-            opacity: 0.9;
+        .nav-item:hover, .nav-item.active {
+            background: rgba(59, 130, 246, 0.1);
+            color: var(--light);
+            border-left: 4px solid var(--primary);
         }
         
-        .hero-badges {
+        .nav-item svg {
+            width: 20px;
+            height: 20px;
+        }
+        
+        .sidebar-section {
+            margin: 30px 0;
+            padding-top: 20px;
+            border-top: 1px solid var(--border);
+        }
+        
+        .section-title {
+            color: var(--gray);
+            font-size: 12px;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+            margin-bottom: 15px;
+            padding-left: 20px;
+        }
+        
+        /* main content */
+        .main-content {
+            flex: 1;
+            margin-left: var(--sidebar-width);
+            padding: 30px;
+            max-width: calc(100vw - var(--sidebar-width));
+        }
+        
+        /* top bar */
+        .top-bar {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 40px;
+            padding: 20px;
+            background: var(--card-bg);
+            border-radius: 16px;
+            border: 1px solid var(--border);
+            backdrop-filter: blur(10px);
+        }
+        
+        .top-bar h1 {
+            font-size: 28px;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+        }
+        
+        .top-bar-actions {
             display: flex;
-            justify-content: center;
             gap: 15px;
-            flex-wrap: wrap;
+            align-items: center;
+        }
+        
+        .search-box {
             position: relative;
-            z-index: 2;
         }
         
-        .hero-badge {
-            background: rgba(255, 255, 255, 0.2);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            padding: 10px 20px;
-            border-radius: 50px;
-            font-weight: 600;
+        .search-box input {
+            background: rgba(30, 41, 59, 0.5);
+            border: 1px solid var(--border);
+            border-radius: 10px;
+            padding: 12px 20px 12px 45px;
+            color: var(--light);
+            font-size: 14px;
+            width: 300px;
+            transition: all 0.3s;
+        }
+        
+        .search-box input:focus {
+            outline: none;
+            border-color: var(--primary);
+            box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1);
+        }
+        
+        .search-box svg {
+            position: absolute;
+            left: 15px;
+            top: 50%;
+            transform: translatey(-50%);
+            color: var(--gray);
+            width: 20px;
+            height: 20px;
+        }
+        
+        .search-results {
+            display: grid;
+            gap: 10px;
+            margin-bottom: 30px;
+        }
+        
+        .search-results:empty {
+            display: none;
+        }
+        
+        .search-count {
+            color: var(--gray);
+            font-size: 13px;
+        }
+        
+        .search-result {
             display: flex;
-            align-items: center;
-            gap: 8px;
+            justify-content: space-between;
+            gap: 15px;
+            padding: 14px 20px;
+            background: rgba(30, 41, 59, 0.5);
+            border: 1px solid var(--border);
+            border-radius: 10px;
+            color: var(--light);
+            text-decoration: none;
         }
         
-        /* Quick Stats */
-        .quick-stats {
+        .search-result:hover {
+            border-color: var(--primary);
+        }
+        
+        .search-result span {
+            color: var(--gray);
+            font-size: 13px;
+        }
+        
+        /* stats */
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 25px;
+            gap: 20px;
             margin-bottom: 40px;
         }
         
         .stat-card {
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
+            background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(139, 92, 246, 0.1) 100%);
             border-radius: 20px;
             padding: 30px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
+            border: 1px solid var(--border);
+            backdrop-filter: blur(10px);
             transition: all 0.3s;
-            position: relative;
-            overflow: hidden;
         }
         
         .stat-card:hover {
-            transform: translateY(-10px);
+            transform: translatey(-5px);
             border-color: var(--primary);
-            box-shadow: 0 15px 40px rgba(59, 130, 246, 0.2);
-        }
-        
-        .stat-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 5px;
-            background: var(--gradient-2);
+            box-shadow: 0 10px 40px rgba(59, 130, 246, 0.2);
         }
         
         .stat-header {
             display: flex;
+            justify-content: space-between;
             align-items: center;
-            gap: 15px;
             margin-bottom: 20px;
         }
         
@@ -149,549 +5131,466 @@ def create_generic_dashboard(db):
             width: 60px;
             height: 60px;
             background: rgba(255, 255, 255, 0.1);
-            border-radius: 15px;
+            border-radius: 12px;
             display: flex;
             align-items: center;
             justify-content: center;
             font-size: 28px;
         }
         
-        .stat-title {
-            font-size: 20px;
-            font-weight: 600;
-            color: var(--light);
-        }
-        
         .stat-number {
-            font-size: 52px;
-            font-weight: 800;
-            background: var(--gradient-1);
+            font-size: 42px;
+            font-weight: 700;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
-            margin-bottom: 10px;
-            line-height: 1;
         }
         
-        .stat-subtitle {
+        .stat-label {
             color: var(--gray);
             font-size: 14px;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+            margin-top: 10px;
         }
         
-        /* Teams Grid */
-        .teams-section {
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            border-radius: 25px;
-            padding: 40px;
+        /* dossiers grid */
+        .dossiers-grid {
+            display: grid;
+            gap: 25px;
             margin-bottom: 40px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
         }
         
-        .section-header {
+        .dossier-card {
+            background: var(--card-bg);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 30px;
+            border: 1px solid var(--border);
+            transition: all 0.3s;
+            content-visibility: auto;
+            contain-intrinsic-size: auto 420px;
+        }
+        
+        .dossiers-pagination {
             display: flex;
-            justify-content: space-between;
+            justify-content: center;
             align-items: center;
-            margin-bottom: 30px;
+            gap: 20px;
+            margin-bottom: 40px;
+            color: var(--light);
+            text-transform: capitalize;
         }
         
-        .section-title {
-            font-size: 28px;
-            font-weight: 700;
-            background: var(--gradient-3);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
+        .dossiers-pagination .action-btn:disabled {
+            opacity: 0.4;
+            cursor: default;
         }
         
-        .section-subtitle {
-            color: var(--gray);
-            font-size: 16px;
+        .dossier-card:hover {
+            border-color: var(--primary);
+            transform: translatey(-5px);
+            box-shadow: 0 15px 50px rgba(0, 0, 0, 0.3);
         }
         
-        .teams-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 25px;
+        .dossier-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 25px;
+            padding-bottom: 20px;
+            border-bottom: 2px solid var(--border);
+        }
+        
+        .dossier-date {
+            font-size: 22px;
+            font-weight: 600;
+            color: var(--light);
+            display: flex;
+            align-items: center;
+            gap: 10px;
         }
         
-        .team-card {
-            background: rgba(30, 41, 59, 0.7);
+        .dossier-count {
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
+            color: white;
+            padding: 8px 20px;
             border-radius: 20px;
-            padding: 30px;
-            border: 2px solid transparent;
-            transition: all 0.4s;
-            cursor: pointer;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .team-card:hover {
-            transform: translateY(-8px) scale(1.02);
-            border-color: var(--primary);
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.4);
+            font-weight: 600;
+            font-size: 14px;
         }
         
-        .team-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: linear-gradient(45deg, transparent, rgba(255, 255, 255, 0.05), transparent);
-            transform: translateX(-100%);
+        /* équipes grid */
+        .equipes-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+            gap: 20px;
+            margin-top: 20px;
         }
         
-        .team-card:hover::before {
-            animation: shine 1s;
+        .equipe-card {
+            background: rgba(30, 41, 59, 0.5);
+            border-radius: 16px;
+            padding: 25px;
+            border: 1px solid transparent;
+            transition: all 0.3s;
+            cursor: pointer;
         }
         
-        @keyframes shine {
-            100% {
-                transform: translateX(100%);
-            }
+        .equipe-card:hover {
+            border-color: var(--primary);
+            transform: translatey(-5px);
+            background: rgba(59, 130, 246, 0.1);
         }
         
-        .team-header {
+        .equipe-header {
             display: flex;
             align-items: center;
-            gap: 20px;
-            margin-bottom: 25px;
+            gap: 15px;
+            margin-bottom: 15px;
         }
         
-        .team-avatar {
-            width: 70px;
-            height: 70px;
-            background: var(--gradient-4);
-            border-radius: 20px;
+        .equipe-avatar {
+            width: 50px;
+            height: 50px;
+            background: linear-gradient(135deg, var(--primary) 0%, var(--accent) 100%);
+            border-radius: 12px;
             display: flex;
             align-items: center;
             justify-content: center;
-            font-size: 28px;
-            font-weight: 800;
-            color: var(--dark);
-            box-shadow: 0 8px 20px rgba(16, 185, 129, 0.3);
+            font-weight: 700;
+            font-size: 20px;
+            color: white;
         }
         
-        .team-info h3 {
-            font-size: 24px;
-            font-weight: 700;
-            margin-bottom: 5px;
+        .equipe-name {
+            font-size: 18px;
+            font-weight: 600;
+            color: var(--light);
         }
         
-        .team-info p {
+        .equipe-stats {
             color: var(--gray);
             font-size: 14px;
+            margin-bottom: 20px;
         }
         
-        .team-stats {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin: 25px 0;
+        .equipe-actions {
+            display: flex;
+            gap: 10px;
         }
         
-        .team-stat {
+        .equipe-btn {
+            flex: 1;
+            padding: 10px;
+            border-radius: 10px;
             text-align: center;
+            text-decoration: none;
+            font-weight: 600;
+            font-size: 13px;
+            transition: all 0.3s;
         }
         
-        .team-stat-number {
-            font-size: 32px;
-            font-weight: 800;
-            color: var(--primary);
-            margin-bottom: 5px;
+        .equipe-btn-primary {
+            background: var(--primary);
+            color: white;
         }
         
-        .team-stat-label {
-            font-size: 12px;
-            color: var(--gray);
-            text-transform: uppercase;
-            letter-spacing: 1px;
+        .equipe-btn-secondary {
+            background: transparent;
+            border: 1px solid var(--border);
+            color: var(--light);
         }
         
-        .team-progress {
-            margin-top: 20px;
+        .equipe-btn:hover {
+            transform: translatey(-2px);
+            box-shadow: 0 4px 15px rgba(59, 130, 246, 0.3);
         }
         
-        .progress-bar {
-            height: 8px;
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 4px;
-            overflow: hidden;
-            margin-bottom: 10px;
+        /* quick actions */
+        .quick-actions {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 15px;
+            margin-top: 30px;
         }
         
-        .progress-fill {
-            height: 100%;
-            background: var(--gradient-4);
-            border-radius: 4px;
-            transition: width 1s ease;
+        .action-btn {
+            background: rgba(59, 130, 246, 0.1);
+            border: 1px solid var(--border);
+            border-radius: 12px;
+            padding: 20px;
+            text-align: center;
+            text-decoration: none;
+            color: var(--light);
+            transition: all 0.3s;
         }
         
-        /* Fun Elements */
-        .fun-section {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 25px;
-            margin-bottom: 40px;
+        .action-btn:hover {
+            background: rgba(59, 130, 246, 0.2);
+            border-color: var(--primary);
+            transform: translatey(-3px);
         }
         
-        .fun-card {
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 30px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            text-align: center;
-            transition: all 0.3s;
+        /* responsive */
+        @media (max-width: 1024px) {
+            .sidebar {
+                width: 250px;
+            }
+            
+            .main-content {
+                margin-left: 250px;
+            }
         }
         
-        .fun-card:hover {
-            transform: translateY(-5px);
-            border-color: var(--accent);
+        @media (max-width: 768px) {
+            body {
+                flex-direction: column;
+            }
+            
+            .sidebar {
+                position: static;
+                width: 100%;
+                height: auto;
+            }
+            
+            .main-content {
+                margin-left: 0;
+                max-width: 100%;
+                padding: 20px;
+            }
+            
+            .top-bar {
+                flex-direction: column;
+                gap: 20px;
+                text-align: center;
+            }
+            
+            .search-box input {
+                width: 100%;
+            }
+            
+            .stats-grid {
+                grid-template-columns: 1fr;
+            }
+            
+            .equipes-grid {
+                grid-template-columns: 1fr;
+            }
         }
         
-        .fun-icon {
-            font-size: 60px;
-            margin-bottom: 20px;
+        /* animations */
+        @keyframes fadein {
+            from { opacity: 0; transform: translatey(20px); }
+            to { opacity: 1; transform: translatey(0); }
         }
         
-        .fun-title {
-            font-size: 22px;
-            font-weight: 700;
-            margin-bottom: 15px;
-            background: var(--gradient-2);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
+        .fade-in {
+            animation: fadein 0.5s ease forwards;
+        }
+"""
+
+CSS_CLIENT = """        :root {
+            --primary: #3b82f6;
+            --primary-dark: #1d4ed8;
+            --secondary: #10b981;
+            --dark: #0f172a;
+            --light: #f8fafc;
+            --gray: #64748b;
+            --card-bg: rgba(255, 255, 255, 0.05);
+            --border: rgba(255, 255, 255, 0.1);
         }
         
-        .fun-text {
-            color: var(--gray);
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        
+        body {
+            font-family: 'Inter', system-ui, -apple-system, sans-serif;
+            background: linear-gradient(135deg, var(--dark) 0%, #1e293b 100%);
+            color: var(--light);
+            min-height: 100vh;
+            padding: 20px;
             line-height: 1.6;
         }
         
-        /* Achievements */
-        .achievements {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 15px;
-            justify-content: center;
-            margin: 40px 0;
+        .container {
+            max-width: 800px;
+            margin: 0 auto;
+            position: relative;
         }
         
-        .achievement-badge {
-            background: rgba(255, 255, 255, 0.05);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 50px;
-            padding: 12px 25px;
+        .back-btn {
+            position: fixed;
+            top: 20px;
+            left: 20px;
+            background: var(--primary);
+            color: white;
+            padding: 12px 24px;
+            border-radius: 12px;
+            text-decoration: none;
+            font-weight: 600;
             display: flex;
             align-items: center;
-            gap: 10px;
-            font-weight: 600;
+            gap: 8px;
+            box-shadow: 0 4px 15px rgba(59, 130, 246, 0.3);
+            z-index: 1000;
             transition: all 0.3s;
         }
         
-        .achievement-badge:hover {
-            background: rgba(59, 130, 246, 0.2);
-            border-color: var(--primary);
-            transform: scale(1.05);
+        .back-btn:hover {
+            background: var(--primary-dark);
+            transform: translateY(-2px);
+            box-shadow: 0 6px 20px rgba(59, 130, 246, 0.4);
         }
         
-        /* Footer */
-        .footer {
+        .header {
             text-align: center;
             padding: 40px 20px;
-            margin-top: 60px;
-            border-top: 1px solid rgba(255, 255, 255, 0.1);
+            margin-bottom: 30px;
+            background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(16, 185, 129, 0.1) 100%);
+            border-radius: 24px;
+            border: 1px solid var(--border);
+            backdrop-filter: blur(10px);
         }
         
-        .footer-logo {
+        .header h1 {
             font-size: 32px;
-            font-weight: 800;
-            background: var(--gradient-1);
+            background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
-            margin-bottom: 20px;
+            margin-bottom: 10px;
         }
         
-        .footer-text {
+        .header .subtitle {
             color: var(--gray);
-            max-width: 600px;
-            margin: 0 auto 30px;
+            font-size: 16px;
         }
         
-        .social-links {
-            display: flex;
-            justify-content: center;
-            gap: 20px;
-            margin: 30px 0;
+        .card {
+            background: var(--card-bg);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 32px;
+            border: 1px solid var(--border);
+            margin-bottom: 24px;
+            transition: transform 0.3s;
+        }
+        
+        .card:hover {
+            transform: translateY(-5px);
+        }
+        
+        .info-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            gap: 24px;
+            margin-bottom: 32px;
+        }
+        
+        .info-item {
+            background: rgba(30, 41, 59, 0.5);
+            padding: 20px;
+            border-radius: 16px;
+            border-left: 4px solid var(--primary);
+        }
+        
+        .info-label {
+            font-size: 12px;
+            color: var(--gray);
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-bottom: 8px;
+            font-weight: 600;
+        }
+        
+        .info-value {
+            font-size: 18px;
+            color: var(--light);
+            font-weight: 500;
+        }
+        
+        .badge {
+            display: inline-flex;
+            align-items: center;
+            padding: 8px 16px;
+            border-radius: 20px;
+            font-weight: 600;
+            font-size: 14px;
+            margin: 4px;
+        }
+        
+        .badge-primary {
+            background: linear-gradient(135deg, var(--primary) 0%, #6366f1 100%);
+            color: white;
+        }
+        
+        .badge-success {
+            background: linear-gradient(135deg, var(--secondary) 0%, #059669 100%);
+            color: white;
         }
         
-        .social-link {
-            width: 50px;
-            height: 50px;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            text-decoration: none;
-            color: var(--light);
-            font-size: 20px;
-            transition: all 0.3s;
+        .badge-warning {
+            background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
+            color: white;
         }
         
-        .social-link:hover {
-            background: var(--primary);
-            transform: translateY(-5px);
+        .qr-section {
+            text-align: center;
+            padding: 30px;
+            background: rgba(30, 41, 59, 0.5);
+            border-radius: 20px;
+            margin-top: 30px;
         }
         
-        /* Animations */
-        @keyframes float {
-            0%, 100% { transform: translateY(0); }
-            50% { transform: translateY(-10px); }
+        .qr-section img {
+            max-width: 200px;
+            margin: 0 auto 20px;
+            display: block;
+            border-radius: 12px;
+            padding: 10px;
+            background: white;
         }
         
-        .floating {
-            animation: float 3s ease-in-out infinite;
+        .fiche-apercu img {
+            max-width: min(480px, 100%);
+            height: auto;
+            padding: 0;
+        }
+        
+        .footer {
+            text-align: center;
+            padding: 20px;
+            color: var(--gray);
+            font-size: 14px;
+            border-top: 1px solid var(--border);
+            margin-top: 40px;
         }
         
-        /* Responsive */
         @media (max-width: 768px) {
-            .hero h1 {
-                font-size: 32px;
+            .container {
+                padding: 10px;
             }
             
-            .teams-grid {
-                grid-template-columns: 1fr;
+            .header h1 {
+                font-size: 24px;
             }
             
-            .quick-stats {
+            .info-grid {
                 grid-template-columns: 1fr;
             }
             
-            .section-header {
-                flex-direction: column;
-                text-align: center;
-                gap: 15px;
+            .back-btn {
+                position: static;
+                margin-bottom: 20px;
+                display: inline-block;
             }
         }
-        
-        /* Particle Background */
-        .particles {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            pointer-events: none;
-            z-index: -1;
-        }
-    </style>
-</head>
-<body>
-    <!-- Particle Background -->
-    <div class="particles" id="particles"></div>
-    
-    <div class="container">
-        <!-- Hero Section -->
-        <section class="hero">
-            <h1>🚀 Dashboard FTTH</h1>
-            <p>Bienvenue dans l'interface de gestion des installations fibre optique. Suivez vos performances et progressez avec votre équipe !</p>
-            
-            <div class="hero-badges">
-                <div class="hero-badge">
-                    <span>📊</span>
-                    <span>Analytique en temps réel</span>
-                </div>
-                <div class="hero-badge">
-                    <span>⚡</span>
-                    <span>Performance optimisée</span>
-                </div>
-                <div class="hero-badge">
-                    <span>🔒</span>
-                    <span>Données sécurisées</span>
-                </div>
-            </div>
-        </section>
-        
-        <!-- Quick Stats -->
-        <div class="quick-stats">
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-icon">📈</div>
-                    <div>
-                        <div class="stat-title">Installations Total</div>
-                        <div class="stat-subtitle">Depuis le début</div>
-                    </div>
-                </div>
-                <div class="stat-number" id="totalInstallations">0</div>
-                <div class="progress-bar">
-                    <div class="progress-fill" style="width: 85%"></div>
-                </div>
-            </div>
-            
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-icon">👥</div>
-                    <div>
-                        <div class="stat-title">Équipes Actives</div>
-                        <div class="stat-subtitle">En service aujourd'hui</div>
-                    </div>
-                </div>
-                <div class="stat-number" id="activeTeams">0</div>
-                <div class="progress-bar">
-                    <div class="progress-fill" style="width: 70%"></div>
-                </div>
-            </div>
-            
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-icon">🎯</div>
-                    <div>
-                        <div class="stat-title">Taux de Réussite</div>
-                        <div class="stat-subtitle">Installations réussies</div>
-                    </div>
-                </div>
-                <div class="stat-number" id="successRate">0%</div>
-                <div class="progress-bar">
-                    <div class="progress-fill" style="width: 92%"></div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Teams Section -->
-        <section class="teams-section">
-            <div class="section-header">
-                <div>
-                    <h2 class="section-title">🏆 Classement des Équipes</h2>
-                    <p class="section-subtitle">Performance basée sur les installations du mois</p>
-                </div>
-                <div style="color: var(--gray); font-size: 14px;">
-                    Mise à jour quotidienne
-                </div>
-            </div>
-            
-            <div class="teams-grid" id="teamsGrid">
-                <!-- Les équipes seront chargées ici par JavaScript -->
-            </div>
-        </section>
-        
-        <!-- Fun Elements -->
-        <div class="fun-section">
-            <div class="fun-card">
-                <div class="fun-icon floating">🏅</div>
-                <h3 class="fun-title">Badges de Performance</h3>
-                <p class="fun-text">Débloquez des badges en fonction de vos performances. Chaque objectif atteint vous rapproche du niveau supérieur !</p>
-                <div class="achievements">
-                    <div class="achievement-badge">
-                        <span>🥇</span>
-                        <span>Équipe du Mois</span>
-                    </div>
-                    <div class="achievement-badge">
-                        <span>⚡</span>
-                        <span>Installation Rapide</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="fun-card">
-                <div class="fun-icon floating">📱</div>
-                <h3 class="fun-title">Interface Mobile</h3>
-                <p class="fun-text">Accédez à vos données depuis n'importe où. L'interface s'adapte parfaitement à tous vos appareils mobiles.</p>
-                <div class="achievements">
-                    <div class="achievement-badge">
-                        <span>📲</span>
-                        <span>Mobile Optimisé</span>
-                    </div>
-                    <div class="achievement-badge">
-                        <span>🌐</span>
-                        <span>Hors Ligne</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="fun-card">
-                <div class="fun-icon floating">🎮</div>
-                <h3 class="fun-title">Mode Ludique</h3>
-                <p class="fun-text">Transformez votre travail en jeu ! Gagnez des points, montez de niveau et défiez les autres équipes.</p>
-                <div class="achievements">
-                    <div class="achievement-badge">
-                        <span>🎯</span>
-                        <span>Objectifs Quotidiens</span>
-                    </div>
-                    <div class="achievement-badge">
-                        <span>🏆</span>
-                        <span>Leaderboard</span>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- More Achievements -->
-        <div class="achievements">
-            <div class="achievement-badge">
-                <span>🌟</span>
-                <span>Nouveau Record</span>
-            </div>
-            <div class="achievement-badge">
-                <span>🚀</span>
-                <span>Performance x2</span>
-            </div>
-            <div class="achievement-badge">
-                <span>💎</span>
-                <span>Qualité Premium</span>
-            </div>
-            <div class="achievement-badge">
-                <span>🎪</span>
-                <span>Équipe Complète</span>
-            </div>
-            <div class="achievement-badge">
-                <span>🔧</span>
-                <span>Expert Technique</span>
-            </div>
-        </div>
-        
-        <!-- Footer -->
-        <footer class="footer">
-            <div class="footer-logo">MG TELECOM FTTH</div>
-            <p class="footer-text">
-                Système de gestion des installations fibre optique. Suivez vos performances, 
-                gérez vos équipes et optimisez vos opérations.
-            </p>
-            
-            <div class="social-links">
-                <a href="#" class="social-link">
-                    <span>📱</span>
-                </a>
-                <a href="#" class="social-link">
-                    <span>📧</span>
-                </a>
-                <a href="#" class="social-link">
-                    <span>📊</span>
-                </a>
-                <a href="#" class="social-link">
-                    <span>⚙️</span>
-                </a>
-            </div>
-            
-            <div style="color: var(--gray); font-size: 14px; margin-top: 30px;">
-                <p>💡 Conseil du jour : "Une bonne préparation fait 90% du travail réussi"</p>
-                <p style="margin-top: 10px; font-size: 12px;">by Nylockdev • Dernière mise à jour : <span id="currentDate">...</span></p>
-            </div>
-        </footer>
-    </div>
-    
-    <script>
-        // Données de test (seront remplacées par les vraies données)
-        const teamsData = [
-            { name: "WINAT", installations: 156, clients: 142, level: 8, color: "#3b82f6" },
-            { name: "GOLD", installations: 132, clients: 128, level: 7, color: "#f59e0b" },
-            { name: "ELITE", installations: 98, clients: 95, level: 6, color: "#10b981" },
-            { name: "PRO", installations: 87, clients: 84, level: 5, color: "#8b5cf6" },
-            { name: "TECH", installations: 65, clients: 62, level: 4, color: "#ef4444" },
-            { name: "SPEED", installations: 45, clients: 43, level: 3, color: "#06b6d4" }
-        ];
-        
+"""
+
+JS_GENERIQUE = r"""        
         // Fonction pour formater les nombres
         function formatNumber(num) {
             return num.toString().replace(/\B(?=(\d{3})+(?!\d))/g, " ");
@@ -699,13 +5598,18 @@ def create_generic_dashboard(db):
         
         // Initialiser les stats
         function initStats() {
-            const totalInstallations = teamsData.reduce((sum, team) => sum + team.installations, 0);
-            const totalClients = teamsData.reduce((sum, team) => sum + team.clients, 0);
-            const successRate = Math.round((totalClients / totalInstallations) * 100);
-            
-            document.getElementById('totalInstallations').textContent = formatNumber(totalInstallations);
-            document.getElementById('activeTeams').textContent = teamsData.length;
-            document.getElementById('successRate').textContent = successRate + '%';
+            document.getElementById('totalInstallations').textContent = formatNumber(globalStats.installations);
+            document.getElementById('activeTeams').textContent = globalStats.teams;
+            document.getElementById('partClientsUniques').textContent = globalStats.partClientsUniques + '%';
+            const objectif = globalStats.objectifMois;
+            document.getElementById('progressionMois').style.width =
+                (objectif ? Math.min(100, globalStats.installationsMois / objectif * 100) : 0) + '%';
+            document.getElementById('progressionEquipes').style.width =
+                (globalStats.teams ? globalStats.equipesActivesMois / globalStats.teams * 100 : 0) + '%';
+            document.getElementById('progressionClientsUniques').style.width = globalStats.partClientsUniques + '%';
+            document.getElementById('moyenneJour').textContent = globalStats.moyenneJour;
+            document.getElementById('offre0f').textContent = globalStats.offre0f + '%';
+            document.getElementById('offre2eMois').textContent = globalStats.offre2eMois + '%';
             document.getElementById('currentDate').textContent = new Date().toLocaleDateString('fr-FR', {
                 weekday: 'long',
                 year: 'numeric',
@@ -721,13 +5625,11 @@ def create_generic_dashboard(db):
             const teamsGrid = document.getElementById('teamsGrid');
             teamsGrid.innerHTML = '';
             
-            // Trier par installations (décroissant)
-            const sortedTeams = [...teamsData].sort((a, b) => b.installations - a.installations);
-            
-            sortedTeams.forEach((team, index) => {
-                const rank = index + 1;
+            // Équipes déjà triées par classement
+            teamsData.forEach((team) => {
+                const rank = team.rank;
                 const rankEmoji = rank === 1 ? '🥇' : rank === 2 ? '🥈' : rank === 3 ? '🥉' : '🎯';
-                const progress = Math.min(100, (team.installations / 200) * 100);
+                const progress = team.progress;
                 
                 const teamCard = document.createElement('div');
                 teamCard.className = 'team-card';
@@ -756,8 +5658,8 @@ def create_generic_dashboard(db):
                             <div class="team-stat-label">Clients</div>
                         </div>
                         <div class="team-stat">
-                            <div class="team-stat-number">${Math.round((team.clients / team.installations) * 100)}%</div>
-                            <div class="team-stat-label">Réussite</div>
+                            <div class="team-stat-number">${team.partClientsUniques}%</div>
+                            <div class="team-stat-label">Clients uniques</div>
                         </div>
                         <div class="team-stat">
                             <div class="team-stat-number">#${rank}</div>
@@ -770,7 +5672,7 @@ def create_generic_dashboard(db):
                             <div class="progress-fill" style="width: ${progress}%"></div>
                         </div>
                         <div style="display: flex; justify-content: space-between; font-size: 12px; color: var(--gray);">
-                            <span>Progression</span>
+                            <span>${formatNumber(team.installationsMois)} / ${formatNumber(team.objectif)} ce mois</span>
                             <span>${progress.toFixed(1)}%</span>
                         </div>
                     </div>
@@ -796,6 +5698,44 @@ def create_generic_dashboard(db):
             });
         }
         
+        // Répartitions (forfaits, provenances) et série des installations par jour
+        function ligneIndicateur(conteneur, libelle, valeur, part) {
+            const ligne = document.createElement('div');
+            ligne.className = 'indicateur-ligne';
+            ligne.append(document.createElement('span'), document.createElement('span'));
+            ligne.firstChild.textContent = libelle;
+            ligne.lastChild.textContent = valeur;
+            const barre = document.createElement('div');
+            barre.className = 'progress-bar';
+            barre.innerHTML = '<div class="progress-fill"></div>';
+            barre.firstChild.style.width = part + '%';
+            conteneur.append(ligne, barre);
+        }
+        
+        function initIndicateurs() {
+            if (indicateurs.mois) {
+                document.getElementById('sousTitreIndicateurs').textContent =
+                    `Mois de référence ${indicateurs.mois} • ${indicateurs.joursMois} jour(s) travaillé(s)`;
+            }
+            const forfaits = document.getElementById('indicateursForfaits');
+            indicateurs.forfaits.slice(0, 6).forEach((f) => {
+                ligneIndicateur(forfaits, f.valeur, `${formatNumber(f.installations)} • ${f.part}%`, f.part);
+            });
+            const provenances = document.getElementById('indicateursProvenances');
+            indicateurs.provenances.slice(0, 6).forEach((p) => {
+                ligneIndicateur(provenances, p.valeur,
+                    `${p.part}% • ${p.partClientsUniques}% clients distincts`, p.part);
+            });
+            const jours = document.getElementById('indicateursJours');
+            const maximum = Math.max(1, ...indicateurs.parJour.map((j) => j.installations));
+            indicateurs.parJour.forEach((j) => {
+                const barre = document.createElement('div');
+                barre.style.height = (j.installations / maximum * 100) + '%';
+                barre.title = `${j.date} : ${j.installations} installations`;
+                jours.appendChild(barre);
+            });
+        }
+        
         // Particules animées
         function createParticles() {
             const particlesContainer = document.getElementById('particles');
@@ -847,6 +5787,7 @@ def create_generic_dashboard(db):
         document.addEventListener('DOMContentLoaded', function() {
             initStats();
             generateTeamCards();
+            initIndicateurs();
             createParticles();
             showRandomTip();
             
@@ -862,15 +5803,31 @@ def create_generic_dashboard(db):
                 }, index * 100);
             });
             
-            // Mise à jour en temps réel (simulation)
-            setInterval(() => {
-                const successRate = document.getElementById('successRate');
-                const currentRate = parseInt(successRate.textContent);
-                const newRate = Math.min(100, currentRate + (Math.random() > 0.5 ? 1 : -1));
-                successRate.textContent = newRate + '%';
-            }, 5000);
+            // Chiffres réels servis par `test.py servir` (rien à interroger en file://)
+            if (location.protocol.startsWith('http')) {
+                setInterval(rafraichirStats, 30000);
+            }
         });
         
+        // Le serveur répond 304 tant que la base n'a pas changé
+        let derniersChiffres = '';
+        async function rafraichirStats() {
+            try {
+                const reponse = await fetch('api/teams', {cache: 'no-cache'});
+                if (!reponse.ok) return;
+                const texte = await reponse.text();
+                if (texte === derniersChiffres) return;
+                derniersChiffres = texte;
+                const donnees = JSON.parse(texte);
+                Object.assign(globalStats, donnees.totaux);
+                teamsData.splice(0, teamsData.length, ...donnees.teams);
+                initStats();
+                generateTeamCards();
+            } catch (erreur) {
+                // Serveur momentanément injoignable : on garde les derniers chiffres
+            }
+        }
+        
         // Effet de saisie pour les stats
         function animateCounter(element, target) {
             let current = 0;
@@ -887,16 +5844,1381 @@ def create_generic_dashboard(db):
         
         // Animer les compteurs au chargement
         setTimeout(() => {
-            const totalInstallations = teamsData.reduce((sum, team) => sum + team.installations, 0);
-            animateCounter(document.getElementById('totalInstallations'), totalInstallations);
+            animateCounter(document.getElementById('totalInstallations'), globalStats.installations);
         }, 500);
-    </script>
-</body>
-</html>"""
-    
-    with open("dashboard.html", "w", encoding="utf-8") as f:
-        f.write(html)
-    
-    console.print("[green]✅ Dashboard générique créé : dashboard.html[/green]")
+"""
 
-# Appelle cette fonction dans update_dashboards() ou main()
+JS_EQUIPE = """        document.addEventListener('DOMContentLoaded', function() {
+            const cards = document.querySelectorAll('.client-card');
+            cards.forEach((card, index) => {
+                card.style.opacity = '0';
+                card.style.transform = 'translateY(20px)';
+                setTimeout(() => {
+                    card.style.transition = 'all 0.5s ease';
+                    card.style.opacity = '1';
+                    card.style.transform = 'translateY(0)';
+                }, index * 100);
+            });
+            
+            // Deltas poussés par `test.py servir` : compteurs et cartes patchés sans recharger
+            if (location.protocol.startsWith('http') && window.EventSource) {
+                const equipe = document.body.dataset.equipe;
+                const source = new EventSource('api/evenements?equipe=' + encodeURIComponent(equipe));
+                source.addEventListener('equipe', (evenement) => appliquerDelta(JSON.parse(evenement.data)));
+            }
+        });
+        
+        function carteClient(cle) {
+            return document.querySelector('.client-card[data-cle="' + CSS.escape(cle) + '"]');
+        }
+        
+        function appliquerDelta(delta) {
+            ['installations', 'jours', 'clients'].forEach(nom => {
+                const element = document.querySelector('[data-stat="' + nom + '"]');
+                if (element) element.textContent = delta[nom];
+            });
+            delta.retires.forEach(cle => {
+                const carte = carteClient(cle);
+                if (carte) carte.remove();
+            });
+            for (const {cle, date, html} of delta.cartes) {
+                const section = document.querySelector('.dossier-section[data-date="' + CSS.escape(date) + '"]');
+                if (!section) {
+                    // Nouveau jour : la page régénérée contient déjà sa section
+                    location.reload();
+                    return;
+                }
+                const modele = document.createElement('template');
+                modele.innerHTML = html.trim();
+                const nouvelle = modele.content.firstElementChild;
+                const ancienne = carteClient(cle);
+                if (ancienne) ancienne.replaceWith(nouvelle);
+                else section.querySelector('.clients-grid').append(nouvelle);
+            }
+            document.querySelectorAll('.dossier-section').forEach(section => {
+                const grille = section.querySelector('.clients-grid');
+                const cartes = [...grille.children].sort(
+                    (a, b) => (Number(a.dataset.ordre) || 0) - (Number(b.dataset.ordre) || 0));
+                grille.append(...cartes);
+                section.querySelector('.section-count').textContent = cartes.length + ' installation(s)';
+            });
+        }
+"""
+
+CSS_CARTE = """        .carte-section {
+            margin: 40px 0;
+        }
+        
+        .carte-section h2 {
+            color: #f1f5f9;
+            font-size: 24px;
+            margin-bottom: 20px;
+        }
+        
+        .carte {
+            position: relative;
+            height: 420px;
+            border-radius: 20px;
+            overflow: hidden;
+            border: 1px solid rgba(148, 163, 184, 0.2);
+            background: #0b1324;
+            cursor: grab;
+            touch-action: none;
+        }
+        
+        .carte canvas {
+            width: 100%;
+            height: 100%;
+            display: block;
+        }
+        
+        .carte-zoom {
+            position: absolute;
+            top: 15px;
+            right: 15px;
+            display: flex;
+            flex-direction: column;
+            gap: 8px;
+        }
+        
+        .carte-zoom button {
+            width: 36px;
+            height: 36px;
+            border-radius: 10px;
+            border: 1px solid rgba(148, 163, 184, 0.3);
+            background: rgba(30, 41, 59, 0.9);
+            color: #f1f5f9;
+            font-size: 18px;
+            cursor: pointer;
+        }
+        
+        .carte-info {
+            position: absolute;
+            left: 15px;
+            bottom: 12px;
+            color: #94a3b8;
+            font-size: 13px;
+        }
+"""
+
+JS_CARTE = """        // Carte : grappes précalculées par zoom (carte/<portée>/<z>/<x>_<y>.js), fond hors ligne
+        const TAILLE_TUILE = 256;
+        window.CARTES_FTTH = window.CARTES_FTTH || {};
+        window.TUILES_FTTH = window.TUILES_FTTH || {};
+
+        function chargerScriptCarte(src) {
+            return new Promise((resoudre, rejeter) => {
+                const script = document.createElement('script');
+                script.src = src;
+                script.onload = resoudre;
+                script.onerror = rejeter;
+                document.head.appendChild(script);
+            });
+        }
+
+        function mercator(longitude, latitude) {
+            const sinus = Math.sin(latitude * Math.PI / 180);
+            return [(longitude + 180) / 360, 0.5 - Math.log((1 + sinus) / (1 - sinus)) / (4 * Math.PI)];
+        }
+
+        function initialiserCarte(conteneur, index) {
+            const canvas = conteneur.querySelector('canvas');
+            const contexte = canvas.getContext('2d');
+            const info = conteneur.querySelector('.carte-info');
+            const chargees = {};
+            const etat = { zoom: index.zooms[0], centre: [0.5, 0.5] };
+
+            if (index.emprise) {
+                const [ouest, sud, est, nord] = index.emprise;
+                const [x1, y1] = mercator(ouest, nord);
+                const [x2, y2] = mercator(est, sud);
+                etat.centre = [(x1 + x2) / 2, (y1 + y2) / 2];
+                const largeur = canvas.clientWidth || 800, hauteur = canvas.clientHeight || 420;
+                while (etat.zoom < index.zooms[1]
+                       && (x2 - x1) * TAILLE_TUILE * 2 ** (etat.zoom + 1) < largeur * 0.9
+                       && (y2 - y1) * TAILLE_TUILE * 2 ** (etat.zoom + 1) < hauteur * 0.9) {
+                    etat.zoom++;
+                }
+            }
+
+            function chargerTuile(cle) {
+                if (!chargees[cle]) {
+                    chargees[cle] = chargerScriptCarte(`${index.base}/${cle.slice(index.portee.length + 1)}.js?v=${index.version}`)
+                        .then(dessiner);
+                }
+            }
+
+            function dessiner() {
+                const ratio = window.devicePixelRatio || 1;
+                const largeur = canvas.clientWidth, hauteur = canvas.clientHeight;
+                if (canvas.width !== largeur * ratio || canvas.height !== hauteur * ratio) {
+                    canvas.width = largeur * ratio;
+                    canvas.height = hauteur * ratio;
+                }
+                contexte.setTransform(ratio, 0, 0, ratio, 0, 0);
+                contexte.clearRect(0, 0, largeur, hauteur);
+
+                const echelle = TAILLE_TUILE * 2 ** etat.zoom;
+                const gauche = etat.centre[0] * echelle - largeur / 2;
+                const haut = etat.centre[1] * echelle - hauteur / 2;
+                const disponibles = new Set(index.tuiles[etat.zoom] || []);
+                let affichees = 0;
+                contexte.textAlign = 'center';
+                contexte.textBaseline = 'middle';
+                contexte.font = '600 12px sans-serif';
+                for (let tx = Math.floor(gauche / TAILLE_TUILE); tx <= Math.floor((gauche + largeur) / TAILLE_TUILE); tx++) {
+                    for (let ty = Math.floor(haut / TAILLE_TUILE); ty <= Math.floor((haut + hauteur) / TAILLE_TUILE); ty++) {
+                        if (!disponibles.has(`${tx}_${ty}`)) continue;
+                        const cle = `${index.portee}/${etat.zoom}/${tx}_${ty}`;
+                        const grappes = window.TUILES_FTTH[cle];
+                        if (!grappes) {
+                            chargerTuile(cle);
+                            continue;
+                        }
+                        grappes.forEach(([longitude, latitude, nombre, equipe]) => {
+                            const [x, y] = mercator(longitude, latitude);
+                            const rayon = nombre === 1 ? 5 : Math.min(30, 9 + 4 * Math.log2(nombre));
+                            contexte.globalAlpha = 0.85;
+                            contexte.fillStyle = index.couleurs[equipe] || '#3b82f6';
+                            contexte.beginPath();
+                            contexte.arc(x * echelle - gauche, y * echelle - haut, rayon, 0, 2 * Math.PI);
+                            contexte.fill();
+                            contexte.globalAlpha = 1;
+                            if (nombre > 1) {
+                                contexte.fillStyle = '#ffffff';
+                                contexte.fillText(nombre, x * echelle - gauche, y * echelle - haut);
+                            }
+                            affichees += nombre;
+                        });
+                    }
+                }
+                info.textContent = index.total
+                    ? `${affichees} / ${index.total} installation(s) visibles • zoom ${etat.zoom}`
+                    : 'Aucune installation géolocalisée';
+            }
+
+            function zoomer(delta) {
+                etat.zoom = Math.min(index.zooms[1], Math.max(index.zooms[0], etat.zoom + delta));
+                dessiner();
+            }
+
+            conteneur.querySelectorAll('[data-zoom]').forEach(bouton => {
+                bouton.addEventListener('click', () => zoomer(Number(bouton.dataset.zoom)));
+            });
+            conteneur.addEventListener('wheel', e => {
+                e.preventDefault();
+                zoomer(e.deltaY < 0 ? 1 : -1);
+            }, { passive: false });
+
+            let glisse = null;
+            canvas.addEventListener('pointerdown', e => {
+                glisse = [e.clientX, e.clientY];
+                canvas.setPointerCapture(e.pointerId);
+            });
+            canvas.addEventListener('pointermove', e => {
+                if (!glisse) return;
+                const echelle = TAILLE_TUILE * 2 ** etat.zoom;
+                etat.centre = [etat.centre[0] - (e.clientX - glisse[0]) / echelle,
+                               etat.centre[1] - (e.clientY - glisse[1]) / echelle];
+                glisse = [e.clientX, e.clientY];
+                dessiner();
+            });
+            canvas.addEventListener('pointerup', () => { glisse = null; });
+            window.addEventListener('resize', dessiner);
+            dessiner();
+        }
+
+        document.querySelectorAll('.carte[data-carte]').forEach(conteneur => {
+            const portee = conteneur.dataset.carte.split('/')[1];
+            chargerScriptCarte(conteneur.dataset.carte).then(() => initialiserCarte(conteneur, window.CARTES_FTTH[portee]));
+        });
+"""
+
+JS_ADMIN = """        // Dossiers : un fichier par mois (assets/dossiers-<AAAA-MM>.<hash>.js), chargé à la demande
+        const dossiersContainer = document.getElementById('dossiersContainer');
+        const shards = JSON.parse(dossiersContainer.dataset.shards || '[]');
+        const shardsCharges = {};
+        let moisAffiche = 0;
+        let datesRecherche = null;
+        let cartes = null;
+
+        function cartesParDate() {
+            if (!cartes) {
+                cartes = new Map();
+                document.querySelectorAll('.dossier-card').forEach(card => cartes.set(card.getAttribute('data-date'), card));
+            }
+            return cartes;
+        }
+
+        function chargerScript(src) {
+            return new Promise((resoudre, rejeter) => {
+                const script = document.createElement('script');
+                script.src = src;
+                script.onload = resoudre;
+                script.onerror = rejeter;
+                document.head.appendChild(script);
+            });
+        }
+
+        function chargerMois(position) {
+            const [mois, chemin] = shards[position];
+            if (!shardsCharges[mois]) {
+                shardsCharges[mois] = chargerScript(chemin).then(() => window.DOSSIERS_FTTH[mois]);
+            }
+            return shardsCharges[mois];
+        }
+
+        function carteEquipe(equipe, nombre, date) {
+            const card = document.getElementById('modeleEquipe').content.firstElementChild.cloneNode(true);
+            const page = `dashboard_${equipe}.html`;
+            card.addEventListener('click', () => { window.location.href = page; });
+            card.querySelector('.equipe-avatar').textContent = equipe.slice(0, 1);
+            card.querySelector('.equipe-name').textContent = equipe;
+            card.querySelector('.equipe-stats').textContent = `${nombre} installation(s)`;
+            card.querySelector('.equipe-btn-primary').href = page;
+            card.querySelector('.equipe-btn-secondary').href = `calendar.html?date=${date}`;
+            return card;
+        }
+
+        function carteDossier(dossier) {
+            const card = document.getElementById('modeleDossier').content.firstElementChild.cloneNode(true);
+            card.setAttribute('data-date', dossier.date);
+            card.querySelector('.dossier-jour').textContent = dossier.date;
+            card.querySelector('.dossier-count').textContent = `${dossier.nombre} installation(s)`;
+            const grille = card.querySelector('.equipes-grid');
+            dossier.equipes.forEach(([equipe, nombre]) => grille.appendChild(carteEquipe(equipe, nombre, dossier.date)));
+            return card;
+        }
+
+        function libelleMois(mois) {
+            const [annee, numero] = mois.split('-');
+            return new Date(annee, numero - 1).toLocaleDateString('fr-FR', { month: 'long', year: 'numeric' });
+        }
+
+        function moisDe(date) {
+            return `${date.slice(6)}-${date.slice(3, 5)}`;
+        }
+
+        function afficherMois(position) {
+            if (position < 0 || position >= shards.length) return Promise.resolve();
+            return chargerMois(position).then(dossiers => {
+                moisAffiche = position;
+                dossiersContainer.replaceChildren(...dossiers.map(carteDossier));
+                cartes = null;
+                cartesParDate().forEach((card, date) => afficherCarte(card, !datesRecherche || datesRecherche.has(date)));
+                document.getElementById('moisCourant').textContent = libelleMois(shards[position][0]);
+                document.getElementById('moisPrecedent').disabled = position === shards.length - 1;
+                document.getElementById('moisSuivant').disabled = position === 0;
+            });
+        }
+
+        document.getElementById('moisPrecedent').addEventListener('click', () => afficherMois(moisAffiche + 1));
+        document.getElementById('moisSuivant').addEventListener('click', () => afficherMois(moisAffiche - 1));
+        afficherMois(0);
+
+        // Recherche : index inversé (assets/recherche.<hash>.js) chargé à la première saisie
+        const searchInput = document.getElementById('searchInput');
+        const searchResults = document.getElementById('searchResults');
+        let indexRecherche = null;
+
+        function replier(texte) {
+            return texte.normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase();
+        }
+
+        function chargerIndex() {
+            if (!indexRecherche) {
+                indexRecherche = chargerScript(searchInput.dataset.index).then(() => {
+                    const index = window.INDEX_RECHERCHE_FTTH;
+                    index.postings = index.postings.map(ecarts => {
+                        let numero = 0;
+                        return ecarts.map(ecart => numero += ecart);
+                    });
+                    return index;
+                });
+            }
+            return indexRecherche;
+        }
+
+        function documentsPourPrefixe(index, prefixe) {
+            let bas = 0, haut = index.jetons.length;
+            while (bas < haut) {
+                const milieu = (bas + haut) >> 1;
+                if (index.jetons[milieu] < prefixe) bas = milieu + 1; else haut = milieu;
+            }
+            const trouves = new Set();
+            for (let i = bas; i < index.jetons.length && index.jetons[i].startsWith(prefixe); i++) {
+                index.postings[i].forEach(numero => trouves.add(numero));
+            }
+            return trouves;
+        }
+
+        function rechercher(index, requete) {
+            const jetons = replier(requete).split(/[^a-z0-9]+/).filter(Boolean);
+            if (!jetons.length) return null;
+            let resultat = null;
+            for (const jeton of jetons) {
+                const trouves = documentsPourPrefixe(index, jeton);
+                resultat = resultat === null ? trouves : new Set([...resultat].filter(n => trouves.has(n)));
+                if (!resultat.size) break;
+            }
+            return resultat;
+        }
+
+        function afficherCarte(card, isVisible) {
+            card.style.display = isVisible ? 'block' : 'none';
+            card.style.opacity = isVisible ? '1' : '0';
+            card.style.transform = isVisible ? 'translateY(0)' : 'translateY(20px)';
+        }
+
+        function afficherResultats(index, trouves) {
+            datesRecherche = trouves && new Set([...trouves].map(n => index.documents[n][3]));
+            cartesParDate().forEach((card, date) => afficherCarte(card, !datesRecherche || datesRecherche.has(date)));
+            searchResults.replaceChildren();
+            if (!trouves) return;
+            // Seul le mois affiché a ses cartes dans la page : sans résultat dans ce mois,
+            // on charge le plus récent des mois trouvés (afficherMois y applique le filtre)
+            const moisTrouves = new Set([...datesRecherche].map(moisDe));
+            const position = shards.findIndex(shard => moisTrouves.has(shard[0]));
+            if (position >= 0 && !moisTrouves.has(shards[moisAffiche][0])) afficherMois(position);
+            const resume = document.createElement('div');
+            resume.className = 'search-count';
+            resume.textContent = moisTrouves.size > 1
+                ? `${trouves.size} client(s) trouvé(s) sur ${moisTrouves.size} mois`
+                : `${trouves.size} client(s) trouvé(s)`;
+            searchResults.appendChild(resume);
+            [...trouves].slice(0, 50).forEach(numero => {
+                const [nom, tn, equipe, date, page] = index.documents[numero];
+                const lien = document.createElement('a');
+                lien.className = 'search-result';
+                lien.href = page;
+                lien.textContent = nom;
+                const details = document.createElement('span');
+                details.textContent = `${tn} • ${equipe} • ${date}`;
+                lien.appendChild(details);
+                searchResults.appendChild(lien);
+            });
+        }
+
+        searchInput.addEventListener('focus', chargerIndex, { once: true });
+        searchInput.addEventListener('input', function(e) {
+            const requete = e.target.value;
+            chargerIndex().then(index => {
+                // Une saisie plus récente a déjà pris le relais
+                if (searchInput.value === requete) afficherResultats(index, rechercher(index, requete));
+            });
+        });
+        
+        // Animation au chargement
+        document.addEventListener('DOMContentLoaded', function() {
+            const fadeElements = document.querySelectorAll('.fade-in');
+            fadeElements.forEach((el, index) => {
+                el.style.animationDelay = (index * 0.1) + 's';
+            });
+            
+            // Mettre à jour l'heure en temps réel
+            function updateTime() {
+                const now = new Date();
+                const timeString = now.toLocaleTimeString('fr-FR', { 
+                    hour: '2-digit', 
+                    minute: '2-digit',
+                    second: '2-digit'
+                });
+                const dateString = now.toLocaleDateString('fr-FR', {
+                    weekday: 'long',
+                    year: 'numeric',
+                    month: 'long',
+                    day: 'numeric'
+                });
+                
+                const timeElement = document.querySelector('.top-bar h1');
+                if (timeElement) {
+                    timeElement.innerHTML = `🎛️ Dashboard Administrateur <small style="font-size: 14px; color: var(--gray); display: block; margin-top: 5px;">${dateString} • ${timeString}</small>`;
+                }
+            }
+            
+            updateTime();
+            setInterval(updateTime, 1000);
+        });
+        
+        // Filtre par date
+        function filterByDate(date) {
+            const mois = date === 'all' ? null : moisDe(date);
+            const position = mois ? shards.findIndex(shard => shard[0] === mois) : moisAffiche;
+            afficherMois(position).then(() => cartesParDate().forEach((card, cardDate) => {
+                if (date === 'all' || cardDate === date) {
+                    card.style.display = 'block';
+                    setTimeout(() => {
+                        card.style.opacity = '1';
+                        card.style.transform = 'translateY(0)';
+                    }, 10);
+                } else {
+                    card.style.opacity = '0';
+                    card.style.transform = 'translateY(20px)';
+                    setTimeout(() => {
+                        card.style.display = 'none';
+                    }, 300);
+                }
+            }));
+        }
+        
+        window.filterByDate = filterByDate;
+"""
+
+FEUILLES_PAGES = {
+    "page-generic": CSS_GENERIQUE,
+    "page-equipe": CSS_EQUIPE,
+    "page-admin": CSS_ADMIN,
+    "page-client": CSS_CLIENT,
+    "avec-carte": CSS_CARTE,
+}
+
+SCRIPTS_PAGES = {
+    "page-generic": JS_GENERIQUE,
+    "page-equipe": JS_EQUIPE,
+    "page-admin": JS_ADMIN,
+    "avec-carte": JS_CARTE,
+}
+
+
+
+def date_dossier(texte):
+    """Date JJ-MM-AAAA d'un dossier (type argparse)"""
+    try:
+        return datetime.strptime(texte, "%d-%m-%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date attendue au format JJ-MM-AAAA : {texte}") from None
+
+
+def dans_periode(date, du=None, au=None):
+    """Vrai si la date DD-MM-YYYY est dans [du, au] (bornes datetime, None : ouverte)"""
+    if du is None and au is None:
+        return True
+    try:
+        jour = datetime.strptime(date, "%d-%m-%Y")
+    except ValueError:
+        return False
+    return (du is None or jour >= du) and (au is None or jour <= au)
+
+
+def lister_classeurs(chemins):
+    """Classeurs à importer : les fichiers tels quels, les dossiers développés avec MOTIF_EXPORTS"""
+    classeurs = []
+    for chemin in chemins:
+        if os.path.isdir(chemin):
+            classeurs += sorted(e.path for e in os.scandir(chemin)
+                                if e.is_file() and fnmatch.fnmatch(e.name, MOTIF_EXPORTS))
+        else:
+            classeurs.append(chemin)
+    return classeurs
+
+
+def importer_classeurs(classeurs, forcer=False, processus=None, base=FICHIER_BASE,
+                       fichier_equipes=FICHIER_EQUIPES, du=None, au=None):
+    """Pipeline complet : lecture des exports, affectation des équipes, dossiers et dashboards
+
+    Les lignes sont regroupées par Date de Transmission : un lot de classeurs
+    (un mois de corrections, par exemple) reconstruit tous les dossiers touchés
+    en une seule exécution. du/au restreignent l'import à une période.
+    Chaque exécution laisse un rapport de temps et de mémoire dans rapports/.
+    """
+    chrono = ChronoEtapes()
+    classeurs = lister_classeurs(classeurs)
+    chrono.contexte["classeurs"] = classeurs
+    with chrono.mesurer("Lecture Excel"):
+        clients = [client for chemin in classeurs for client in lire_excel_clients(chemin)]
+    # Sans Date de Transmission, une ligne n'a ni dossier ni tournée : signalée, pas importée
+    sans_date = sum(1 for client in clients if not client.get("date"))
+    chrono.contexte["lignes_sans_date"] = sans_date
+    if sans_date:
+        console.print(f"[yellow]⚠️  {sans_date} ligne(s) sans Date de Transmission ignorée(s)[/yellow]")
+        clients = [client for client in clients if client.get("date")]
+    hors_periode = sum(1 for client in clients if not dans_periode(client.get("date", ""), du, au))
+    if hors_periode:
+        console.print(f"[dim]⏭️  {hors_periode} ligne(s) hors période ignorée(s)[/dim]")
+        clients = [client for client in clients if dans_periode(client.get("date", ""), du, au)]
+    with BaseClients(base) as db:
+        with chrono.mesurer("Doublons"):
+            clients, signalements = dedoublonner(clients, db)
+        if signalements:
+            afficher_doublons(signalements)
+            ecrire_doublons(signalements)
+        # Un client déjà importé garde son équipe d'une exécution à l'autre
+        connues = db.equipes_connues(client.get("date", "") for client in clients)
+        for client in clients:
+            client["equipe"] = connues.get((cle_enregistrement(client), client.get("date", "")), client.get("equipe", ""))
+        equipes = charger_equipes(fichier_equipes, db)
+        # Les clients déjà enregistrés ces jours-là comptent dans la charge des équipes
+        importes = {(cle_enregistrement(client), client.get("date", "")) for client in clients}
+        deja_la = [client for client in clients_des_dates(db, {client.get("date", "") for client in clients})
+                   if (cle_enregistrement(client), client["date"]) not in importes]
+        with chrono.mesurer("Affectation équipes"):
+            table = affecter_equipes(clients + deja_la, equipes, db)
+        if table:
+            afficher_affectations(table, equipes)
+            ecrire_affectations(table)
+        sans_equipe = sum(1 for client in clients if not client.get("equipe"))
+        if sans_equipe:
+            console.print(f"[yellow]⚠️  {sans_equipe} client(s) sans équipe : aucune équipe active[/yellow]")
+        clients = [client for client in clients if client.get("equipe")]
+        regeneres = construire_dossiers(clients, forcer, processus, db, chrono)
+        # Après construire_dossiers : l'ordre de passage, replanifié sur tout le jour, est alors connu
+        with chrono.mesurer("Archive"):
+            archiver(clients_des_dates(db, {client["date"] for client in clients}))
+        db.enregistrer_classeurs(classeurs)
+    console.print(f"[green]✅ Rapport d'exécution : {chrono.ecrire_rapport()}[/green]")
+    return regeneres
+
+
+def reconstruire_periode(du=None, au=None, forcer=False, processus=None, base=FICHIER_BASE):
+    """Reconstruit depuis la base les dossiers d'une période, sans classeur (gabarits modifiés, reprise)
+
+    Les clients gardent leur équipe ; seuls les artefacts périmés sont régénérés.
+    """
+    chrono = ChronoEtapes()
+    with BaseClients(base) as db:
+        dates = db.dates(du, au)
+        chrono.contexte["dates"] = dates
+        if not dates:
+            console.print("[yellow]⚠️  Aucun dossier dans la période demandée[/yellow]")
+            return {}
+        with chrono.mesurer("Lecture base"):
+            clients = clients_des_dates(db, dates)
+        regeneres = construire_dossiers(clients, forcer, processus, db, chrono)
+    console.print(f"[green]✅ {len(dates)} dossier(s) reconstruit(s) ; "
+                  f"rapport d'exécution : {chrono.ecrire_rapport()}[/green]")
+    return regeneres
+
+
+# ---------------------------------------------------------------------------
+# Serveur HTTP des dashboards et API JSON
+# ---------------------------------------------------------------------------
+
+PORT_SERVEUR = int(os.environ.get("FTTH_PORT", "8080"))
+EXTENSIONS_SERVIES = {".html", ".js", ".css", ".png", ".svg", ".pdf", ".webp", ".avif", ".ico"}
+TYPES_COMPRESSIBLES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+TAILLE_MIN_GZIP = 512
+DELAI_INACTIVITE = 15  # secondes avant de fermer une connexion keep-alive muette
+MAX_ENTETES = 100
+MAX_CACHE_FICHIERS = 512
+MAX_CACHE_API = 256
+# Seuls ces paramètres changent la réponse : les autres ne créent pas d'entrée de cache
+PARAMETRES_API = {"/api/clients": ("q", "limite")}
+LIMITE_RECHERCHE = 50
+MOTIF_ASSET_HASHE = re.compile(r"^assets/.+\.[0-9a-f]{8,}\.(?:js|css)$")
+RAISONS_HTTP = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed"}
+# Absent des tables mimetypes avant Python 3.11 : vignettes AVIF des fiches
+mimetypes.add_type("image/avif", ".avif")
+
+
+def rechercher_clients(index, requete, limite=LIMITE_RECHERCHE):
+    """Documents de index_recherche contenant tous les mots de la requête (préfixes)"""
+    jetons = _jetons(requete)
+    if not jetons:
+        return 0, []
+    resultat = None
+    for jeton in jetons:
+        debut = bisect.bisect_left(index["jetons"], jeton)
+        fin = bisect.bisect_left(index["jetons"], jeton + "\uffff", debut)
+        documents = {n for i in range(debut, fin) for n in accumulate(index["postings"][i])}
+        resultat = documents if resultat is None else resultat & documents
+        if not resultat:
+            return 0, []
+    return len(resultat), [index["documents"][n] for n in sorted(resultat)[:limite]]
+
+
+def _etag(corps):
+    return f'"{hashlib.sha1(corps).hexdigest()[:20]}"'
+
+
+TAILLE_FILE_SSE = 32
+INTERVALLE_VEILLE_BASE = 1.0
+BATTEMENT_SSE = 25  # commentaire périodique pour garder la connexion ouverte derrière les proxys
+
+
+class DiffuseurEvenements:
+    """Abonnés SSE par équipe (None : toutes), chacun avec une file bornée
+
+    Un message est encodé une seule fois puis déposé dans chaque file. Un abonné
+    trop lent pour vider la sienne est déconnecté : EventSource se reconnecte et
+    rattrape ce qu'il a manqué grâce à Last-Event-ID.
+    """
+
+    def __init__(self, taille=TAILLE_FILE_SSE):
+        self.taille = taille
+        self.abonnes = {}
+
+    def abonner(self, equipe=None):
+        file = asyncio.Queue(self.taille)
+        self.abonnes.setdefault(equipe, set()).add(file)
+        return file
+
+    def desabonner(self, equipe, file):
+        abonnes = self.abonnes.get(equipe, set())
+        abonnes.discard(file)
+        if not abonnes:
+            self.abonnes.pop(equipe, None)
+
+    def publier(self, equipe, message):
+        for cible in (equipe, None):
+            for file in list(self.abonnes.get(cible, ())):
+                try:
+                    file.put_nowait(message)
+                except asyncio.QueueFull:
+                    while not file.empty():
+                        file.get_nowait()
+                    file.put_nowait(None)
+                    self.desabonner(cible, file)
+
+
+def message_sse(evenement, donnees, identifiant=None):
+    lignes = [f"id: {identifiant}"] if identifiant is not None else []
+    lignes += [f"event: {evenement}", f"data: {json.dumps(donnees, ensure_ascii=False)}"]
+    return ("\n".join(lignes) + "\n\n").encode("utf-8")
+
+
+class ServeurDashboards:
+    """Sert les pages générées et /api/* au-dessus de la base clients
+
+    Les réponses API sont mises en cache (LRU) jusqu'au prochain import : PRAGMA
+    data_version change dès qu'une autre connexion écrit dans la base. Tout ce
+    qui lit la base (API, index de recherche, indicateurs, deltas) passe par un
+    unique fil de travail : la boucle asyncio reste libre pour les fichiers et les flux SSE.
+    """
+
+    def __init__(self, racine=".", base=FICHIER_BASE):
+        self.racine = os.path.realpath(racine)
+        self.db = BaseClients(os.path.join(racine, base), partagee=True)
+        self.travail = ThreadPoolExecutor(max_workers=1, thread_name_prefix="base")
+        self.version = None
+        self.cache_api = OrderedDict()
+        self.cache_fichiers = OrderedDict()
+        self.cache_gzip = OrderedDict()
+        self.index = None
+        self.diffuseur = DiffuseurEvenements()
+        self.sequence = self.db.sequence()
+        self.version_diffusee = None
+        self.cache_kpi = (None, None)
+
+    def fermer(self):
+        self.travail.shutdown(wait=True)
+        self.db.fermer()
+
+    async def en_base(self, fonction, *args):
+        """Exécute fonction dans le fil de travail de la base, sans bloquer la boucle"""
+        return await asyncio.get_running_loop().run_in_executor(self.travail, fonction, *args)
+
+    def _synchroniser(self):
+        version = self.db.connexion.execute("PRAGMA data_version").fetchone()[0]
+        if version != self.version:
+            self.version, self.index = version, None
+            self.cache_api.clear()
+
+    def kpi(self):
+        """Indicateurs de la base, recalculés une fois par version (API et deltas les partagent)"""
+        version = self.db.connexion.execute("PRAGMA data_version").fetchone()[0]
+        if self.cache_kpi[0] != version:
+            equipes = charger_equipes(os.path.join(self.racine, FICHIER_EQUIPES), self.db)
+            self.cache_kpi = (version, calculer_kpi(self.db, equipes))
+        return self.cache_kpi[1]
+
+    # -- API -----------------------------------------------------------------
+
+    def api(self, chemin, parametres):
+        """(statut, données) pour /api/teams, /api/dossiers/<date> et /api/clients?q="""
+        if chemin == "/api/teams":
+            kpi = self.kpi()
+            return 200, {"teams": kpi["equipes"], "totaux": kpi["totaux"]}
+        if chemin.startswith("/api/dossiers/"):
+            date = chemin.rsplit("/", 1)[1]
+            clients = self.db.clients(date=date) if re.fullmatch(r"\d{2}-\d{2}-\d{4}", date) else []
+            if not clients:
+                return 404, {"erreur": f"aucun dossier pour {date}"}
+            champs = ("nom", "tn", "equipe", "ordre", "ville", "quartier", "forfait")
+            return 200, {"date": date, "clients": [
+                {**{champ: client.get(champ) for champ in champs},
+                 "page": f"dossier_{date}/{fichiers_client(client)['page']}"}
+                for client in clients
+            ]}
+        if chemin == "/api/clients":
+            if self.index is None:
+                self.index = index_recherche(entrees=entrees_recherche_base(self.db))
+            requete = parametres.get("q", [""])[0]
+            try:
+                limite = min(int(parametres.get("limite", [LIMITE_RECHERCHE])[0]), 500)
+            except ValueError:
+                limite = LIMITE_RECHERCHE
+            total, documents = rechercher_clients(self.index, requete, limite)
+            return 200, {"q": requete, "total": total, "resultats": [
+                dict(zip(("nom", "tn", "equipe", "date", "page"), document)) for document in documents]}
+        return 404, {"erreur": "route inconnue"}
+
+    def _reponse_api(self, cible):
+        self._synchroniser()
+        morceaux = urlsplit(cible)
+        chemin = morceaux.path.rstrip("/") or "/"
+        parametres = parse_qs(morceaux.query)
+        cle = (chemin, *((nom, tuple(parametres.get(nom, ()))) for nom in PARAMETRES_API.get(chemin, ())))
+        if cle not in self.cache_api:
+            statut, donnees = self.api(chemin, parametres)
+            corps = json.dumps(donnees, ensure_ascii=False).encode("utf-8")
+            self.cache_api[cle] = (statut, corps, _etag(corps), {
+                "Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-cache"})
+            if len(self.cache_api) > MAX_CACHE_API:
+                self.cache_api.popitem(last=False)
+        self.cache_api.move_to_end(cle)
+        return self.cache_api[cle]
+
+    # -- Deltas poussés aux dashboards d'équipe ----------------------------------
+
+    def deltas(self, depuis, equipe=None):
+        """{équipe: delta} des lignes modifiées après `depuis` : compteurs, cartes à jour et retirées"""
+        modifications = self.db.modifications(depuis)
+        if equipe:
+            modifications = [ligne for ligne in modifications if equipe in (ligne["equipe"], ligne["equipe_avant"])]
+        if not modifications:
+            return {}
+        kpi = self.kpi()
+        par_equipe = {}
+
+        def delta(nom):
+            if nom not in par_equipe:
+                chiffres = kpi_equipe(kpi, nom)
+                par_equipe[nom] = {
+                    "equipe": nom,
+                    "installations": chiffres["installations"],
+                    "clients": chiffres["clients"],
+                    "jours": self.db.jours_equipe(nom),
+                    "cartes": [],
+                    "retires": [],
+                }
+            return par_equipe[nom]
+
+        for ligne in modifications:
+            ancienne = ligne.pop("equipe_avant")
+            if ancienne and ancienne != ligne["equipe"]:
+                delta(ancienne)["retires"].append(cle_carte(ligne))
+            if ligne["equipe"]:
+                delta(ligne["equipe"])["cartes"].append(
+                    {"cle": cle_carte(ligne), "date": ligne["date"], "html": carte_client_equipe(ligne)})
+        return par_equipe
+
+    def messages_a_diffuser(self):
+        """[(équipe, message SSE)] des lignes modifiées depuis la dernière diffusion"""
+        version = self.db.connexion.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.version_diffusee:
+            return []
+        self.version_diffusee = version
+        sequence = self.db.sequence()
+        if sequence == self.sequence:
+            return []
+        messages = [(nom, message_sse("equipe", donnees, sequence))
+                    for nom, donnees in self.deltas(self.sequence).items()]
+        self.sequence = sequence
+        return messages
+
+    async def veiller_base(self):
+        """Une seule boucle pour tous les abonnés : PRAGMA data_version, puis les lignes modifiées"""
+        while True:
+            await asyncio.sleep(INTERVALLE_VEILLE_BASE)
+            # Les files des abonnés appartiennent à la boucle : publication ici, pas dans le fil de travail
+            for nom, message in await self.en_base(self.messages_a_diffuser):
+                self.diffuseur.publier(nom, message)
+
+    async def flux(self, ecrivain, parametres, entetes):
+        """/api/evenements?equipe=X : flux SSE, avec rattrapage depuis Last-Event-ID"""
+        equipe = parametres.get("equipe", [None])[0]
+        ecrivain.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                       b"Cache-Control: no-cache\r\nConnection: close\r\n\r\nretry: 3000\n\n")
+        file = self.diffuseur.abonner(equipe)
+        try:
+            dernier = entetes.get("last-event-id", "")
+            if dernier.isdigit() and int(dernier) < self.sequence:
+                for nom, donnees in (await self.en_base(self.deltas, int(dernier), equipe)).items():
+                    if equipe in (None, nom):
+                        ecrivain.write(message_sse("equipe", donnees, self.sequence))
+            await ecrivain.drain()
+            while True:
+                try:
+                    message = await asyncio.wait_for(file.get(), BATTEMENT_SSE)
+                except asyncio.TimeoutError:
+                    message = b": battement\n\n"
+                if message is None:
+                    break
+                ecrivain.write(message)
+                await ecrivain.drain()
+        finally:
+            self.diffuseur.desabonner(equipe, file)
+
+    # -- Fichiers ------------------------------------------------------------
+
+    def _reponse_fichier(self, chemin):
+        relatif = unquote(chemin).lstrip("/") or "dashboard.html"
+        complet = os.path.realpath(os.path.join(self.racine, relatif))
+        interdit = (not complet.startswith(self.racine + os.sep)
+                    or os.path.splitext(complet)[1] not in EXTENSIONS_SERVIES
+                    or any(partie.startswith(".") for partie in relatif.split("/")))
+        signature = None if interdit else _signature_fichier(complet)
+        if signature is None:
+            return 404, b"introuvable", None, {"Content-Type": "text/plain; charset=utf-8"}
+        cle = (complet, signature)
+        if cle not in self.cache_fichiers:
+            with open(complet, "rb") as f:
+                corps = f.read()
+            # Les assets nommés par leur contenu ne changent jamais
+            cache = ("public, max-age=31536000, immutable" if MOTIF_ASSET_HASHE.match(relatif)
+                     else "no-cache")
+            type_mime = mimetypes.guess_type(complet)[0] or "application/octet-stream"
+            if type_mime.startswith("text/") or type_mime == "application/javascript":
+                type_mime += "; charset=utf-8"
+            self.cache_fichiers[cle] = (200, corps, _etag(corps), {"Content-Type": type_mime, "Cache-Control": cache})
+            if len(self.cache_fichiers) > MAX_CACHE_FICHIERS:
+                self.cache_fichiers.popitem(last=False)
+        self.cache_fichiers.move_to_end(cle)
+        return self.cache_fichiers[cle]
+
+    # -- HTTP ----------------------------------------------------------------
+
+    def repondre(self, methode, cible, entetes, api=None):
+        """Statut, en-têtes et corps d'une requête GET/HEAD (api : _reponse_api déjà calculée)"""
+        if methode not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        if cible.startswith("/api/"):
+            statut, corps, etag, extra = api or self._reponse_api(cible)
+        else:
+            statut, corps, etag, extra = self._reponse_fichier(urlsplit(cible).path)
+        reponse = dict(extra)
+        type_mime = reponse["Content-Type"]
+        if etag:
+            reponse["ETag"] = etag
+            if etag in (v.strip() for v in entetes.get("if-none-match", "").split(",")):
+                return 304, reponse, b""
+        if (len(corps) >= TAILLE_MIN_GZIP and type_mime.startswith(TYPES_COMPRESSIBLES)
+                and "gzip" in entetes.get("accept-encoding", "")):
+            corps = self._gzip(etag, corps)
+            reponse["Content-Encoding"] = "gzip"
+        if type_mime.startswith(TYPES_COMPRESSIBLES):
+            reponse["Vary"] = "Accept-Encoding"
+        return statut, reponse, corps
+
+    def _gzip(self, etag, corps):
+        """Compression faite une fois par contenu : l'ETag est une empreinte du corps"""
+        if etag not in self.cache_gzip:
+            self.cache_gzip[etag] = gzip.compress(corps, compresslevel=6, mtime=0)
+            if len(self.cache_gzip) > MAX_CACHE_FICHIERS:
+                self.cache_gzip.popitem(last=False)
+        self.cache_gzip.move_to_end(etag)
+        return self.cache_gzip[etag]
+
+    async def connexion(self, lecteur, ecrivain):
+        """Une connexion HTTP/1.1 keep-alive : requêtes traitées l'une après l'autre"""
+        try:
+            while True:
+                ligne = await asyncio.wait_for(lecteur.readline(), DELAI_INACTIVITE)
+                if not ligne:
+                    break
+                try:
+                    methode, cible, version = ligne.decode("latin-1").split()
+                except ValueError:
+                    ecrivain.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+                entetes = {}
+                for _ in range(MAX_ENTETES):
+                    ligne = await asyncio.wait_for(lecteur.readline(), DELAI_INACTIVITE)
+                    if ligne in (b"\r\n", b"\n", b""):
+                        break
+                    nom, _, valeur = ligne.decode("latin-1").partition(":")
+                    entetes[nom.strip().lower()] = valeur.strip()
+                morceaux = urlsplit(cible)
+                if methode == "GET" and morceaux.path == "/api/evenements":
+                    await self.flux(ecrivain, parse_qs(morceaux.query), entetes)
+                    break
+                api = None
+                if methode in ("GET", "HEAD") and cible.startswith("/api/"):
+                    api = await self.en_base(self._reponse_api, cible)
+                statut, reponse, corps = self.repondre(methode, cible, entetes, api)
+                garder = version == "HTTP/1.1" and entetes.get("connection", "").lower() != "close"
+                reponse["Content-Length"] = str(len(corps))
+                reponse["Connection"] = "keep-alive" if garder else "close"
+                tete = f"HTTP/1.1 {statut} {RAISONS_HTTP[statut]}\r\n" + "".join(
+                    f"{nom}: {valeur}\r\n" for nom, valeur in reponse.items()) + "\r\n"
+                ecrivain.write(tete.encode("latin-1"))
+                if methode != "HEAD":
+                    ecrivain.write(corps)
+                await ecrivain.drain()
+                if not garder:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            ecrivain.close()
+
+
+async def _servir(serveur, hote, port):
+    asynchrone = await asyncio.start_server(serveur.connexion, hote, port, backlog=1024)
+    veille = asyncio.create_task(serveur.veiller_base())
+    adresses = ", ".join(f"http://{h}:{p}" for h, p, *_ in (s.getsockname() for s in asynchrone.sockets))
+    console.print(f"[green]✅ Dashboards servis sur {adresses} — Ctrl+C pour arrêter[/green]")
+    try:
+        async with asynchrone:
+            await asynchrone.serve_forever()
+    finally:
+        veille.cancel()
+
+
+def servir(racine=".", hote="0.0.0.0", port=PORT_SERVEUR, base=FICHIER_BASE):
+    """Serveur asyncio des dashboards : ETag, gzip et API JSON sur la base clients"""
+    serveur = ServeurDashboards(racine, base)
+    try:
+        asyncio.run(_servir(serveur, hote, port))
+    finally:
+        serveur.fermer()
+
+
+# ---------------------------------------------------------------------------
+# Surveillance des exports : reconstruction dès qu'un classeur arrive
+# ---------------------------------------------------------------------------
+
+MOTIF_EXPORTS = "NOUVEAUX CLIENTS*.xlsx"
+# Un classeur n'est importé qu'après ce délai sans changement de taille ni de date
+DELAI_STABILITE = float(os.environ.get("FTTH_DELAI_STABILITE", "2"))
+INTERVALLE_SCRUTATION = float(os.environ.get("FTTH_INTERVALLE_SCRUTATION", "5"))
+IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x002, 0x008, 0x080, 0x100
+EVENEMENT_INOTIFY = struct.Struct("iIII")
+
+
+def _inotify(dossier):
+    """Descripteur inotify non bloquant sur le dossier, ou None (autre système, limite atteinte)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    masque = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    if libc.inotify_add_watch(fd, os.fsencode(dossier), masque) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _signature_fichier(chemin):
+    with suppress(OSError):
+        infos = os.stat(chemin)
+        return infos.st_mtime_ns, infos.st_size
+    return None
+
+
+class SurveillanceExports:
+    """Exports nouveaux ou modifiés d'un dossier, par inotify ou à défaut par scrutation
+
+    Un fichier en cours de copie change encore de taille ou n'est pas encore une
+    archive valide : il reste en attente jusqu'à DELAI_STABILITE secondes de calme.
+    `importes` ({chemin absolu: signature}, voir BaseClients.classeurs_importes) :
+    les exports présents au démarrage et inchangés depuis leur import sont sautés.
+    """
+
+    def __init__(self, dossier=".", motif=MOTIF_EXPORTS, delai=DELAI_STABILITE,
+                 intervalle=INTERVALLE_SCRUTATION, inotify=True, importes=None):
+        self.dossier = dossier
+        self.motif = motif
+        self.delai = delai
+        self.intervalle = intervalle
+        self.fd = _inotify(dossier) if inotify else None
+        self.traites = {}
+        self.en_attente = {}
+        for nom in self._exports():
+            chemin = os.path.join(dossier, nom)
+            signature = _signature_fichier(chemin)
+            if signature and signature == (importes or {}).get(os.path.abspath(chemin)):
+                self.traites[chemin] = signature
+            self._signaler(nom)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    @property
+    def mode(self):
+        return "inotify" if self.fd is not None else "scrutation"
+
+    def _exports(self):
+        with os.scandir(self.dossier) as entrees:
+            return [e.name for e in entrees if e.is_file() and fnmatch.fnmatch(e.name, self.motif)]
+
+    def _signaler(self, nom):
+        if not fnmatch.fnmatch(nom, self.motif):
+            return
+        chemin = os.path.join(self.dossier, nom)
+        signature = _signature_fichier(chemin)
+        if not signature or signature == self.traites.get(chemin):
+            return
+        # Même signature déjà en attente : le délai de calme continue de courir
+        if self.en_attente.get(chemin, (None,))[0] != signature:
+            self.en_attente[chemin] = (signature, time.monotonic())
+
+    def _evenements(self, attente):
+        """Noms touchés pendant au plus `attente` secondes (None : jusqu'au prochain événement)"""
+        if self.fd is None:
+            time.sleep(self.intervalle if attente is None else min(attente, self.intervalle))
+            return self._exports()
+        if not select.select([self.fd], [], [], attente)[0]:
+            return []
+        tampon, noms, position = os.read(self.fd, 64 * 1024), [], 0
+        while position < len(tampon):
+            _, _, _, longueur = EVENEMENT_INOTIFY.unpack_from(tampon, position)
+            position += EVENEMENT_INOTIFY.size
+            noms.append(os.fsdecode(tampon[position:position + longueur].rstrip(b"\0")))
+            position += longueur
+        return noms
+
+    def prets(self):
+        """Chemins stables depuis DELAI_STABILITE et lisibles comme classeur"""
+        maintenant, prets = time.monotonic(), []
+        for chemin, (signature, depuis) in list(self.en_attente.items()):
+            actuelle = _signature_fichier(chemin)
+            if actuelle is None:
+                del self.en_attente[chemin]
+            elif actuelle != signature:
+                self.en_attente[chemin] = (actuelle, maintenant)
+            elif maintenant - depuis >= self.delai and zipfile.is_zipfile(chemin):
+                del self.en_attente[chemin]
+                self.traites[chemin] = signature
+                prets.append(chemin)
+        return sorted(prets)
+
+    def attendre(self):
+        """Bloque jusqu'à ce qu'au moins un export soit prêt à être importé"""
+        while True:
+            prets = self.prets()
+            if prets:
+                return prets
+            for nom in self._evenements(self.delai / 2 if self.en_attente else None):
+                self._signaler(nom)
+
+
+def surveiller(dossier=".", processus=None, base=FICHIER_BASE, fichier_equipes=FICHIER_EQUIPES,
+               inotify=True):
+    """Mode veille : chaque export qui arrive reconstruit ses dossiers et les dashboards
+
+    Les fiches, QR et pages inchangés sont sautés grâce au manifeste .build.json de
+    chaque dossier : seuls les jours présents dans le classeur sont retraités.
+    Au démarrage, les exports inchangés depuis leur dernier import ne sont pas relus.
+    """
+    with BaseClients(base) as db:
+        importes = db.classeurs_importes()
+    with SurveillanceExports(dossier, inotify=inotify, importes=importes) as surveillance:
+        console.print(f"[cyan]👀 Surveillance de {os.path.abspath(dossier)} ({surveillance.mode}) — "
+                      f"Ctrl+C pour arrêter[/cyan]")
+        while True:
+            classeurs = surveillance.attendre()
+            console.print(f"[cyan]📥 {', '.join(os.path.basename(c) for c in classeurs)}[/cyan]")
+            try:
+                importer_classeurs(classeurs, False, processus, base, fichier_equipes)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile, ET.ParseError, sqlite3.Error) as erreur:
+                # Un classeur illisible ou une base verrouillée ne doit pas arrêter la veille
+                console.print(f"[red]❌ Import impossible : {erreur}[/red]")
+
+
+# ---------------------------------------------------------------------------
+# Benchmark du pipeline complet
+# ---------------------------------------------------------------------------
+
+TAILLES_BENCH = (10, 1_000, 10_000, 100_000)
+CLIENTS_PAR_JOUR_BENCH = 300
+FICHIER_REFERENCE_BENCH = "bench_reference.json"
+SEUIL_REGRESSION = float(os.environ.get("FTTH_SEUIL_REGRESSION", "0.20"))
+DUREE_MIN_BENCH = 1.0  # en dessous, le débit est dominé par le bruit
+EQUIPES_BENCH = {
+    f"EQ{i + 1}": {"capacite": 40, "base": [-6.64 + 0.03 * (i % 4), 4.74 + 0.05 * (i // 4)]}
+    for i in range(8)
+}
+
+
+def categorie_artefact(chemin):
+    """Famille d'un fichier produit par le pipeline, pour le bilan des octets"""
+    nom = os.path.basename(chemin)
+    racine = chemin.split(os.sep, 1)[0]
+    if racine in ("rapports", ".cache") or nom.endswith(".xlsx") or nom == FICHIER_EQUIPES:
+        return None
+    if racine == DOSSIER_CARTE:
+        return "carte"
+    if racine == "assets":
+        return "assets"
+    if nom.startswith("dashboard"):
+        return "dashboards"
+    if os.sep + DOSSIER_VIGNETTES + os.sep in chemin:
+        return "vignettes"
+    if nom.startswith("Fiche_"):
+        return "fiches"
+    if nom.endswith("_QR.png"):
+        return "qr"
+    if nom.startswith("client_"):
+        return "pages client"
+    if nom.endswith(".pdf"):
+        return "pdf"
+    if ".sqlite" in nom:
+        return "base"
+    return "autres"
+
+
+def octets_par_categorie(dossier):
+    octets = {}
+    for racine, _, fichiers in os.walk(dossier):
+        for nom in fichiers:
+            chemin = os.path.join(racine, nom)
+            categorie = categorie_artefact(os.path.relpath(chemin, dossier))
+            if categorie:
+                octets[categorie] = octets.get(categorie, 0) + os.path.getsize(chemin)
+    return dict(sorted(octets.items()))
+
+
+def _mesurer_pipeline(dossier, classeur, processus):
+    """Construction complète dans un processus dédié, depuis un dossier vierge"""
+    os.chdir(dossier)
+    console.quiet = True
+    with open(FICHIER_EQUIPES, "w", encoding="utf-8") as f:
+        json.dump(EQUIPES_BENCH, f)
+    debut = time.perf_counter()
+    importer_classeurs([classeur], processus=processus)
+    duree = time.perf_counter() - debut
+    # Les rendus parallèles tournent dans des processus petits-enfants
+    pic = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+              resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    with BaseClients(FICHIER_BASE) as db:
+        clients = sum(sum(equipes.values()) for equipes in db.comptes_par_date().values())
+    rapports = sorted(f for f in os.listdir(DOSSIER_RAPPORTS) if f.startswith("run_"))
+    with open(os.path.join(DOSSIER_RAPPORTS, rapports[-1]), encoding="utf-8") as f:
+        etapes = {etape["etape"]: etape["duree_s"] for etape in json.load(f)["etapes"]}
+    return {
+        "clients": clients,
+        "duree_s": round(duree, 3),
+        "debit_clients_s": round(clients / duree, 1) if duree else None,
+        "pic_rss_ko": pic,
+        "octets": octets_par_categorie(dossier),
+        "etapes": etapes,
+    }
+
+
+def regressions(mesures, reference, seuil=SEUIL_REGRESSION):
+    """Écarts au-delà du seuil par rapport à la référence, taille par taille"""
+    ecarts = []
+    for taille, mesure in mesures.items():
+        ref = reference.get(taille)
+        if not ref:
+            continue
+        if ref["duree_s"] >= DUREE_MIN_BENCH and mesure["debit_clients_s"] < ref["debit_clients_s"] * (1 - seuil):
+            ecarts.append(f"{taille} lignes : débit {mesure['debit_clients_s']} clients/s "
+                          f"(référence {ref['debit_clients_s']})")
+        if mesure["pic_rss_ko"] > ref["pic_rss_ko"] * (1 + seuil):
+            ecarts.append(f"{taille} lignes : pic RSS {mesure['pic_rss_ko'] / 1024:.1f} Mo "
+                          f"(référence {ref['pic_rss_ko'] / 1024:.1f} Mo)")
+        for categorie, octets in mesure["octets"].items():
+            avant = ref["octets"].get(categorie)
+            if avant and octets > avant * (1 + seuil):
+                ecarts.append(f"{taille} lignes : {categorie} {octets:,} octets (référence {avant:,})")
+    return ecarts
+
+
+def benchmark_pipeline(tailles=TAILLES_BENCH, processus=None, reference=FICHIER_REFERENCE_BENCH,
+                       enregistrer=False, seuil=SEUIL_REGRESSION):
+    """Construit des dossiers complets à partir d'exports synthétiques de taille croissante
+
+    Compare à bench_reference.json et renvoie la liste des régressions au-delà du seuil ;
+    enregistrer=True remplace la référence par les mesures du jour.
+    """
+    mesures = {}
+    for lignes in tailles:
+        with tempfile.TemporaryDirectory() as dossier:
+            jours = max(1, math.ceil(lignes / CLIENTS_PAR_JOUR_BENCH))
+            classeur = ecrire_excel_synthetique(
+                os.path.join(dossier, "NOUVEAUX CLIENTS SYNTHETIQUE.xlsx"), lignes, jours=jours)
+            with console.status(f"[cyan]Pipeline complet — {lignes:,} lignes…".replace(",", " ")):
+                with ProcessPoolExecutor(max_workers=1) as executeur:
+                    mesures[str(lignes)] = executeur.submit(
+                        _mesurer_pipeline, dossier, classeur, processus).result()
+
+    table = Table(title="Pipeline complet sur exports synthétiques")
+    table.add_column("Lignes", justify="right")
+    table.add_column("Clients", justify="right")
+    table.add_column("Durée (s)", justify="right")
+    table.add_column("Clients/s", justify="right")
+    table.add_column("Pic RSS (Mo)", justify="right")
+    for lignes, mesure in mesures.items():
+        table.add_row(lignes, str(mesure["clients"]), f"{mesure['duree_s']:.2f}",
+                      f"{mesure['debit_clients_s']:.1f}", f"{mesure['pic_rss_ko'] / 1024:.1f}")
+    console.print(table)
+
+    octets = Table(title="Octets produits par type d'artefact (Ko)")
+    octets.add_column("Artefact")
+    for lignes in mesures:
+        octets.add_column(lignes, justify="right")
+    for categorie in sorted({c for mesure in mesures.values() for c in mesure["octets"]}):
+        octets.add_row(categorie, *(f"{mesure['octets'].get(categorie, 0) / 1024:.0f}" for mesure in mesures.values()))
+    console.print(octets)
+
+    if enregistrer or not os.path.exists(reference):
+        with open(reference, "w", encoding="utf-8") as f:
+            json.dump(mesures, f, ensure_ascii=False, indent=2)
+        console.print(f"[green]✅ Référence enregistrée : {reference}[/green]")
+        return []
+    with open(reference, encoding="utf-8") as f:
+        ecarts = regressions(mesures, json.load(f), seuil)
+    for ecart in ecarts:
+        console.print(f"[red]❌ Régression : {ecart}[/red]")
+    if not ecarts:
+        console.print(f"[green]✅ Aucune régression au-delà de {seuil:.0%}[/green]")
+    return ecarts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline FTTH MG TELECOM")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    bench = commandes.add_parser("bench-excel", help="benchmark de lecture des exports Excel")
+    bench.add_argument("--lignes", type=int, default=100_000)
+
+    bench_pipeline = commandes.add_parser("bench", help="benchmark du pipeline complet, avec seuil de régression")
+    bench_pipeline.add_argument("--tailles", type=int, nargs="+", default=list(TAILLES_BENCH))
+    bench_pipeline.add_argument("--processus", type=int, default=None)
+    bench_pipeline.add_argument("--reference", default=FICHIER_REFERENCE_BENCH)
+    bench_pipeline.add_argument("--enregistrer", action="store_true", help="remplace la référence")
+    bench_pipeline.add_argument("--seuil", type=float, default=SEUIL_REGRESSION, help="0.2 = 20 %%")
+
+    construire = commandes.add_parser("construire", help="importe des exports Excel et génère dossiers et dashboards")
+    construire.add_argument("classeurs", nargs="*",
+                            help="exports ou dossiers d'exports ; sans classeur, reconstruit --du/--au depuis la base")
+    construire.add_argument("--du", type=date_dossier, help="premier jour, JJ-MM-AAAA")
+    construire.add_argument("--au", type=date_dossier, help="dernier jour, JJ-MM-AAAA")
+    construire.add_argument("--forcer", action="store_true", help="régénère tout, même ce qui n'a pas changé")
+    construire.add_argument("--processus", type=int, default=None)
+    construire.add_argument("--base", default=FICHIER_BASE)
+    construire.add_argument("--equipes", default=FICHIER_EQUIPES, help="capacités, bases et forfaits des équipes")
+    construire.add_argument("--profil", choices=["cprofile", "pyinstrument"], help="profile l'exécution complète")
+
+    serveur = commandes.add_parser("servir", help="sert les dashboards et l'API JSON (/api/teams, /api/clients?q=)")
+    serveur.add_argument("racine", nargs="?", default=".")
+    serveur.add_argument("--hote", default="0.0.0.0")
+    serveur.add_argument("--port", type=int, default=PORT_SERVEUR)
+    serveur.add_argument("--base", default=FICHIER_BASE)
+
+    archive = commandes.add_parser("archive", help="installations par période et par colonne, depuis l'archive")
+    archive.add_argument("--par", nargs="+", choices=COLONNES_DICTIONNAIRE, default=["forfait", "ville"])
+    archive.add_argument("--periode", choices=PERIODES_ARCHIVE, default="semaine")
+    archive.add_argument("--debut", help="premier mois, AAAA-MM")
+    archive.add_argument("--fin", help="dernier mois, AAAA-MM")
+    archive.add_argument("--reconstruire", action="store_true", help="archive d'abord tout l'historique de la base")
+    archive.add_argument("--base", default=FICHIER_BASE)
+
+    veille = commandes.add_parser("surveiller", help="reconstruit dossiers et dashboards à l'arrivée des exports")
+    veille.add_argument("dossier", nargs="?", default=".")
+    veille.add_argument("--processus", type=int, default=None)
+    veille.add_argument("--base", default=FICHIER_BASE)
+    veille.add_argument("--equipes", default=FICHIER_EQUIPES)
+    veille.add_argument("--scrutation", action="store_true", help="n'utilise pas inotify (partages réseau)")
+
+    args = parser.parse_args(argv)
+    if args.commande == "bench-excel":
+        benchmark_lecture_excel(args.lignes)
+    elif args.commande == "bench":
+        if benchmark_pipeline(args.tailles, args.processus, args.reference, args.enregistrer, args.seuil):
+            raise SystemExit(1)
+    elif args.commande == "construire":
+        if not args.classeurs and not (args.du or args.au):
+            parser.error("construire : un classeur, un dossier d'exports ou une période --du/--au")
+        with profiler(args.profil):
+            if args.classeurs:
+                importer_classeurs(args.classeurs, args.forcer, args.processus, args.base, args.equipes,
+                                   args.du, args.au)
+            else:
+                reconstruire_periode(args.du, args.au, args.forcer, args.processus, args.base)
+    elif args.commande == "servir":
+        try:
+            servir(args.racine, args.hote, args.port, args.base)
+        except KeyboardInterrupt:
+            console.print("[dim]⏹️  Serveur arrêté[/dim]")
+    elif args.commande == "archive":
+        if args.reconstruire:
+            with BaseClients(args.base) as db:
+                console.print(f"[green]✅ {archiver(db.clients())} ligne(s) archivée(s)[/green]")
+        debut = time.perf_counter()
+        lignes = installations_par(ArchiveClients(), args.par, args.periode, args.debut, args.fin)
+        afficher_installations_par(lignes, args.par, args.periode)
+        console.print(f"[dim]{len(lignes)} groupe(s) en {time.perf_counter() - debut:.3f} s[/dim]")
+    elif args.commande == "surveiller":
+        try:
+            surveiller(args.dossier, args.processus, args.base, args.equipes, not args.scrutation)
+        except KeyboardInterrupt:
+            console.print("[dim]⏹️  Surveillance arrêtée[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# test.py masquerait le paquet test de la bibliothèque standard : chargé sous un autre nom
+_spec = importlib.util.spec_from_file_location("ftth", os.path.join(RACINE, "test.py"))
+ftth_module = importlib.util.module_from_spec(_spec)
+sys.modules["ftth"] = ftth_module
+_spec.loader.exec_module(ftth_module)
+
+
+@pytest.fixture
+def ftth():
+    ftth_module.console.quiet = True
+    return ftth_module
+
+
+@pytest.fixture
+def dossier(tmp_path, monkeypatch):
+    """Répertoire de travail vierge : le pipeline écrit ses dossiers en relatif"""
+    monkeypatch.chdir(tmp_path)
+    # Caches par processus qui retiennent des chemins relatifs au répertoire précédent
+    ftth_module.cache_qr.cache_clear()
+    ftth_module.bundle_assets.cache_clear()
+    return tmp_path
+
+
+def fabriquer_client(i, date="12-01-2026", **champs):
+    """Client d'export minimal, situé autour de San Pedro"""
+    client = {
+        "prestataire": "MG TELECOM",
+        "provenance": "AGENCE",
+        "nom": f"CLIENT {chr(65 + i % 26)}{chr(65 + i // 26 % 26)} TEST",
+        "contact": f"05{i:08d}",
+        "ville": "SAN PEDRO",
+        "quartier": f"QUARTIER {i % 3}",
+        "tn": f"25360{i:05d}@mtn.ci",
+        "sn": f"48575443{i:08X}",
+        "forfait": "10.000 F (100 Mb/s ; 4Go + 120 min)",
+        "longitude": -6.64 + i * 0.001,
+        "latitude": 4.74 + i * 0.001,
+        "date": date,
+    }
+    client.update(champs)
+    return client
+
+
+def fabriquer_equipes(capacites):
+    """Équipes chargées sans base ni forfaits, par capacité"""
+    return {nom: {"capacite": capacite, "base": None, "forfaits": []} for nom, capacite in capacites.items()}
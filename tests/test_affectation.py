@@ -0,0 +1,29 @@
+from conftest import fabriquer_client, fabriquer_equipes
+
+
+def test_affectation_respecte_les_quotas(ftth):
+    clients = [fabriquer_client(i) for i in range(6)]
+    table = ftth.affecter_equipes(clients, fabriquer_equipes({"A": 3, "B": 3}))
+    assert len(table) == 6
+    repartition = {nom: sum(1 for c in clients if c["equipe"] == nom) for nom in "AB"}
+    assert repartition == {"A": 3, "B": 3}
+    assert not any(ligne["depassement"] for ligne in table)
+
+
+def test_affectation_garde_les_equipes_deja_attribuees(ftth):
+    clients = [fabriquer_client(0, equipe="B"), fabriquer_client(1)]
+    table = ftth.affecter_equipes(clients, fabriquer_equipes({"A": 5, "B": 5}))
+    assert clients[0]["equipe"] == "B"
+    assert [ligne["client"] for ligne in table] == [clients[1]]
+
+
+def test_affectation_repartit_le_depassement_sur_les_moins_chargees(ftth):
+    # Tous près de A : sans quota libre, le surplus doit tout de même alterner
+    clients = [fabriquer_client(i, longitude=-6.64, latitude=4.74) for i in range(10)]
+    equipes = fabriquer_equipes({"A": 2, "B": 2})
+    equipes["A"]["base"] = (-6.64, 4.74)
+    equipes["B"]["base"] = (-6.0, 5.5)
+    table = ftth.affecter_equipes(clients, equipes)
+    repartition = {nom: sum(1 for c in clients if c["equipe"] == nom) for nom in "AB"}
+    assert repartition == {"A": 5, "B": 5}
+    assert sum(ligne["depassement"] for ligne in table) == 6
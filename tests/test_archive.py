@@ -0,0 +1,14 @@
+from conftest import fabriquer_client
+
+
+def test_archive_remplace_les_lignes_corrigees(ftth, dossier):
+    archive = ftth.ArchiveClients()
+    clients = [fabriquer_client(i, equipe="STI", quartier="ANCIEN") for i in range(3)]
+    assert archive.ajouter(clients) == 3
+
+    corrige = dict(clients[1], quartier="CORRIGÉ")
+    assert archive.ajouter([corrige, fabriquer_client(3, equipe="STI", quartier="ANCIEN")]) == 2
+    assert archive.ajouter([corrige]) == 1
+    colonnes = archive.colonnes(("cle", "quartier"))
+    assert len(colonnes["cle"]) == len(set(colonnes["cle"].tolist())) == 4
+    assert sorted(archive.valeurs("quartier", colonnes["quartier"])) == ["ANCIEN"] * 3 + ["CORRIGÉ"]
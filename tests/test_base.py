@@ -0,0 +1,14 @@
+from conftest import fabriquer_client
+
+
+def test_base_trie_et_filtre_les_dates_dans_l_ordre_chronologique(ftth, dossier):
+    from datetime import datetime
+
+    dates = ["05-02-2026", "28-01-2026", "03-01-2027", "31-12-2025"]
+    with ftth.BaseClients("clients.sqlite") as db:
+        db.upsert([fabriquer_client(i, date=date, equipe="STI") for i, date in enumerate(dates)])
+        assert db.dates() == ["31-12-2025", "28-01-2026", "05-02-2026", "03-01-2027"]
+        assert [c["date"] for c in db.clients()] == db.dates()
+        assert db.dates(datetime(2026, 1, 1), datetime(2026, 12, 31)) == ["28-01-2026", "05-02-2026"]
+        assert [c["date"] for c in db.clients(au=datetime(2026, 1, 31))] == ["31-12-2025", "28-01-2026"]
+        assert "jour" not in db.clients()[0]
@@ -0,0 +1,33 @@
+from conftest import fabriquer_client
+
+
+def test_doublons_du_jour_fusionnes(ftth):
+    premier = fabriquer_client(1, ticket="")
+    second = fabriquer_client(1, contact="", ticket="T-42")
+    gardes, signalements = ftth.dedoublonner([premier, second])
+    assert gardes == [premier]
+    assert premier["ticket"] == "T-42"
+    assert signalements[0]["action"] == "fusionné"
+
+
+def test_doublons_autre_jour_seulement_signales(ftth, dossier):
+    with ftth.BaseClients("clients.sqlite") as db:
+        db.upsert([fabriquer_client(1, date="05-01-2026", equipe="STI")])
+        gardes, signalements = ftth.dedoublonner([fabriquer_client(1)], db)
+    assert len(gardes) == 1
+    assert [s["action"] for s in signalements] == ["signalé"]
+
+
+def test_correction_de_tn_gardee_sur_la_ligne_existante(ftth, dossier):
+    with ftth.BaseClients("clients.sqlite") as db:
+        db.upsert([fabriquer_client(1, equipe="STI", tn="2536000001@mtn.ci", sn="SN-1")])
+        corrige = fabriquer_client(1, equipe="STI", tn="2536000009@mtn.ci", sn="SN-1")
+        gardes, signalements = ftth.dedoublonner([corrige], db)
+        assert gardes == [corrige]
+        assert corrige["tn"] == "2536000009@mtn.ci"
+        assert signalements[0]["action"] == "clé historique reprise"
+        db.upsert(gardes)
+        enregistres = db.clients()
+    assert len(enregistres) == 1
+    assert enregistres[0]["tn"] == "2536000009@mtn.ci"
+    assert enregistres[0]["cle"] == "tn:2536000001@mtn.ci"
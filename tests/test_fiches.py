@@ -0,0 +1,36 @@
+import os
+
+from conftest import fabriquer_client
+
+
+def test_changement_de_format_garde_les_artefacts_regeneres(ftth, dossier, monkeypatch):
+    clients = [fabriquer_client(i, equipe="STI", ordre=i + 1) for i in range(2)]
+    ftth.construire_dossier("12-01-2026", clients, processus=1)
+    pdf = os.path.join("dossier_12-01-2026", "Fiches_Installation_12-01-2026.pdf")
+    avant = os.path.getmtime(pdf)
+
+    monkeypatch.setattr(ftth, "FORMAT_FICHES", "png")
+    assert len(ftth.construire_dossier("12-01-2026", clients, processus=1)) == 2
+    for client in clients:
+        for nom in ftth.artefacts_client(client):
+            assert os.path.exists(os.path.join("dossier_12-01-2026", nom)), nom
+        fiche_svg = ftth.fichiers_client(client, "svg")["fiche"]
+        assert not os.path.exists(os.path.join("dossier_12-01-2026", fiche_svg))
+    assert os.path.getmtime(pdf) > avant
+
+
+def test_fiches_svg_sans_vignettes_et_affichees_en_differe(ftth, dossier, monkeypatch):
+    client = fabriquer_client(0, equipe="STI", ordre=1)
+    ftth.construire_dossier("12-01-2026", [client], processus=1)
+    assert not os.path.exists(os.path.join("dossier_12-01-2026", ftth.DOSSIER_VIGNETTES))
+    fichiers = ftth.fichiers_client(client)
+    with open(os.path.join("dossier_12-01-2026", fichiers["page"]), encoding="utf-8") as f:
+        page = f.read()
+    assert f'<img src="../{fichiers["fiche"]}"' in page and 'loading="lazy"' in page
+
+    monkeypatch.setattr(ftth, "FORMAT_FICHES", "png")
+    ftth.construire_dossier("12-01-2026", [client], processus=1)
+    vignettes = ftth.fichiers_vignettes(client)
+    assert vignettes
+    for nom in vignettes.values():
+        assert os.path.exists(os.path.join("dossier_12-01-2026", nom))
@@ -0,0 +1,99 @@
+import json
+import os
+
+from conftest import fabriquer_client
+
+
+def test_renvoi_partiel_d_un_jour_garde_les_autres_clients(ftth, dossier):
+    jour = [fabriquer_client(i, equipe="STI" if i % 2 else "WINAT") for i in range(13)]
+    with ftth.BaseClients("clients.sqlite") as db:
+        ftth.construire_dossiers([dict(client) for client in jour], processus=1, db=db)
+        renvoi = [dict(client, quartier="CORRIGÉ") for client in jour[:10]]
+        ftth.construire_dossiers(renvoi, processus=1, db=db)
+        enregistres = db.clients(date="12-01-2026")
+
+    assert len(enregistres) == 13
+    pages = os.listdir(os.path.join("dossier_12-01-2026", "site"))
+    assert len(pages) == 13
+    for equipe in ("STI", "WINAT"):
+        ordres = sorted(c["ordre"] for c in enregistres if c["equipe"] == equipe)
+        assert ordres == list(range(1, len(ordres) + 1))
+    manifeste = ftth.charger_manifeste("dossier_12-01-2026")
+    assert len(manifeste["clients"]) == 13
+    with open("dashboard_STI.html", encoding="utf-8") as f:
+        assert f.read().count('class="client-card"') == 6
+
+
+def test_reimport_a_l_identique_ne_modifie_aucune_ligne(ftth, dossier):
+    with open(ftth.FICHIER_EQUIPES, "w", encoding="utf-8") as f:
+        json.dump({"A": {"capacite": 50}, "B": {"capacite": 50}}, f)
+    classeur = ftth.ecrire_excel_synthetique("NOUVEAUX CLIENTS TEST MGT.xlsx", 13)
+    ftth.importer_classeurs([classeur], processus=1)
+    with ftth.BaseClients() as db:
+        sequence, avant = db.sequence(), db.clients()
+
+    ftth.importer_classeurs([classeur], processus=1)
+    with ftth.BaseClients() as db:
+        assert db.sequence() == sequence
+        assert db.modifications(sequence) == []
+        assert db.clients() == avant
+
+
+def test_changement_d_equipe_retire_la_carte_de_l_ancienne(ftth, dossier):
+    jour = [fabriquer_client(i, equipe="STI" if i % 2 else "WINAT") for i in range(6)]
+    with ftth.BaseClients() as db:
+        ftth.construire_dossiers([dict(client) for client in jour], processus=1, db=db)
+        sequence = db.sequence()
+        ftth.construire_dossiers([dict(jour[0], equipe="STI")], processus=1, db=db)
+        deplace = next(c for c in db.modifications(sequence) if c["nom"] == jour[0]["nom"])
+    assert deplace["equipe"] == "STI" and deplace["equipe_avant"] == "WINAT"
+
+    serveur = ftth.ServeurDashboards(".")
+    try:
+        deltas = serveur.deltas(sequence)
+    finally:
+        serveur.fermer()
+    assert deltas["WINAT"]["retires"] == [ftth.cle_carte(deplace)]
+    assert ftth.cle_carte(deplace) in [carte["cle"] for carte in deltas["STI"]["cartes"]]
+
+
+def test_ligne_sans_date_ignoree_et_signalee(ftth, dossier, monkeypatch):
+    with open(ftth.FICHIER_EQUIPES, "w", encoding="utf-8") as f:
+        json.dump({"A": {"capacite": 50}}, f)
+    classeur = ftth.ecrire_excel_synthetique("NOUVEAUX CLIENTS TEST MGT.xlsx", 5)
+    lire, sans_date = ftth.lire_excel_clients, []
+
+    def lire_sans_date(chemin):
+        for numero, client in enumerate(lire(chemin)):
+            if numero == 0:
+                del client["date"]
+                client["date_transmission"] = None
+                sans_date.append(client["tn"])
+            yield client
+
+    monkeypatch.setattr(ftth, "lire_excel_clients", lire_sans_date)
+    ftth.importer_classeurs([classeur], processus=1)
+    with ftth.BaseClients() as db:
+        enregistres = db.clients()
+    assert enregistres and sans_date[0] not in {client["tn"] for client in enregistres}
+    rapport = max(os.listdir("rapports"))
+    with open(os.path.join("rapports", rapport), encoding="utf-8") as f:
+        assert json.load(f)["contexte"]["lignes_sans_date"] == 1
+
+
+def test_import_complet(ftth, dossier):
+    with open(ftth.FICHIER_EQUIPES, "w", encoding="utf-8") as f:
+        json.dump({"A": {"capacite": 50}, "B": {"capacite": 50}}, f)
+    classeur = ftth.ecrire_excel_synthetique("NOUVEAUX CLIENTS TEST MGT.xlsx", 100, jours=2)
+    lus = list(ftth.lire_excel_clients(classeur))
+    ftth.importer_classeurs([classeur], processus=1)
+
+    with ftth.BaseClients() as db:
+        enregistres = db.clients()
+    assert len(enregistres) == len(lus)
+    assert all(client["equipe"] in ("A", "B") and client["ordre"] for client in enregistres)
+    for client in enregistres:
+        dossier_jour = f"dossier_{client['date']}"
+        for nom in ftth.fichiers_client(client).values():
+            assert os.path.exists(os.path.join(dossier_jour, nom))
+    assert os.path.exists("dashboard.html")
@@ -0,0 +1,71 @@
+import importlib.util
+import os
+
+import pytest
+
+from conftest import fabriquer_client, fabriquer_equipes
+
+
+def test_indicateurs_sans_numpy_identiques(ftth, dossier, monkeypatch):
+    equipes = {"STI": {"capacite": 4}, "WINAT": {"capacite": 6}}
+    clients = [fabriquer_client(i, date=f"{28 + i % 6:02d}-01-2026" if i % 6 < 4 else f"0{i % 6 - 3}-02-2026",
+                                equipe=("STI", "WINAT", "GOLD")[i % 3], provenance="WEB" if i % 4 else "",
+                                forfait_0f="OUI" if i % 5 == 0 else "")
+               for i in range(40)]
+    clients.append(dict(clients[0], date="pas une date"))
+    with ftth.BaseClients("clients.sqlite") as db:
+        db.upsert(clients)
+        attendu = ftth.calculer_kpi(db, equipes)
+        find_spec = importlib.util.find_spec
+        monkeypatch.setattr(importlib.util, "find_spec", lambda nom, *args: None if nom == "numpy" else find_spec(nom, *args))
+        assert ftth.calculer_kpi(db, equipes) == attendu
+    assert attendu["mois"] == "2026-02" and attendu["totaux"]["installations"] == 41
+
+
+def test_dashboards_ne_regenerent_que_les_equipes_modifiees(ftth, dossier, monkeypatch):
+    with ftth.BaseClients() as db:
+        db.upsert([fabriquer_client(i, equipe=("STI", "WINAT", "GOLD")[i % 3]) for i in range(9)])
+        ftth.update_dashboards(db)
+        index = ftth.ecrire_index_recherche(db)
+
+        deplace = db.clients(equipe="STI")[0]
+        db.upsert([dict(deplace, equipe="WINAT")])
+        for equipe in ("STI", "WINAT", "GOLD"):
+            os.utime(f"dashboard_{equipe}.html", ns=(1, 1))
+        ftth.update_dashboards(db)
+        assert os.stat("dashboard_GOLD.html").st_mtime_ns == 1
+        assert os.stat("dashboard_STI.html").st_mtime_ns != 1 and os.stat("dashboard_WINAT.html").st_mtime_ns != 1
+
+        # L'index de recherche suit la ligne déplacée sans tout relire
+        entrees = ftth.entrees_recherche_base(db)
+        assert entrees == [ftth.entree_recherche(client) for client in db.clients()]
+        assert [document[2] for document, _ in entrees].count("WINAT") == 4
+        nouvel_index = ftth.ecrire_index_recherche(db)
+        assert nouvel_index != index and not os.path.exists(index)
+
+        # Rien de modifié : l'asset d'index est repris sans recalcul
+        monkeypatch.setattr(ftth, "entrees_recherche_base", lambda db: pytest.fail("index recalculé"))
+        assert ftth.ecrire_index_recherche(db) == nouvel_index
+
+
+def test_indicateurs_incrementaux_identiques_au_calcul_complet(ftth, dossier, monkeypatch):
+    equipes = fabriquer_equipes({"STI": 10, "WINAT": 10})
+    with ftth.BaseClients("clients.sqlite") as db:
+        db.upsert([fabriquer_client(i, date=f"{10 + i % 3}-01-2026", equipe="STI" if i % 2 else "WINAT",
+                                    provenance="BOUTIQUE" if i % 3 else "WEB") for i in range(12)])
+        assert ftth.calculer_kpi(db, equipes) == ftth.calculer_kpi({"clients": db.clients()}, equipes)
+        assert os.path.exists(ftth.FICHIER_CACHE_KPI)
+
+        # Nouvelles lignes, changement d'équipe, ligne désaffectée : seules ces lignes sont relues
+        modifies = [dict(client, equipe="STI") for client in db.clients(equipe="WINAT")[:2]]
+        modifies.append(dict(db.clients(equipe="STI")[0], equipe=""))
+        modifies += [fabriquer_client(i, date="02-02-2026", equipe="GOLD", provenance="WEB") for i in range(12, 15)]
+        db.upsert(modifies)
+        relues = []
+        appliquer = ftth._appliquer_cache_kpi
+        monkeypatch.setattr(ftth, "_appliquer_cache_kpi",
+                            lambda cache, lignes: relues.extend(lignes) or appliquer(cache, lignes))
+        kpi = ftth.calculer_kpi(db, equipes)
+        assert kpi == ftth.calculer_kpi({"clients": db.clients()}, equipes)
+        assert kpi["totaux"]["installations"] == 14 and kpi["totaux"]["teams"] == 3
+        assert len(relues) == len(modifies)
@@ -0,0 +1,26 @@
+import os
+
+from conftest import fabriquer_client
+
+
+def test_manifeste_ne_regenere_que_les_clients_modifies(ftth, dossier):
+    clients = [fabriquer_client(i, equipe="STI", ordre=i + 1) for i in range(3)]
+    assert len(ftth.construire_dossier("12-01-2026", clients, processus=1)) == 3
+    assert ftth.construire_dossier("12-01-2026", clients, processus=1) == []
+
+    clients[1]["quartier"] = "NOUVEAU QUARTIER"
+    assert ftth.construire_dossier("12-01-2026", clients, processus=1) == [clients[1]]
+    manifeste = ftth.charger_manifeste("dossier_12-01-2026")
+    assert manifeste["version"] == ftth.VERSION_GABARITS
+    assert len(manifeste["clients"]) == 3
+
+
+def test_manifeste_retire_les_clients_sortis_du_dossier(ftth, dossier):
+    clients = [fabriquer_client(i, equipe="STI", ordre=i + 1) for i in range(3)]
+    ftth.construire_dossier("12-01-2026", clients, processus=1)
+    sorti = ftth.fichiers_client(clients[2])
+    ftth.construire_dossier("12-01-2026", clients[:2], processus=1)
+    for nom in sorti.values():
+        assert not os.path.exists(os.path.join("dossier_12-01-2026", nom))
+    for nom in ftth.fichiers_client(clients[0]).values():
+        assert os.path.exists(os.path.join("dossier_12-01-2026", nom))
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from conftest import fabriquer_client
+
+
+def _serveur(ftth):
+    with ftth.BaseClients() as db:
+        db.upsert([fabriquer_client(i, equipe="STI") for i in range(3)])
+    with open("dashboard.html", "w", encoding="utf-8") as f:
+        f.write("<html></html>")
+    return ftth.ServeurDashboards(".")
+
+
+def test_cache_api_borne_et_normalise(ftth, dossier, monkeypatch):
+    monkeypatch.setattr(ftth, "MAX_CACHE_API", 8)
+    serveur = _serveur(ftth)
+    try:
+        for n in range(50):
+            serveur._reponse_api(f"/api/clients?q=client&limite={n + 1}")
+        assert len(serveur.cache_api) == 8
+        # Paramètres sans effet sur la réponse : une seule entrée
+        assert serveur._reponse_api("/api/teams?x=1") is serveur._reponse_api("/api/teams/?y=2")
+    finally:
+        serveur.fermer()
+
+
+def test_calcul_api_ne_bloque_pas_les_fichiers(ftth, dossier):
+    serveur = _serveur(ftth)
+    kpi = serveur.kpi
+
+    def kpi_lent():
+        time.sleep(0.5)
+        return kpi()
+
+    serveur.kpi = kpi_lent
+    fins = {}
+
+    async def requete(port, cible):
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write(f"GET {cible} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+        reponse = await lecteur.read()
+        ecrivain.close()
+        fins[cible] = time.monotonic()
+        return reponse.split(b" ", 2)[1]
+
+    async def scenario():
+        asynchrone = await asyncio.start_server(serveur.connexion, "127.0.0.1", 0)
+        port = asynchrone.sockets[0].getsockname()[1]
+        async with asynchrone:
+            api = asyncio.create_task(requete(port, "/api/teams"))
+            await asyncio.sleep(0.05)
+            assert await requete(port, "/dashboard.html") == b"200"
+            assert await api == b"200"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        serveur.fermer()
+    assert fins["/dashboard.html"] < fins["/api/teams"]
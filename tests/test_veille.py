@@ -0,0 +1,31 @@
+import json
+import os
+
+
+def test_veille_saute_les_exports_deja_importes(ftth, dossier):
+    with open(ftth.FICHIER_EQUIPES, "w", encoding="utf-8") as f:
+        json.dump({"A": {"capacite": 50}}, f)
+    importe = ftth.ecrire_excel_synthetique("NOUVEAUX CLIENTS A.xlsx", 5)
+    ftth.importer_classeurs([importe], processus=1)
+    nouveau = ftth.ecrire_excel_synthetique("NOUVEAUX CLIENTS B.xlsx", 5)
+
+    with ftth.BaseClients() as db:
+        importes = db.classeurs_importes()
+    with ftth.SurveillanceExports(".", delai=0, inotify=False, importes=importes) as surveillance:
+        assert surveillance.prets() == [os.path.join(".", nouveau)]
+
+
+def test_veille_survit_a_une_erreur_de_base(ftth, dossier, monkeypatch):
+    import sqlite3
+
+    import pytest
+
+    def importer_classeurs(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    lots = iter([["NOUVEAUX CLIENTS A.xlsx"]])
+    monkeypatch.setattr(ftth.SurveillanceExports, "attendre", lambda self: next(lots))
+    monkeypatch.setattr(ftth, "importer_classeurs", importer_classeurs)
+    # Le premier lot échoue sur la base sans arrêter la veille, qui attend le suivant
+    with pytest.raises(StopIteration):
+        ftth.surveiller(".", inotify=False)